@@ -3,12 +3,15 @@ from __future__ import annotations
 
 import json
 import re as _re
+import time
 import uuid
 from typing import Callable, Optional
 
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage, ToolMessage
 from src.agents.coding.prompts import build_system_prompt
 from src.agents.coding.prompts.detector import detect_stacks
+from src.infra.tracing import span
+from src.infra.usage_ledger import ledger, model_name
 
 # Module-level progress callback set by the streaming UI
 _progress_cb: Optional[Callable[[str, dict, Optional[dict]], Optional[dict]]] = None
@@ -67,7 +70,7 @@ _PROGRESS_TOOLS = {
 }
 _SHELL_PREVIEW_TOOLS = {"shell_run", "shell_cd"}
 _MAX_ITERATIONS = 75
-_CONTEXT_CHAR_BUDGET = 150_000  # ~50k tokens — conservative to leave room for tool descriptions
+_CONTEXT_TOKEN_BUDGET = 50_000  # conservative to leave room for tool descriptions
 
 
 def _compress_specialist_messages(messages: list, llm) -> list:
@@ -204,11 +207,17 @@ def _run(task: str) -> str:
     llm = _get_coding_llm()
     tools = _get_coding_tools()
     tool_map = {t.name: t for t in tools}
-    llm_with_tools = llm.bind_tools(tools)
+    from src.infra.tools_cache import session_cache
+    session_cache.register_tools(tools)
+    from src.infra.tool_schemas import bind_tools
+    llm_with_tools = bind_tools(llm, tools)
 
     from src.agents.coding.task_enricher import enrich_task
     enriched_task = enrich_task(task)
 
+    from src.infra.settings import settings
+    from src.infra.token_count import count_tokens
+
     stacks = detect_stacks()
     system_prompt = build_system_prompt(stacks)
     messages = [SystemMessage(system_prompt), HumanMessage(enriched_task)]
@@ -216,15 +225,21 @@ def _run(task: str) -> str:
 
     for _ in range(_MAX_ITERATIONS):
         # Compress context if it exceeds budget — same as orchestrator's "compiling"
-        total_chars = sum(len(str(getattr(m, "content", ""))) for m in messages)
-        if total_chars > _CONTEXT_CHAR_BUDGET:
-            messages = _compress_specialist_messages(messages, llm)
+        if count_tokens(messages, settings.llm_backend) > _CONTEXT_TOKEN_BUDGET:
+            with span("specialist.compress", "specialist"):
+                messages = _compress_specialist_messages(messages, llm)
 
         invoker = llm if _plan_complete else llm_with_tools
         response = None
         for _ in range(3):
             try:
-                response = invoker.invoke(messages)
+                t_call = time.perf_counter()
+                with span("specialist.llm", "specialist", messages=len(messages)):
+                    response = invoker.invoke(messages)
+                ledger.record(
+                    settings.llm_backend, model_name(llm), getattr(response, "usage_metadata", None),
+                    latency_ms=(time.perf_counter() - t_call) * 1000, source="specialist",
+                )
                 break
             except Exception as e:
                 err = str(e).lower()
@@ -270,10 +285,11 @@ def _run(task: str) -> str:
                 result = hit
             else:
                 try:
-                    result = tool_fn.invoke(args)
+                    with span(f"specialist.tool:{name}", "specialist"):
+                        result = tool_fn.invoke(session_cache.normalize(name, args))
                     if name in CACHEABLE_TOOLS:
                         session_cache.set(name, args, result)
-                    session_cache.on_tool_executed(name)
+                    session_cache.on_tool_executed(name, args)
                 except Exception as e:
                     result = {"status": "error", "error": str(e)}
 
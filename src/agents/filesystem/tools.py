@@ -118,7 +118,12 @@ def local_find_file(name: str, root: str = "") -> Dict[str, Any]:
         root = ""
     base = root or str(_HOME)
 
-    raw_paths = _search_files(needle, base)
+    # Index persistant des noms si prêt, sinon fd / find — aussi quand l'index ne
+    # trouve rien : le fichier peut avoir été créé depuis le dernier scan.
+    from src.infra.file_index import file_index
+    raw_paths = file_index.find_files(needle, base)
+    if not raw_paths:
+        raw_paths = _search_files(needle, base)
 
     scored: list[tuple[float, Path]] = []
     for raw in raw_paths:
@@ -190,7 +195,10 @@ def local_list_directory(path: str = "", name: str = "") -> Dict[str, Any]:
 
     if target is None and name:
         needle = name.lower().strip()
-        candidates = _search_dirs(needle)
+        from src.infra.file_index import file_index
+        candidates = file_index.find_dirs(needle)
+        if not candidates:
+            candidates = _search_dirs(needle)
 
         scored: list[tuple[float, int, Path]] = []
         for raw in candidates:
@@ -207,7 +215,8 @@ def local_list_directory(path: str = "", name: str = "") -> Dict[str, Any]:
 
         if scored:
             scored.sort(key=lambda x: (-x[0], x[1]))
-            target = scored[0][2]
+            # Premier candidat encore présent (l'index peut avoir un scan de retard)
+            target = next((d for _, _, d in scored if d.is_dir()), None)
 
     if target is None or not target.exists():
         return {"status": "not_found", "error": f"Dossier introuvable : {path or name}"}
@@ -317,6 +317,15 @@ def _find_dir(name: str) -> Optional[Path]:
     return None
 
 
+def _prefetch(cwd: Path) -> None:
+    """Préchauffe le cache d'outils en arrière-plan si `cwd` est un repo git."""
+    try:
+        from src.infra.prefetch import prefetcher
+        prefetcher.on_cwd_changed(cwd)
+    except Exception:
+        pass
+
+
 @tool("shell_cd")
 def shell_cd(path: str) -> Dict[str, Any]:
     """
@@ -351,12 +360,14 @@ def shell_cd(path: str) -> Dict[str, Any]:
             _completer._file_cache_ts = 0.0
         except Exception:
             pass
+        _prefetch(_cwd)
         return {"status": "ok", "cwd": str(_cwd)}
 
     # 2. Recherche fuzzy depuis $HOME
     found = _find_dir(path)
     if found and found.is_dir():
         _cwd = found.resolve()
+        _prefetch(_cwd)
         return {"status": "ok", "cwd": str(_cwd), "resolved_from": path}
 
     return {"status": "error", "error": f"Dossier introuvable : {path}"}
@@ -0,0 +1,224 @@
+# src/infra/blobs.py
+"""
+Stockage adressé par contenu des gros résultats d'outils.
+
+Un ToolMessage volumineux (fichier entier, texte de PDF, page web, sortie de
+grep) serait sérialisé dans chaque checkpoint du thread. À la place :
+
+- le contenu est compressé (zstd si `zstandard` est installé, zlib sinon) et
+  écrit une seule fois dans ~/.axon/blobs/<2 car.>/<sha256>.zst|.zz
+- le message ne garde qu'un handle "[blob:<sha256> · …]" suivi d'un aperçu
+- hydrate() remet le contenu complet au moment de construire le contexte du
+  LLM — le checkpoint n'est jamais réécrit avec le texte entier
+- gc() supprime les blobs qu'aucun checkpoint ne référence plus ; appelé par
+  la passe de rétention après l'élagage (src.infra.retention)
+
+Un blob disparu (GC, autre machine) n'est pas une erreur : le message garde
+son aperçu.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+try:
+    import zstandard
+    _ZSTD = True
+except ImportError:
+    _ZSTD = False
+
+_BLOB_DIR = Path.home() / ".axon" / "blobs"
+_OFFLOAD_MIN_CHARS = 8_000       # en dessous, le message reste tel quel
+_PREVIEW_CHARS = 1_000
+_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_GC_GRACE_S = 3600               # un blob récent peut appartenir à un checkpoint encore en file
+
+HANDLE_RE = re.compile(r"^\[blob:([0-9a-f]{64})\b[^\]\n]*\]\n")
+_REF_RE = re.compile(rb"\[blob:([0-9a-f]{64})")
+
+
+def _compress(data: bytes) -> tuple[bytes, str]:
+    if _ZSTD:
+        return zstandard.ZstdCompressor(level=6).compress(data), ".zst"
+    return zlib.compress(data, 6), ".zz"
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class BlobStore:
+    def __init__(self, root: Path | None = None, min_chars: int = _OFFLOAD_MIN_CHARS) -> None:
+        self.root = root or _BLOB_DIR
+        self.min_chars = min_chars
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, str] = OrderedDict()   # digest → texte décompressé
+        self._cache_bytes = 0
+        self.counters = {"stored": 0, "deduped": 0, "hydrated": 0, "missing": 0, "collected": 0}
+
+    # ── Blobs ────────────────────────────────────────────────────────────────
+
+    def _paths(self, digest: str) -> list[Path]:
+        base = self.root / digest[:2] / digest
+        # zstd illisible sans le module : un .zst n'est alors pas candidat
+        return [base.with_suffix(s) for s in ((".zst", ".zz") if _ZSTD else (".zz",))]
+
+    def put(self, text: str) -> str:
+        """Stocke `text` (une seule fois) et retourne son sha256."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        for existing in self._paths(digest):
+            try:
+                # Re-référencé : le mtime rafraîchi le protège du GC (délai de grâce)
+                # tant que le checkpoint qui le cite n'est pas encore écrit.
+                os.utime(existing)
+            except OSError:
+                continue
+            with self._lock:
+                self.counters["deduped"] += 1
+            return digest
+        payload, suffix = _compress(data)
+        path = self.root / digest[:2] / (digest + suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)   # écriture atomique : jamais de blob tronqué
+        with self._lock:
+            self.counters["stored"] += 1
+            self._remember(digest, text)
+        return digest
+
+    def get(self, digest: str) -> str | None:
+        with self._lock:
+            text = self._cache.get(digest)
+            if text is not None:
+                self._cache.move_to_end(digest)
+                return text
+        for path in self._paths(digest):
+            try:
+                text = _decompress(path.read_bytes(), path.suffix).decode("utf-8")
+            except (OSError, zlib.error, ValueError):
+                continue
+            with self._lock:
+                self._remember(digest, text)
+            return text
+        return None
+
+    def _remember(self, digest: str, text: str) -> None:
+        size = len(text)
+        if size > _CACHE_MAX_BYTES:
+            return
+        if digest not in self._cache:
+            self._cache_bytes += size
+        self._cache[digest] = text
+        self._cache.move_to_end(digest)
+        while self._cache_bytes > _CACHE_MAX_BYTES:
+            _, old = self._cache.popitem(last=False)
+            self._cache_bytes -= len(old)
+
+    # ── Messages ─────────────────────────────────────────────────────────────
+
+    def offload(self, msg):
+        """ToolMessage trop gros → même message avec handle + aperçu. Sinon inchangé."""
+        from langchain_core.messages import ToolMessage
+        content = getattr(msg, "content", None)
+        if (
+            not isinstance(msg, ToolMessage)
+            or not isinstance(content, str)
+            or len(content) < self.min_chars
+            or HANDLE_RE.match(content)
+        ):
+            return msg
+        try:
+            digest = self.put(content)
+        except OSError:
+            return msg   # disque plein / en lecture seule : le message reste entier
+        head = f"[blob:{digest} · {len(content):,} caractères · {msg.name or 'outil'}]\n"
+        return msg.model_copy(update={"content": head + content[:_PREVIEW_CHARS] + "\n…"})
+
+    def hydrate(self, messages: list) -> list:
+        """Remet le contenu complet des messages à handle (ids conservés)."""
+        out = []
+        for m in messages:
+            content = getattr(m, "content", None)
+            match = HANDLE_RE.match(content) if isinstance(content, str) else None
+            if match is None:
+                out.append(m)
+                continue
+            text = self.get(match.group(1))
+            with self._lock:
+                self.counters["hydrated" if text is not None else "missing"] += 1
+            if text is None:
+                text = content[match.end():] + "[contenu complet indisponible]"
+            out.append(m.model_copy(update={"content": text}))
+        return out
+
+    # ── Maintenance ──────────────────────────────────────────────────────────
+
+    def _files(self):
+        if not self.root.exists():
+            return
+        for path in self.root.glob("*/*"):
+            if path.suffix in (".zst", ".zz"):
+                yield path
+
+    def gc(self, live: set[str], grace_s: float = _GC_GRACE_S) -> tuple[int, int]:
+        """Supprime les blobs hors de `live` plus vieux que `grace_s`. Retourne (fichiers, octets)."""
+        cutoff = time.time() - grace_s
+        removed = freed = 0
+        for path in list(self._files()):
+            if path.stem in live:
+                continue
+            try:
+                st = path.stat()
+                if st.st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += st.st_size
+            with self._lock:
+                text = self._cache.pop(path.stem, None)
+                if text is not None:
+                    self._cache_bytes -= len(text)
+        with self._lock:
+            self.counters["collected"] += removed
+        return removed, freed
+
+    def stats(self) -> dict:
+        files = disk = 0
+        for path in self._files():
+            try:
+                disk += path.stat().st_size
+            except OSError:
+                continue
+            files += 1
+        with self._lock:
+            return {**self.counters, "files": files, "disk_bytes": disk,
+                    "codec": "zstd" if _ZSTD else "zlib"}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+
+def referenced(chunks) -> set[str]:
+    """Digests cités dans des octets de checkpoints / writes sérialisés."""
+    live: set[str] = set()
+    for chunk in chunks:
+        if chunk:
+            live.update(m.decode() for m in _REF_RE.findall(bytes(chunk)))
+    return live
+
+
+blob_store = BlobStore()
@@ -6,17 +6,56 @@ Checkpointer SQLite persistant pour LangGraph.
 - Mémorise le dernier thread actif dans ~/.axon/last_thread
 - Expose des helpers pour lister les threads et lire les derniers messages
   via l'API publique LangGraph (pas de parsing interne de blobs)
+- Table annexe thread_meta (aperçu, titre, nombre de messages, dates) tenue à
+  jour à chaque écriture de checkpoint : /history = une requête indexée
+- thread_meta.tail : les derniers messages en JSON, écrits avec chaque
+  checkpoint — la reprise au démarrage n'affiche que ça, sans désérialiser
+  le thread ; warm() décode le checkpoint complet en arrière-plan pendant que
+  l'utilisateur tape, et la première invocation du graphe le récupère
+- Branches copy-on-write (thread_branches) : une branche pointe vers le
+  checkpoint de fork de son parent et le lit par référence tant qu'elle n'a
+  rien écrit — /branch est O(1), sans copie de l'historique
+- Index FTS5 (message_fts) du texte des messages humains, IA et outils, tenu
+  à jour au même endroit : /history search = une requête MATCH classée bm25
+- Base en WAL (synchronous=NORMAL, mmap) et écritures confiées à un thread
+  dédié : put / put_writes rendent la main aussitôt, le writer applique la
+  file par lots dans une seule transaction
+
+Durabilité :
+- flush() est appelé en fin de tour et à la sortie du process (atexit) : un
+  tour terminé est toujours sur disque, résistant à un crash de l'application
+- un kill -9 en plein tour perd au plus les checkpoints de ce tour encore en
+  file — la reprise repart du dernier checkpoint écrit (tour précédent ou
+  étape antérieure), jamais d'un état incohérent : chaque lot est une
+  transaction
+- synchronous=NORMAL en WAL : une coupure de courant peut annuler les
+  dernières transactions, pas corrompre la base
+- les lectures (get_tuple, list, delete_thread) attendent la file : un thread
+  relit toujours ses propres écritures ; une erreur du writer n'y est jamais
+  relevée — elle est comptée dans stats() et rendue par flush() en fin de tour
+- un lot est appliqué sous le verrou du saver, du premier put au commit
 """
 from __future__ import annotations
 
+import atexit
+import json
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from langgraph.checkpoint.base import CheckpointTuple
 from langgraph.checkpoint.sqlite import SqliteSaver
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 
+from src.infra.tracing import span
+from src.orchestrator.compactor import SUMMARY_MARKER
+
 # ── Répertoire de données Axon ─────────────────────────────────────────────────
 _AXON_DIR = Path.home() / ".axon"
 _DB_PATH   = _AXON_DIR / "memory.db"
@@ -24,9 +63,418 @@ _LAST_FILE = _AXON_DIR / "last_thread"
 
 _AXON_DIR.mkdir(parents=True, exist_ok=True)
 
+_MMAP_BYTES = 256 * 1024 * 1024
+_MAX_BATCH  = 256          # opérations max par transaction du writer
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_meta (
+    thread_id     TEXT PRIMARY KEY,
+    created_at    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL,
+    preview       TEXT NOT NULL DEFAULT '',
+    message_count INTEGER NOT NULL DEFAULT 0,
+    title         TEXT NOT NULL DEFAULT '',
+    pinned        INTEGER NOT NULL DEFAULT 0,
+    tail          TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_thread_meta_updated ON thread_meta(updated_at DESC);
+CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+    thread_id UNINDEXED, role UNINDEXED, text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS thread_branches (
+    thread_id          TEXT PRIMARY KEY,
+    parent_thread_id   TEXT NOT NULL,
+    fork_checkpoint_id TEXT NOT NULL,
+    created_at         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_thread_branches_parent ON thread_branches(parent_thread_id);
+CREATE TABLE IF NOT EXISTS message_fts_keys (
+    thread_id TEXT NOT NULL,
+    msg_id    TEXT NOT NULL,
+    PRIMARY KEY (thread_id, msg_id)
+) WITHOUT ROWID;
+"""
+
+_FTS_MAX_CHARS = 20_000    # texte indexé par message (fichiers entiers, pages web…)
+_TAIL_MESSAGES = 8         # messages gardés dans thread_meta.tail
+_TAIL_CHARS    = 300
+
+# Colonnes ajoutées à thread_meta après sa création
+_META_COLUMNS = (
+    "pinned INTEGER NOT NULL DEFAULT 0",
+    "tail TEXT NOT NULL DEFAULT ''",
+)
+
+
+def configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Pragmas du checkpointer. auto_vacuum d'abord : sans effet une fois la base créée
+    (voir retention.enable_incremental_vacuum)."""
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA mmap_size = {_MMAP_BYTES}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+class _TracedSaver(SqliteSaver):
+    """SqliteSaver dont les écritures apparaissent dans /perf (catégorie checkpoint)
+    et qui tient à jour thread_meta quand le canal messages change.
+
+    Avec async_writes=True, put / put_writes sont mis en file pour le thread
+    axon-checkpoint-writer au lieu d'écrire sur le thread appelant."""
+
+    def __init__(self, conn: sqlite3.Connection, async_writes: bool = False, max_batch: int = _MAX_BATCH) -> None:
+        super().__init__(conn)
+        # Réentrant : le writer garde le verrou pendant tout un lot, et chaque
+        # opération du lot repasse par cursor() sur le même thread
+        self.lock = threading.RLock()
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._queue: queue.Queue | None = None
+        self._error: BaseException | None = None
+        self._stats_lock = threading.Lock()
+        self.counters = {
+            "queued": 0, "written": 0, "batches": 0, "max_batch": 0, "errors": 0, "write_ms": 0.0,
+            "warm_hits": 0, "warm_misses": 0,
+        }
+        self._warm: dict[str, Future] = {}
+        self._warm_executor: ThreadPoolExecutor | None = None
+        if async_writes:
+            self._queue = queue.Queue()
+            threading.Thread(target=self._write_loop, name="axon-checkpoint-writer", daemon=True).start()
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        # Dans un lot du writer, le commit est fait une fois à la fin du lot
+        with super().cursor(transaction and not getattr(self._local, "batch", False)) as cur:
+            yield cur
+
+    def setup(self) -> None:
+        # Appelé par cursor(), verrou déjà pris
+        if self.is_setup:
+            return
+        self.conn.executescript(_META_SCHEMA)
+        for column in _META_COLUMNS:
+            try:
+                self.conn.execute(f"ALTER TABLE thread_meta ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass   # colonne déjà là
+        super().setup()
+
+    # ── Écritures ─────────────────────────────────────────────────────────────
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with span("checkpoint.put", "checkpoint"):
+            self._drop_warm(config["configurable"]["thread_id"])
+            if self._queue is None:
+                return self._put_now(config, checkpoint, metadata, new_versions)
+            self._enqueue(self._put_now, config, checkpoint, metadata, new_versions)
+            conf = config["configurable"]
+            return {
+                "configurable": {
+                    "thread_id": conf["thread_id"],
+                    "checkpoint_ns": conf["checkpoint_ns"],
+                    "checkpoint_id": checkpoint["id"],
+                }
+            }
+
+    def _put_now(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        conf = config.get("configurable", {})
+        if "messages" in new_versions and not conf.get("checkpoint_ns"):
+            messages = checkpoint.get("channel_values", {}).get("messages", [])
+            with self.cursor() as cur:
+                _record_meta(cur, conf["thread_id"], checkpoint.get("ts", ""), messages)
+                _index_messages(cur, conf["thread_id"], messages)
+        return result
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with span("checkpoint.put_writes", "checkpoint"):
+            self._drop_warm(config["configurable"]["thread_id"])
+            if self._queue is None:
+                return super().put_writes(config, writes, task_id, task_path)
+            self._enqueue(super().put_writes, config, list(writes), task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._drop_warm(thread_id)
+        self.wait()
+        thread_id = str(thread_id)
+        detached = self._detach_branches(thread_id)
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_branches WHERE thread_id = ?", (thread_id,))
+            cur.execute("DELETE FROM thread_meta WHERE thread_id = ?", (thread_id,))
+            cur.execute("DELETE FROM message_fts WHERE thread_id = ?", (thread_id,))
+            cur.execute("DELETE FROM message_fts_keys WHERE thread_id = ?", (thread_id,))
+        for child in detached:
+            self._reindex(child)
+
+    # ── Lectures : attendent la file (read-your-writes) ────────────────────────
+
+    def get_tuple(self, config):
+        self.wait()
+        conf = config.get("configurable", {})
+        if not conf.get("checkpoint_id") and not conf.get("checkpoint_ns"):
+            warmed = self._take_warm(conf.get("thread_id"))
+            if warmed is not None:
+                return warmed
+        tup = super().get_tuple(config)
+        if tup is None and conf.get("thread_id") is not None and not conf.get("checkpoint_ns"):
+            tup = self._from_parent(conf)
+        return tup
+
+    # ── Préchargement du dernier checkpoint (reprise de session) ───────────────
+
+    def warm(self, thread_id: str) -> None:
+        """Décode le dernier checkpoint de `thread_id` dans un thread ; la prochaine
+        lecture de ce checkpoint le récupère au lieu de le redécoder."""
+        with self._stats_lock:
+            if thread_id in self._warm:
+                return
+            if self._warm_executor is None:
+                self._warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="axon-resume")
+            self._warm[thread_id] = self._warm_executor.submit(self._decode_latest, thread_id)
+
+    def _decode_latest(self, thread_id: str):
+        self.wait()
+        return SqliteSaver.get_tuple(self, {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+
+    def _take_warm(self, thread_id):
+        """Usage unique : LangGraph reconstruit ses canaux depuis le tuple retourné."""
+        with self._stats_lock:
+            fut = self._warm.pop(thread_id, None)
+        if fut is None:
+            return None
+        try:
+            tup = fut.result()   # s'il est encore en cours, on l'attend plutôt que de décoder deux fois
+        except Exception:
+            tup = None
+        if tup is not None:
+            with self.cursor(transaction=False) as cur:
+                latest = cur.execute(
+                    "SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ''",
+                    (str(thread_id),),
+                ).fetchone()[0]
+            if latest != tup.checkpoint["id"]:
+                tup = None   # écrit par un autre process entre-temps
+        with self._stats_lock:
+            self.counters["warm_hits" if tup is not None else "warm_misses"] += 1
+        return tup
+
+    def _drop_warm(self, thread_id) -> None:
+        with self._stats_lock:
+            self._warm.pop(thread_id, None)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        self.wait()
+        count = 0
+        for tup in super().list(config, filter=filter, before=before, limit=limit):
+            count += 1
+            yield tup
+        conf = (config or {}).get("configurable", {})
+        branch = None if conf.get("checkpoint_ns") else self._branch_of(conf.get("thread_id"))
+        if branch is None:
+            return
+        # Historique partagé : celui du parent jusqu'au checkpoint de fork inclus
+        parent, fork_id = branch
+        for tup in self.list({"configurable": {"thread_id": parent, "checkpoint_ns": ""}},
+                             filter=filter, before=before):
+            if limit is not None and count >= limit:
+                return
+            if tup.checkpoint["id"] > fork_id:
+                continue
+            count += 1
+            yield self._rebase(tup, conf["thread_id"], fork_id)
+
+    # ── Branches copy-on-write ────────────────────────────────────────────────
+
+    def branch(self, parent_thread_id: str, thread_id: str) -> bool:
+        """Crée `thread_id` comme branche du dernier checkpoint de `parent_thread_id` :
+        une ligne dans thread_branches (+ thread_meta), aucun checkpoint copié.
+        False si le parent n'a encore aucun checkpoint."""
+        parent = self.get_tuple({"configurable": {"thread_id": parent_thread_id, "checkpoint_ns": ""}})
+        if parent is None:
+            return False
+        now = datetime.now(timezone.utc).isoformat()
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_branches (thread_id, parent_thread_id, fork_checkpoint_id, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (thread_id, parent_thread_id, parent.checkpoint["id"], now),
+            )
+            # La branche hérite de l'aperçu, du titre et de la queue du parent
+            cur.execute(
+                """
+                INSERT OR REPLACE INTO thread_meta
+                    (thread_id, created_at, updated_at, preview, message_count, title, pinned, tail)
+                SELECT ?, ?, ?, preview, message_count, title, 0, tail
+                FROM thread_meta WHERE thread_id = ?
+                """,
+                (thread_id, now, now, parent_thread_id),
+            )
+        return True
+
+    def _detach_branches(self, thread_id: str) -> list[str]:
+        """Avant suppression de `thread_id` : chaque branche directe reçoit une copie
+        de son checkpoint de fork et devient un thread autonome. Si le fork n'est
+        pas chez `thread_id` (lui-même lu par référence), la branche est rattachée
+        au grand-parent. Retourne les branches devenues autonomes."""
+        grandparent = self._branch_of(thread_id)
+        with self.cursor() as cur:
+            children = cur.execute(
+                "SELECT thread_id, fork_checkpoint_id FROM thread_branches WHERE parent_thread_id = ?",
+                (thread_id,),
+            ).fetchall()
+            detached = []
+            for child, fork_id in children:
+                cur.execute(
+                    """
+                    INSERT OR IGNORE INTO checkpoints
+                        (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata)
+                    SELECT ?, checkpoint_ns, checkpoint_id, NULL, type, checkpoint, metadata
+                    FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = '' AND checkpoint_id = ?
+                    """,
+                    (child, thread_id, fork_id),
+                )
+                copied = cur.execute(
+                    "SELECT 1 FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = '' AND checkpoint_id = ?",
+                    (child, fork_id),
+                ).fetchone()
+                if copied:
+                    cur.execute("DELETE FROM thread_branches WHERE thread_id = ?", (child,))
+                    detached.append(child)
+                elif grandparent is not None:
+                    cur.execute(
+                        "UPDATE thread_branches SET parent_thread_id = ? WHERE thread_id = ?",
+                        (grandparent[0], child),
+                    )
+        return detached
+
+    def _reindex(self, thread_id: str) -> None:
+        """Réindexe tout le thread (FTS) : après détachement, l'historique hérité
+        n'est plus indexé chez un ancêtre."""
+        tup = self.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+        if tup is None:
+            return
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM message_fts WHERE thread_id = ?", (thread_id,))
+            cur.execute("DELETE FROM message_fts_keys WHERE thread_id = ?", (thread_id,))
+            _index_messages(cur, thread_id, tup.checkpoint.get("channel_values", {}).get("messages", []))
+
+    def _branch_of(self, thread_id) -> tuple[str, str] | None:
+        if thread_id is None:
+            return None
+        with self.cursor(transaction=False) as cur:
+            row = cur.execute(
+                "SELECT parent_thread_id, fork_checkpoint_id FROM thread_branches WHERE thread_id = ?",
+                (str(thread_id),),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def _from_parent(self, conf: dict):
+        """Checkpoint qu'une branche n'a pas (encore) chez elle : lu chez le parent
+        — récursivement pour une branche de branche — puis réattribué à la branche."""
+        branch = self._branch_of(conf["thread_id"])
+        if branch is None:
+            return None
+        parent, fork_id = branch
+        wanted = conf.get("checkpoint_id") or fork_id
+        if wanted > fork_id:   # ids uuid6 : l'ordre lexical est chronologique
+            return None
+        tup = self.get_tuple({"configurable": {"thread_id": parent, "checkpoint_ns": "", "checkpoint_id": wanted}})
+        return self._rebase(tup, conf["thread_id"], fork_id) if tup is not None else None
+
+    @staticmethod
+    def _rebase(tup, thread_id: str, fork_id: str):
+        def _conf(c):
+            return None if c is None else {"configurable": {**c["configurable"], "thread_id": thread_id}}
+        # Les writes posés sur le fork appartiennent à la suite du parent, pas à la branche
+        pending = [] if tup.checkpoint["id"] == fork_id else tup.pending_writes
+        return CheckpointTuple(_conf(tup.config), tup.checkpoint, tup.metadata, _conf(tup.parent_config), pending)
+
+    # ── Writer ────────────────────────────────────────────────────────────────
+
+    def _enqueue(self, fn, *args) -> None:
+        with self._stats_lock:
+            self.counters["queued"] += 1
+        self._queue.put((fn, args))
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._apply(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _apply(self, batch: list) -> None:
+        """Un lot = une transaction, un seul commit (et un seul fsync en WAL)."""
+        t0 = time.perf_counter()
+        errors = 0
+        # Verrou tenu du premier put au commit : aucun autre cursor() de la
+        # connexion ne peut commiter un lot à moitié appliqué
+        with self.lock:
+            self._local.batch = True
+            try:
+                for fn, args in batch:
+                    try:
+                        fn(*args)
+                    except Exception as e:
+                        errors += 1
+                        self._error = self._error or e
+            finally:
+                self._local.batch = False
+                self.conn.commit()
+        with self._stats_lock:
+            self.counters["written"] += len(batch) - errors
+            self.counters["errors"] += errors
+            self.counters["batches"] += 1
+            self.counters["max_batch"] = max(self.counters["max_batch"], len(batch))
+            self.counters["write_ms"] += (time.perf_counter() - t0) * 1000
+
+    def wait(self) -> None:
+        """Attend que la file soit écrite et commitée, sans relever d'erreur :
+        les lectures ne doivent pas échouer pour une écriture de fond ratée."""
+        if self._queue is None or getattr(self._local, "batch", False):
+            return
+        with span("checkpoint.flush", "checkpoint"):
+            self._queue.join()
+
+    def flush(self) -> None:
+        """wait(), puis relève la première erreur du writer (fin de tour)."""
+        self.wait()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            pending = self._queue.unfinished_tasks if self._queue is not None else 0
+            return {**self.counters, "pending": pending, "async": self._queue is not None}
+
+
 # Connexion SQLite partagée (check_same_thread=False requis par LangGraph)
-_conn        = sqlite3.connect(str(_DB_PATH), check_same_thread=False)
-_checkpointer = SqliteSaver(_conn)
+_conn        = configure(sqlite3.connect(str(_DB_PATH), check_same_thread=False))
+_checkpointer = _TracedSaver(_conn, async_writes=True)
+
+
+def flush() -> Optional[BaseException]:
+    """Fin de tour / sortie : tout checkpoint mis en file est sur disque au retour.
+    Retourne l'erreur du writer (aussi comptée dans stats()) au lieu de la lever."""
+    try:
+        _checkpointer.flush()
+    except Exception as e:
+        return e
+    return None
+
+
+atexit.register(flush)
 
 
 # ── Checkpointer ───────────────────────────────────────────────────────────────
@@ -48,69 +496,302 @@ def load_last_thread() -> Optional[str]:
     return None
 
 
+# ── Métadonnées des threads ────────────────────────────────────────────────────
+
+def _record_meta(cur: sqlite3.Cursor, thread_id: str, ts: str, messages: list) -> None:
+    """Upsert de la ligne thread_meta ; created_at et le titre ne sont fixés qu'une fois."""
+    cur.execute(
+        """
+        INSERT INTO thread_meta (thread_id, created_at, updated_at, preview, message_count, title, tail)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(thread_id) DO UPDATE SET
+            updated_at    = excluded.updated_at,
+            preview       = excluded.preview,
+            message_count = excluded.message_count,
+            title         = CASE WHEN thread_meta.title = '' THEN excluded.title ELSE thread_meta.title END,
+            tail          = excluded.tail
+        """,
+        (thread_id, ts, ts, _last_human_preview(messages), len(messages), _first_human_title(messages),
+         json.dumps(_tail(messages), ensure_ascii=False)),
+    )
+
+
+def _tail(messages: list, n: int = _TAIL_MESSAGES) -> list[dict]:
+    """Derniers messages non vides sous forme {role, content} — ce qu'affiche la reprise."""
+    from src.infra.blobs import HANDLE_RE
+    out: list[dict] = []
+    for m in reversed(messages):
+        content = _text_of(m)
+        handle = HANDLE_RE.match(content)
+        if handle:
+            content = content[handle.end():].strip()
+        if content:
+            out.append({"role": _role_of(m), "content": content[:_TAIL_CHARS]})
+            if len(out) == n:
+                break
+    out.reverse()
+    return out
+
+
+def _index_messages(cur: sqlite3.Cursor, thread_id: str, messages: list) -> int:
+    """Indexe les messages pas encore vus du thread. Le canal messages ne fait que
+    s'allonger : on remonte depuis la fin jusqu'au premier id déjà indexé. Un
+    message retiré par la compaction reste trouvable. Retourne le nombre ajouté."""
+    from src.infra.blobs import HANDLE_RE
+    # Une branche partage l'historique de ses ancêtres, déjà indexé chez eux
+    lineage = _lineage(cur, thread_id)
+    marks = ",".join("?" * len(lineage))
+    fresh = []
+    for m in reversed(messages):
+        msg_id = getattr(m, "id", None)
+        if not msg_id:
+            continue
+        if cur.execute(
+            f"SELECT 1 FROM message_fts_keys WHERE msg_id = ? AND thread_id IN ({marks})", (msg_id, *lineage)
+        ).fetchone():
+            break
+        fresh.append(m)
+    rows = []
+    for m in reversed(fresh):
+        text = _text_of(m)
+        # Résultat d'outil déporté dans le blob store : seul l'aperçu est indexé
+        handle = HANDLE_RE.match(text)
+        if handle:
+            text = text[handle.end():]
+        if not text or text.startswith(SUMMARY_MARKER):
+            continue
+        rows.append((thread_id, m.id, _role_of(m), text[:_FTS_MAX_CHARS]))
+    cur.executemany(
+        "INSERT OR IGNORE INTO message_fts_keys (thread_id, msg_id) VALUES (?, ?)",
+        [(thread_id, getattr(m, "id")) for m in fresh],
+    )
+    cur.executemany("INSERT INTO message_fts (thread_id, role, text) VALUES (?, ?, ?)",
+                    [(t, role, text) for t, _, role, text in rows])
+    return len(rows)
+
+
+def _lineage(cur: sqlite3.Cursor, thread_id: str) -> list[str]:
+    """[thread, parent, grand-parent…] d'après thread_branches."""
+    chain = [thread_id]
+    while True:
+        row = cur.execute(
+            "SELECT parent_thread_id FROM thread_branches WHERE thread_id = ?", (chain[-1],)
+        ).fetchone()
+        if row is None or row[0] in chain:
+            return chain
+        chain.append(row[0])
+
+
+_backfilled = False
+
+
+def _backfill_meta() -> None:
+    """Une fois par process : indexe les threads écrits avant l'existence de thread_meta."""
+    global _backfilled
+    if _backfilled:
+        return
+    with _checkpointer.cursor(transaction=False) as cur:
+        missing = [tuple(r) for r in cur.execute(
+            "SELECT thread_id, MIN(checkpoint_id) FROM checkpoints WHERE checkpoint_ns = '' "
+            "AND thread_id NOT IN (SELECT thread_id FROM thread_meta) GROUP BY thread_id"
+        ).fetchall()]
+    for thread_id, first_id in missing:
+        try:
+            tup = _checkpointer.get_tuple({"configurable": {"thread_id": thread_id}})
+            first = _checkpointer.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_id": first_id}})
+        except Exception:
+            continue
+        if not tup:
+            continue
+        ts = tup.checkpoint.get("ts", "")
+        with _checkpointer.cursor() as cur:
+            _record_meta(cur, thread_id, ts, tup.checkpoint.get("channel_values", {}).get("messages", []))
+            if first:
+                cur.execute(
+                    "UPDATE thread_meta SET created_at = ? WHERE thread_id = ?",
+                    (first.checkpoint.get("ts", ts), thread_id),
+                )
+    _backfilled = True
+
+
 # ── Listing des threads ────────────────────────────────────────────────────────
 
-def list_threads() -> list[dict]:
+def list_threads(limit: int = 50, offset: int = 0) -> list[dict]:
     """
-    Retourne la liste des threads enregistrés, triés du plus récent au plus ancien.
+    Retourne une page des threads enregistrés, du plus récent au plus ancien.
 
-    Chaque entrée : {thread_id, updated_at, created_at, preview}
+    Chaque entrée : {thread_id, updated_at, created_at, preview, title, message_count, pinned,
+    parent} — parent : thread d'origine d'une branche (/branch), sinon None
 
-    On interroge SQLite uniquement pour les métadonnées (thread_id + timestamps).
-    Le preview est extrait via l'API publique LangGraph pour ne pas dépendre
-    du format interne de sérialisation des blobs.
+    Une seule requête sur thread_meta (index sur updated_at) : aucun checkpoint
+    n'est désérialisé.
     """
     if not _DB_PATH.exists():
         return []
 
     try:
-        cur = _conn.cursor()
-        cur.execute("""
-            SELECT
-                thread_id,
-                MIN(checkpoint_id) AS created_id,
-                MAX(checkpoint_id) AS updated_id
-            FROM checkpoints
-            GROUP BY thread_id
-            ORDER BY updated_id DESC
-        """)
-        rows = cur.fetchall()
+        _backfill_meta()
+        with _checkpointer.cursor(transaction=False) as cur:
+            rows = cur.execute(
+                """
+                SELECT m.thread_id, m.created_at, m.updated_at, m.preview, m.message_count, m.title,
+                       m.pinned, b.parent_thread_id
+                FROM thread_meta m LEFT JOIN thread_branches b ON b.thread_id = m.thread_id
+                ORDER BY m.updated_at DESC
+                LIMIT ? OFFSET ?
+                """,
+                (limit, offset),
+            ).fetchall()
     except Exception:
         return []
 
-    threads = []
-    for (thread_id, _, _) in rows:
-        config = {"configurable": {"thread_id": thread_id}}
+    return [
+        {
+            "thread_id":     thread_id,
+            "created_at":    _fmt_ts(created_at),
+            "updated_at":    _fmt_ts(updated_at),
+            "preview":       preview,
+            "message_count": message_count,
+            "title":         title,
+            "pinned":        bool(pinned),
+            "parent":        parent,
+        }
+        for thread_id, created_at, updated_at, preview, message_count, title, pinned, parent in rows
+    ]
+
+
+def count_threads() -> int:
+    if not _DB_PATH.exists():
+        return 0
+    try:
+        _backfill_meta()
+        with _checkpointer.cursor(transaction=False) as cur:
+            return cur.execute("SELECT COUNT(*) FROM thread_meta").fetchone()[0]
+    except Exception:
+        return 0
+
+
+# ── Recherche plein texte ──────────────────────────────────────────────────────
+
+_fts_backfilled = False
+
+
+def _backfill_fts() -> None:
+    """Une fois par process : indexe les threads écrits avant l'existence de message_fts."""
+    global _fts_backfilled
+    if _fts_backfilled:
+        return
+    _backfill_meta()
+    with _checkpointer.cursor(transaction=False) as cur:
+        missing = [r[0] for r in cur.execute(
+            "SELECT thread_id FROM thread_meta WHERE message_count > 0 "
+            "AND thread_id NOT IN (SELECT DISTINCT thread_id FROM message_fts_keys)"
+        ).fetchall()]
+    for thread_id in missing:
         try:
-            tup = _checkpointer.get_tuple(config)
+            tup = _checkpointer.get_tuple({"configurable": {"thread_id": thread_id}})
         except Exception:
-            tup = None
+            continue
+        if tup:
+            with _checkpointer.cursor() as cur:
+                _index_messages(cur, thread_id, tup.checkpoint.get("channel_values", {}).get("messages", []))
+    _fts_backfilled = True
 
-        updated_at = ""
-        preview    = ""
 
-        if tup:
-            # Timestamp ISO du checkpoint
-            ts = tup.checkpoint.get("ts", "")
-            updated_at = _fmt_ts(ts)
-            # Preview = dernier message humain
-            msgs = tup.checkpoint.get("channel_values", {}).get("messages", [])
-            preview = _last_human_preview(msgs)
-
-        threads.append({
-            "thread_id":  thread_id,
-            "updated_at": updated_at,
-            "preview":    preview,
-        })
+def _fts_query(query: str) -> str:
+    """Texte libre → requête FTS5 : chaque mot entre guillemets (pas de syntaxe à
+    échapper : JIRA-1234, chemins…), tous requis, le dernier en préfixe."""
+    terms = [t.replace('"', '""') for t in query.split()]
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_threads(query: str, limit: int = 20) -> list[dict]:
+    """
+    Threads dont les messages correspondent à `query`, du plus pertinent au moins
+    pertinent (meilleur score bm25 de leurs messages).
 
-    return threads
+    Chaque entrée : {thread_id, title, updated_at, hits, role, snippet, score}
+    où snippet/role viennent du message le mieux classé.
+    """
+    match = _fts_query(query)
+    if not match or not _DB_PATH.exists():
+        return []
+    try:
+        _backfill_fts()
+        with _checkpointer.cursor(transaction=False) as cur:
+            # 1. Classement par thread (rank = bm25) ; snippet() est coûteux, il
+            #    n'est calculé ensuite que pour le meilleur message de chaque thread
+            best = cur.execute(
+                """
+                SELECT thread_id, MIN(score), COUNT(*), rid FROM (
+                    SELECT thread_id, rank AS score, rowid AS rid
+                    FROM message_fts WHERE message_fts MATCH ?
+                )
+                GROUP BY thread_id ORDER BY MIN(score) LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+            if not best:
+                return []
+            marks = ",".join("?" * len(best))
+            snippets = {
+                rowid: (role, snip)
+                for rowid, role, snip in cur.execute(
+                    f"SELECT rowid, role, snippet(message_fts, 2, '[', ']', '…', 12) "
+                    f"FROM message_fts WHERE message_fts MATCH ? AND rowid IN ({marks})",
+                    (match, *(r[3] for r in best)),
+                )
+            }
+            meta = {
+                r[0]: r[1:]
+                for r in cur.execute(
+                    f"SELECT thread_id, title, updated_at, message_count FROM thread_meta "
+                    f"WHERE thread_id IN ({marks})",
+                    tuple(r[0] for r in best),
+                )
+            }
+    except sqlite3.OperationalError:
+        return []
+    results = []
+    for thread_id, score, hits, rowid in best:
+        role, snippet = snippets.get(rowid, ("", ""))
+        title, updated_at, count = meta.get(thread_id, ("", "", 0))
+        results.append({
+            "thread_id":     thread_id,
+            "score":         score,
+            "hits":          hits,
+            "role":          role,
+            "snippet":       snippet.replace("\n", " "),
+            "title":         title,
+            "updated_at":    _fmt_ts(updated_at),
+            "message_count": count,
+        })
+    return results
 
 
 def get_recent_messages(thread_id: str, n: int = 6) -> list[dict]:
     """
-    Retourne les N derniers messages d'un thread sous forme de dicts simples
-    {role, content} en utilisant l'API publique LangGraph.
+    Retourne les N derniers messages non vides d'un thread sous forme de dicts
+    simples {role, content}.
+
+    Lus dans thread_meta.tail (une ligne, aucun checkpoint désérialisé) ; repli
+    sur le dernier checkpoint pour un thread écrit avant la colonne tail, dont
+    la ligne est alors complétée.
     """
+    try:
+        with _checkpointer.cursor(transaction=False) as cur:
+            row = cur.execute(
+                "SELECT tail, message_count FROM thread_meta WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+    except Exception:
+        row = None
+    if row and row[0] and n <= _TAIL_MESSAGES:
+        return json.loads(row[0])[-n:]
+
     config = {"configurable": {"thread_id": thread_id}}
     try:
         tup = _checkpointer.get_tuple(config)
@@ -123,15 +804,26 @@ def get_recent_messages(thread_id: str, n: int = 6) -> list[dict]:
     msgs: list[BaseMessage] = (
         tup.checkpoint.get("channel_values", {}).get("messages", [])
     )
-    recent = msgs[-n:] if len(msgs) > n else msgs
+    if row is not None and not row[0]:
+        with _checkpointer.cursor() as cur:
+            cur.execute(
+                "UPDATE thread_meta SET tail = ? WHERE thread_id = ?",
+                (json.dumps(_tail(msgs), ensure_ascii=False), thread_id),
+            )
+    return _tail(msgs, n)
 
-    result = []
-    for m in recent:
-        role    = _role_of(m)
-        content = _text_of(m)
-        if content:
-            result.append({"role": role, "content": content[:300]})
-    return result
+
+def branch_thread(parent_thread_id: str, thread_id: str) -> bool:
+    """/branch : `thread_id` devient une branche copy-on-write de `parent_thread_id`."""
+    return _checkpointer.branch(parent_thread_id, thread_id)
+
+
+def warm_thread(thread_id: str) -> None:
+    """Précharge l'état complet de `thread_id` hors du chemin critique."""
+    try:
+        _checkpointer.warm(thread_id)
+    except Exception:
+        pass
 
 
 # ── Helpers internes ───────────────────────────────────────────────────────────
@@ -156,11 +848,24 @@ def _text_of(m: BaseMessage) -> str:
     return ""
 
 
-def _last_human_preview(msgs: list) -> str:
-    for m in reversed(msgs):
+def _human_texts(msgs, reverse: bool = False):
+    """Textes des messages humains, hors résumés de compaction."""
+    for m in (reversed(msgs) if reverse else msgs):
         if isinstance(m, HumanMessage):
-            text = _text_of(m).replace("\n", " ")
-            return text[:80] + ("…" if len(text) > 80 else "")
+            text = _text_of(m)
+            if text and not text.startswith(SUMMARY_MARKER):
+                yield text.replace("\n", " ")
+
+
+def _last_human_preview(msgs: list) -> str:
+    for text in _human_texts(msgs, reverse=True):
+        return text[:80] + ("…" if len(text) > 80 else "")
+    return ""
+
+
+def _first_human_title(msgs: list) -> str:
+    for text in _human_texts(msgs):
+        return text[:60] + ("…" if len(text) > 60 else "")
     return ""
 
 
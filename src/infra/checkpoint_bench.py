@@ -0,0 +1,192 @@
+# src/infra/checkpoint_bench.py
+"""
+Benchmark des écritures de checkpoint par étape de graphe.
+
+Rejoue des tours synthétiques (un message humain puis N étapes qui ajoutent
+chacune un message IA de taille fixe) sur une base temporaire, dans deux
+configurations :
+
+- avant : journal rollback par défaut, synchronous=FULL, écriture sur le
+          thread appelant (SqliteSaver tel quel)
+- après : WAL, synchronous=NORMAL, mmap, writer dédié par lots (configure()
+          + async_writes=True, la configuration de memory.db)
+
+Mesures :
+- put / writes : latence côté appelant de put() et put_writes() (p50 / p95)
+- étape        : intervalle entre deux mises à jour du stream (p50 / p95) —
+                 ce que voit le thread qui affiche les tokens
+- flush        : attente de fin de tour jusqu'à ce que tout soit sur disque
+- tour         : stream complet + flush
+
+    python -m src.infra.checkpoint_bench --turns 20 --steps 8
+    python -m src.infra.checkpoint_bench --bytes 20000 --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from src.infra.checkpoint import _TracedSaver, configure
+
+_MODES = ("avant", "après")
+
+
+class _TimedSaver(_TracedSaver):
+    """Chronomètre put / put_writes sur le thread appelant."""
+
+    def __init__(self, conn: sqlite3.Connection, async_writes: bool) -> None:
+        super().__init__(conn, async_writes=async_writes)
+        self.put_ms: list[float] = []
+        self.writes_ms: list[float] = []
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        t0 = time.perf_counter()
+        try:
+            return super().put(config, checkpoint, metadata, new_versions)
+        finally:
+            self.put_ms.append((time.perf_counter() - t0) * 1000)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        t0 = time.perf_counter()
+        try:
+            return super().put_writes(config, writes, task_id, task_path)
+        finally:
+            self.writes_ms.append((time.perf_counter() - t0) * 1000)
+
+
+def _connect(path: Path, mode: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    if mode == "après":
+        return configure(conn)
+    conn.execute("PRAGMA synchronous = FULL")
+    return conn
+
+
+def _graph(saver, steps: int, msg_bytes: int):
+    def step(state: MessagesState) -> dict:
+        return {"messages": [AIMessage("x" * msg_bytes)]}
+
+    def route(state: MessagesState) -> str:
+        since_human = 0
+        for m in reversed(state["messages"]):
+            if isinstance(m, HumanMessage):
+                break
+            since_human += 1
+        return "step" if since_human < steps else END
+
+    g = StateGraph(MessagesState)
+    g.add_node("step", step)
+    g.add_edge(START, "step")
+    g.add_conditional_edges("step", route)
+    return g.compile(checkpointer=saver)
+
+
+def _pct(values: list[float], p: float) -> float:
+    return float(np.percentile(np.asarray(values, dtype=np.float64), p)) if values else 0.0
+
+
+def run_benchmark(
+    mode: str,
+    turns: int = 10,
+    steps: int = 8,
+    msg_bytes: int = 2_000,
+    directory: Path | None = None,
+) -> dict:
+    """Rejoue `turns` tours de `steps` étapes sur une base neuve ; retourne les percentiles (ms)."""
+    if mode not in _MODES:
+        raise ValueError(f"mode inconnu : {mode}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(directory or tmp) / f"bench-{'wal' if mode == 'après' else 'rollback'}.db"
+        conn = _connect(path, mode)
+        saver = _TimedSaver(conn, async_writes=mode == "après")
+        app = _graph(saver, steps, msg_bytes)
+        config = {"configurable": {"thread_id": "bench"}, "recursion_limit": steps + 5}
+
+        step_ms: list[float] = []
+        flush_ms: list[float] = []
+        turn_ms: list[float] = []
+        for i in range(turns):
+            t0 = last = time.perf_counter()
+            for _ in app.stream({"messages": [HumanMessage(f"tour {i}")]}, config, stream_mode="updates"):
+                now = time.perf_counter()
+                step_ms.append((now - last) * 1000)
+                last = now
+            t1 = time.perf_counter()
+            saver.flush()
+            done = time.perf_counter()
+            flush_ms.append((done - t1) * 1000)
+            turn_ms.append((done - t0) * 1000)
+
+        stats = saver.stats()
+        conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    return {
+        "mode": mode,
+        "turns": turns,
+        "steps": steps,
+        "msg_bytes": msg_bytes,
+        "put_p50_ms": round(_pct(saver.put_ms, 50), 3),
+        "put_p95_ms": round(_pct(saver.put_ms, 95), 3),
+        "writes_p50_ms": round(_pct(saver.writes_ms, 50), 3),
+        "writes_p95_ms": round(_pct(saver.writes_ms, 95), 3),
+        "step_p50_ms": round(_pct(step_ms, 50), 3),
+        "step_p95_ms": round(_pct(step_ms, 95), 3),
+        "flush_p50_ms": round(_pct(flush_ms, 50), 3),
+        "turn_p50_ms": round(_pct(turn_ms, 50), 3),
+        "turn_p95_ms": round(_pct(turn_ms, 95), 3),
+        "batches": stats["batches"],
+        "max_batch": stats["max_batch"],
+    }
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _print_report(reports: list[dict]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    tbl = Table(box=box.SIMPLE_HEAD, title="écritures de checkpoint (ms)", title_style="bold color(214)")
+    tbl.add_column("mode", no_wrap=True)
+    for col in ("put p50", "put p95", "writes p50", "writes p95", "étape p50", "étape p95",
+                "flush p50", "tour p50", "tour p95", "lots"):
+        tbl.add_column(col, justify="right", no_wrap=True)
+    for r in reports:
+        tbl.add_row(
+            r["mode"], f"{r['put_p50_ms']:.2f}", f"{r['put_p95_ms']:.2f}",
+            f"{r['writes_p50_ms']:.2f}", f"{r['writes_p95_ms']:.2f}",
+            f"{r['step_p50_ms']:.2f}", f"{r['step_p95_ms']:.2f}", f"{r['flush_p50_ms']:.2f}",
+            f"{r['turn_p50_ms']:.1f}", f"{r['turn_p95_ms']:.1f}",
+            f"{r['batches']} (max {r['max_batch']})" if r["batches"] else "—",
+        )
+    Console().print(tbl)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des écritures de checkpoint")
+    parser.add_argument("--turns", type=int, default=20, help="tours rejoués par mode")
+    parser.add_argument("--steps", type=int, default=8, help="étapes de graphe par tour")
+    parser.add_argument("--bytes", type=int, default=2_000, help="taille de chaque message IA")
+    parser.add_argument("--dir", type=Path, default=None, help="dossier de la base (défaut : temporaire)")
+    parser.add_argument("--json", action="store_true", help="sortie JSON brute")
+    args = parser.parse_args(argv)
+
+    reports = [run_benchmark(m, args.turns, args.steps, args.bytes, args.dir) for m in _MODES]
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        _print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# src/infra/embedding_cache.py
+"""
+Index d'embeddings persistant, adressé par contenu.
+
+- Chaque document est identifié par sha256(modèle + texte) → un vecteur
+- Stocké dans ~/.axon/embeddings/<modèle>.npz (clés + matrice float32)
+- Seuls les documents nouveaux ou modifiés passent par le modèle d'embedding ;
+  le reste est relu depuis le disque en quelques millisecondes au démarrage
+- QueryCache : LRU borné requête → vecteur, en mémoire uniquement, pour ne pas
+  ré-embedder la même requête à chaque round d'outils d'un même tour
+- CachedEmbeddings : embedder LangChain qui passe par ces deux caches
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_INDEX_DIR = Path.home() / ".axon" / "embeddings"
+
+
+def content_key(model: str, text: str) -> str:
+    """Clé stable d'un document : hash du nom du modèle et du texte exact."""
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def _slug(model: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model) or "default"
+
+
+class EmbeddingIndex:
+    """Vecteurs de documents persistés sur disque, un fichier par modèle."""
+
+    def __init__(self, model: str, directory: Path | None = None) -> None:
+        self.model = model
+        self.path = (directory or _INDEX_DIR) / f"{_slug(model)}.npz"
+        self._vectors: dict[str, np.ndarray] = {}
+        self.loaded = 0     # vecteurs relus depuis le disque
+        self.embedded = 0   # vecteurs calculés pendant cette session
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.is_file():
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                keys, matrix = data["keys"], data["vectors"]
+            if len(keys) != len(matrix):
+                return
+            self._vectors = {str(k): matrix[i] for i, k in enumerate(keys)}
+            self.loaded = len(self._vectors)
+        except Exception:
+            # Fichier corrompu ou format obsolète → on repart de zéro
+            self._vectors = {}
+
+    def save(self) -> None:
+        if not self._vectors:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        keys = np.array(list(self._vectors), dtype=str)
+        matrix = np.stack(list(self._vectors.values())).astype(np.float32, copy=False)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, keys=keys, vectors=matrix)
+        os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, text: str) -> bool:
+        return content_key(self.model, text) in self._vectors
+
+    def sync(self, texts: list[str], embeddings: Embeddings, prune: bool = True) -> np.ndarray:
+        """
+        Retourne la matrice (len(texts), dim) des vecteurs de `texts`.
+
+        Seuls les textes absents de l'index sont envoyés à `embeddings`, en un
+        seul batch. Avec prune=True, l'index est ensuite réduit aux textes demandés
+        (les documents supprimés ou modifiés disparaissent). Le fichier n'est
+        réécrit que si quelque chose a changé.
+        """
+        keys = [content_key(self.model, t) for t in texts]
+        missing: dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in self._vectors and k not in missing:
+                missing[k] = t
+
+        if missing:
+            vectors = embeddings.embed_documents(list(missing.values()))
+            for k, v in zip(missing, vectors):
+                self._vectors[k] = np.asarray(v, dtype=np.float32)
+            self.embedded += len(missing)
+
+        wanted = set(keys)
+        stale = [k for k in self._vectors if k not in wanted] if prune else []
+        for k in stale:
+            del self._vectors[k]
+
+        if missing or stale:
+            try:
+                self.save()
+            except OSError:
+                pass  # disque en lecture seule → l'index reste valable en mémoire
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([self._vectors[k] for k in keys])
+
+
+class QueryCache:
+    """LRU thread-safe requête → vecteur, avec compteurs hits/misses."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str) -> np.ndarray | None:
+        with self._lock:
+            vec = self._data.get(query)
+            if vec is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(query)
+            self.hits += 1
+            return vec
+
+    def put(self, query: str, vector) -> None:
+        with self._lock:
+            self._data[query] = np.asarray(vector, dtype=np.float32)
+            self._data.move_to_end(query)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings LangChain adossées aux deux caches de ce module.
+
+    Les documents passent par l'EmbeddingIndex persistant (sans élagage). Les
+    requêtes passent par le QueryCache : elles changent à chaque tour et ne sont
+    jamais écrites sur disque.
+    """
+
+    def __init__(self, inner: Embeddings, index: EmbeddingIndex, queries: QueryCache | None = None) -> None:
+        self.inner = inner
+        self.index = index
+        self.queries = queries if queries is not None else QueryCache()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.index.sync(list(texts), self.inner, prune=False).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        found, missing = self.lookup([text])
+        found.update(self.embed_missing(missing))
+        return found[text].tolist()
+
+    def lookup(self, queries: list[str]) -> tuple[dict[str, np.ndarray], list[str]]:
+        """Vecteurs déjà dans le LRU, et requêtes distinctes restant à calculer."""
+        found: dict[str, np.ndarray] = {}
+        missing: list[str] = []
+        for q in queries:
+            vec = self.queries.get(q)
+            if vec is not None:
+                found[q] = vec
+            elif q not in missing:
+                missing.append(q)
+        return found, missing
+
+    def embed_missing(self, queries: list[str]) -> dict[str, np.ndarray]:
+        """Un seul appel au modèle pour `queries`, dont les vecteurs alimentent le LRU."""
+        if not queries:
+            return {}
+        vectors = self.inner.embed_documents(list(queries))
+        for q, v in zip(queries, vectors):
+            self.queries.put(q, v)
+        return {q: np.asarray(v, dtype=np.float32) for q, v in zip(queries, vectors)}
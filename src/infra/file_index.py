@@ -0,0 +1,492 @@
+# src/infra/file_index.py
+"""
+Index persistant des noms de fichiers et de dossiers.
+
+local_find_file et local_list_directory(name=...) lançaient fd / find sur tout
+$HOME à chaque appel (jusqu'à 15–20 s). À la place :
+
+- un thread axon-file-index parcourt une fois le dossier des projets et $HOME
+  et enregistre chaque dossier avec son mtime dans ~/.axon/file_index.db
+- mêmes exclusions que fd : entrées cachées (.cache, .local, .git…) et
+  fichiers listés dans .gitignore / .ignore / .fdignore (motifs simples, sans
+  négation), plus node_modules ; les dossiers de build (target, dist, build,
+  __pycache__) sont listés mais jamais parcourus
+- profondeur comme avant : fichiers jusqu'à 10 niveaux, dossiers jusqu'à 8
+- au démarrage suivant l'index est rechargé depuis la base, puis tenu à jour
+  toutes les refresh_seconds par un stat() de chaque dossier indexé : seul un
+  dossier dont le mtime a changé (entrée créée, supprimée ou renommée) est
+  relu — un sous-dossier apparu est parcouru, un disparu retiré avec son
+  sous-arbre
+- les requêtes lisent un instantané en mémoire (noms en minuscules joints en
+  une seule chaîne) : sous-chaîne puis sous-séquence (« rprt » → rapport),
+  en quelques millisecondes
+
+Tant que le premier parcours n'est pas fini, ou pour une racine hors index,
+find_files / find_dirs retournent None et l'outil repasse par fd / find.
+Un résultat peut précéder le prochain rafraîchissement de quelques minutes :
+les outils revérifient chaque chemin (stat) avant de le rendre.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+_DB_PATH = Path.home() / ".axon" / "file_index.db"
+_DEFAULTS = {"enabled": 1, "refresh_seconds": 300, "max_depth": 10}
+_DIR_MAX_DEPTH = 8     # fd --max-depth 8 des recherches de dossiers
+_MAX_CANDIDATES = 5_000
+_FUZZY_BELOW = 20      # sous-séquence seulement si moins de résultats exacts / sous-chaîne
+_FUZZY_MAX = 200       # candidats sous-séquence (l'outil les note ensuite avec SequenceMatcher)
+
+# Ni listés ni parcourus (en plus des entrées cachées et ignorées)
+_HIDDEN = frozenset({"node_modules"})
+# Listés comme dossiers, jamais parcourus
+_PRUNED = frozenset({"__pycache__", "target", "dist", "build"})
+_IGNORE_FILES = (".gitignore", ".ignore", ".fdignore")
+
+_SCHEMA_VERSION = 2   # à incrémenter quand les exclusions changent
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    depth    INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entries (
+    dir    TEXT NOT NULL,
+    name   TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    PRIMARY KEY (dir, name)
+) WITHOUT ROWID;
+"""
+
+
+def policy() -> dict:
+    from src.infra.settings import settings
+    configured = getattr(settings, "file_index", None) or {}
+    return {k: int(configured.get(k, v)) for k, v in _DEFAULTS.items()}
+
+
+def _under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _read_rules(directory: str) -> list[tuple[str, re.Pattern, bool, bool]]:
+    """Règles des fichiers d'ignore de `directory` : (dossier, motif, dossiers seuls, ancré).
+    Sous-ensemble de la syntaxe gitignore : ni négation (!) ni **/ en tête."""
+    rules = []
+    for fname in _IGNORE_FILES:
+        try:
+            lines = Path(directory, fname).read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith(("#", "!")):
+                continue
+            if line.startswith("**/"):
+                line = line[3:]
+            dir_only = line.endswith("/")
+            # Un / en tête ou au milieu ancre le motif au dossier du fichier d'ignore
+            anchored = "/" in line.rstrip("/")
+            line = line.strip("/")
+            if line:
+                rules.append((directory, re.compile(fnmatch.translate(line)), dir_only, anchored))
+    return rules
+
+
+def _ignored(rules, directory: str, name: str, is_dir: bool) -> bool:
+    for base, pattern, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        target = os.path.relpath(os.path.join(directory, name), base) if anchored else name
+        if pattern.match(target):
+            return True
+    return False
+
+
+class _Names:
+    """Instantané immuable : chemins + noms en minuscules joints par des \\n."""
+
+    def __init__(self, paths: list[str]) -> None:
+        self.paths = paths
+        self.starts = array("q")
+        parts = []
+        pos = 1
+        for p in paths:
+            name = os.path.basename(p).lower()
+            self.starts.append(pos)
+            parts.append(name)
+            pos += len(name) + 1
+        self.blob = "\n" + "\n".join(parts) + "\n"
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _find(self, literal: str):
+        """Position du dernier caractère de chaque occurrence de `literal` (str.find, en C)."""
+        pos = self.blob.find(literal)
+        while pos >= 0:
+            yield pos + len(literal) - 1
+            pos = self.blob.find(literal, pos + 1)
+
+    def _scan(self, ends, base: str | None, limit: int, seen: set[int]) -> list[str]:
+        out: list[str] = []
+        if limit <= 0:
+            return out
+        for end in ends:
+            i = bisect_right(self.starts, end) - 1
+            if i < 0 or i in seen:
+                continue
+            seen.add(i)
+            path = self.paths[i]
+            if base and not _under(path, base):
+                continue
+            out.append(path)
+            if len(out) >= limit:
+                break
+        return out
+
+    def search(self, needle: str, base: str | None = None, limit: int = _MAX_CANDIDATES) -> list[str]:
+        """Noms égaux, puis contenant `needle`, puis le contenant en sous-séquence."""
+        needle = needle.lower().replace("\n", "")
+        if not needle:
+            return []
+        seen: set[int] = set()
+        # Positions prises sur le dernier caractère du nom matché, jamais sur un \n
+        exact = (end - 1 for end in self._find(f"\n{needle}\n"))
+        found = self._scan(exact, base, limit, seen)
+        found += self._scan(self._find(needle), base, limit - len(found), seen)
+        if len(found) < _FUZZY_BELOW:
+            # [^\n<c>]* avant chaque caractère suivant : pas de retour arrière, et le
+            # premier caractère littéral laisse le moteur sauter d'occurrence en occurrence
+            head, rest = needle[0], needle[1:]
+            fuzzy = re.compile(re.escape(head) + "".join(f"[^\n{re.escape(c)}]*{re.escape(c)}" for c in rest))
+            found += self._scan((m.end() - 1 for m in fuzzy.finditer(self.blob)), base,
+                                min(limit - len(found), _FUZZY_MAX), seen)
+        return found
+
+
+class FileIndex:
+    def __init__(self, path: Path | None = None, roots: list[Path] | None = None,
+                 max_depth: int = _DEFAULTS["max_depth"]) -> None:
+        self.path = path or _DB_PATH
+        self._roots = roots
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._tree: dict[str, tuple[int, int, dict[str, bool]]] = {}   # dossier → (mtime_ns, profondeur, enfants)
+        self._rules: dict[str, list] = {}   # dossier → règles de ses propres fichiers d'ignore
+        self._files = _Names([])
+        self._dirs = _Names([])
+        self._ready = False
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.counters = {"queries": 0, "fallbacks": 0, "stale": 0, "refreshes": 0, "rescanned": 0,
+                         "walked": 0, "refresh_ms": 0.0}
+
+    # ── Racines ──────────────────────────────────────────────────────────────
+
+    def roots(self) -> list[str]:
+        if self._roots is not None:
+            roots = self._roots
+        else:
+            from src.utils.paths import get_projects_dir
+            roots = [get_projects_dir(), Path.home()]
+        out: list[str] = []
+        for r in roots:
+            try:
+                r = str(Path(r).expanduser().resolve())
+            except OSError:
+                continue
+            if r not in out and os.path.isdir(r):
+                out.append(r)
+        return out
+
+    def covers(self, base: str) -> bool:
+        try:
+            base = str(Path(base).expanduser().resolve())
+        except OSError:
+            return False
+        return any(_under(base, r) for r in self.roots())
+
+    # ── Requêtes ─────────────────────────────────────────────────────────────
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def _query(self, names: _Names, needle: str, base: str | None) -> list[str] | None:
+        if not self._ready or (base and not self.covers(base)):
+            with self._lock:
+                self.counters["fallbacks"] += 1
+            return None
+        with self._lock:
+            self.counters["queries"] += 1
+        found = names.search(needle, str(Path(base).expanduser().resolve()) if base else None)
+        # Meilleur candidat supprimé depuis le dernier scan : l'index est en retard
+        # sur ce coin du disque, l'appelant refait une recherche directe.
+        if found and not os.path.exists(found[0]):
+            with self._lock:
+                self.counters["stale"] += 1
+            return None
+        return found
+
+    def find_files(self, needle: str, base: str | None = None) -> list[str] | None:
+        """Chemins de fichiers dont le nom correspond à `needle`. None = index indisponible
+        ou périmé ; [] ne prouve pas l'absence (fichier créé depuis le dernier scan)."""
+        return self._query(self._files, needle, base)
+
+    def find_dirs(self, needle: str, base: str | None = None) -> list[str] | None:
+        """Chemins de dossiers dont le nom correspond à `needle`. Mêmes conventions que find_files."""
+        return self._query(self._dirs, needle, base)
+
+    # ── Parcours ─────────────────────────────────────────────────────────────
+
+    def _list(self, directory: str, inherited: list) -> tuple[int, dict[str, bool]] | None:
+        """(mtime, enfants) de `directory` hors entrées cachées / ignorées ; ses propres
+        règles d'ignore sont gardées dans self._rules pour ses descendants."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return None
+        own = _read_rules(directory) if any(e.name in _IGNORE_FILES for e in entries) else []
+        self._rules[directory] = own
+        rules = inherited + own
+        children = {}
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name in _HIDDEN:
+                continue
+            try:
+                is_dir = entry.is_dir()   # suit les liens, comme fd --follow
+            except OSError:
+                continue
+            if rules and _ignored(rules, directory, entry.name, is_dir):
+                continue
+            children[entry.name] = is_dir
+        return mtime, children
+
+    def _inherited(self, directory: str, roots: list[str]) -> list:
+        """Règles d'ignore des ancêtres de `directory`, de sa racine à son parent."""
+        root = max((r for r in roots if _under(directory, r)), key=len, default=directory)
+        chain = []
+        d = os.path.dirname(directory)
+        while _under(d, root) and d != directory:
+            chain.append(d)
+            if d == root:
+                break
+            d = os.path.dirname(d)
+        rules = []
+        for d in reversed(chain):
+            if d not in self._rules:
+                self._rules[d] = _read_rules(d)
+            rules += self._rules[d]
+        return rules
+
+    def _descend(self, directory: str, name: str, is_dir: bool, depth: int, roots: list[str]) -> bool:
+        # Une autre racine (dossier des projets dans $HOME) est parcourue depuis elle-même
+        child = os.path.join(directory, name)
+        return (is_dir and name not in _PRUNED and depth + 1 < self.max_depth
+                and child not in roots and child not in self._tree)
+
+    def _walk(self, start: str, depth: int, roots: list[str], changed: set[str],
+              inherited: list | None = None) -> None:
+        visited: set[tuple[int, int]] = set()
+        stack = [(start, depth, self._inherited(start, roots) if inherited is None else inherited)]
+        while stack:
+            directory, d, rules = stack.pop()
+            try:
+                st = os.stat(directory)
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) in visited:
+                continue   # boucle de liens symboliques
+            visited.add((st.st_dev, st.st_ino))
+            listed = self._list(directory, rules)
+            if listed is None:
+                continue
+            mtime, children = listed
+            self._tree[directory] = (mtime, d, children)
+            changed.add(directory)
+            self.counters["walked"] += 1
+            below = rules + self._rules[directory]
+            for name, is_dir in children.items():
+                if self._descend(directory, name, is_dir, d, roots):
+                    stack.append((os.path.join(directory, name), d + 1, below))
+
+    def _drop(self, directory: str, removed: set[str]) -> None:
+        for path in [p for p in self._tree if _under(p, directory)]:
+            del self._tree[path]
+            self._rules.pop(path, None)
+            removed.add(path)
+
+    def _rescan(self, directory: str, roots: list[str], changed: set[str], removed: set[str]) -> None:
+        old_mtime, depth, old = self._tree[directory]
+        old_rules = [(r[1].pattern, r[2], r[3]) for r in self._rules.get(directory, [])]
+        inherited = self._inherited(directory, roots)
+        listed = self._list(directory, inherited)
+        if listed is None:
+            self._drop(directory, removed)
+            return
+        mtime, children = listed
+        self._tree[directory] = (mtime, depth, children)
+        changed.add(directory)
+        self.counters["rescanned"] += 1
+        # Fichier d'ignore créé / supprimé : les sous-arbres sont refaits avec les nouvelles règles
+        rules_changed = old_rules != [(r[1].pattern, r[2], r[3]) for r in self._rules[directory]]
+        for name, was_dir in old.items():
+            if was_dir and (rules_changed or children.get(name) is not True):
+                self._drop(os.path.join(directory, name), removed)
+        below = inherited + self._rules[directory]
+        for name, is_dir in children.items():
+            if self._descend(directory, name, is_dir, depth, roots):
+                self._walk(os.path.join(directory, name), depth + 1, roots, changed, below)
+
+    def refresh(self) -> dict:
+        """Une passe : nouvelles racines parcourues, dossiers au mtime changé relus,
+        persistance et nouvel instantané si quelque chose a bougé."""
+        t0 = time.perf_counter()
+        roots = self.roots()
+        changed: set[str] = set()
+        removed: set[str] = set()
+        for path in [p for p in self._tree if not any(_under(p, r) for r in roots)]:
+            del self._tree[path]
+            removed.add(path)
+        for root in roots:
+            if root not in self._tree:
+                self._walk(root, 0, roots, changed)
+        for directory in list(self._tree):
+            entry = self._tree.get(directory)
+            if entry is None:
+                continue   # retiré avec le sous-arbre d'un parent pendant cette passe
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._drop(directory, removed)
+                continue
+            if mtime != entry[0]:
+                self._rescan(directory, roots, changed, removed)
+        if changed or removed or not self._ready:
+            self._persist(changed, removed - changed)
+            self._snapshot()
+        ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self.counters["refreshes"] += 1
+            self.counters["refresh_ms"] = round(ms, 1)
+        return {"changed": len(changed), "removed": len(removed), "ms": round(ms, 1)}
+
+    def _snapshot(self) -> None:
+        files: list[str] = []
+        dirs: list[str] = []
+        for directory, (_, depth, children) in self._tree.items():
+            with_dirs = depth < _DIR_MAX_DEPTH
+            for name, is_dir in children.items():
+                if not is_dir:
+                    files.append(os.path.join(directory, name))
+                elif with_dirs:
+                    dirs.append(os.path.join(directory, name))
+        # Remplacement atomique : une requête en cours garde l'ancien instantané
+        self._files, self._dirs = _Names(files), _Names(dirs)
+        self._ready = True
+
+    # ── Persistance ──────────────────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.path))
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+        if db.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            # Règles d'exclusion changées : l'index enregistré est refait de zéro
+            db.executescript(f"DROP TABLE IF EXISTS dirs; DROP TABLE IF EXISTS entries; "
+                             f"PRAGMA user_version = {_SCHEMA_VERSION};")
+        db.executescript(_SCHEMA)
+        return db
+
+    def _persist(self, changed: set[str], removed: set[str]) -> None:
+        try:
+            db = self._connect()
+        except sqlite3.Error:
+            return   # index en mémoire seulement ; reparcouru au prochain lancement
+        try:
+            with db:
+                db.executemany("DELETE FROM dirs WHERE path = ?", [(p,) for p in removed | changed])
+                db.executemany("DELETE FROM entries WHERE dir = ?", [(p,) for p in removed | changed])
+                db.executemany(
+                    "INSERT INTO dirs (path, mtime_ns, depth) VALUES (?, ?, ?)",
+                    [(p, self._tree[p][0], self._tree[p][1]) for p in changed],
+                )
+                db.executemany(
+                    "INSERT INTO entries (dir, name, is_dir) VALUES (?, ?, ?)",
+                    [(p, name, int(is_dir)) for p in changed for name, is_dir in self._tree[p][2].items()],
+                )
+        except sqlite3.Error:
+            pass
+        finally:
+            db.close()
+
+    def load(self) -> bool:
+        """Recharge l'index enregistré ; prêt à répondre aussitôt. False si base absente ou vide."""
+        if not self.path.exists():
+            return False
+        try:
+            db = self._connect()
+            try:
+                tree = {p: (mtime, depth, {}) for p, mtime, depth in db.execute("SELECT path, mtime_ns, depth FROM dirs")}
+                for directory, name, is_dir in db.execute("SELECT dir, name, is_dir FROM entries"):
+                    if directory in tree:
+                        tree[directory][2][name] = bool(is_dir)
+            finally:
+                db.close()
+        except sqlite3.Error:
+            return False
+        if not tree:
+            return False
+        self._tree = tree
+        self._snapshot()
+        return True
+
+    # ── Thread de fond ───────────────────────────────────────────────────────
+
+    def _run(self, interval: float) -> None:
+        self.load()
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                pass   # un index en retard ne doit jamais gêner la session
+            if self._stop.wait(interval):
+                return
+
+    def start(self) -> bool:
+        """Charge puis maintient l'index dans le thread axon-file-index."""
+        p = policy()
+        if not p["enabled"] or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self.max_depth = p["max_depth"]
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(p["refresh_seconds"],),
+                                        name="axon-file-index", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "ready": self._ready, "files": len(self._files),
+                    "dirs": len(self._dirs), "indexed_dirs": len(self._tree)}
+
+
+file_index = FileIndex()
@@ -0,0 +1,147 @@
+# src/infra/prefetch.py
+"""
+Préchauffage du cache d'outils à l'entrée dans un repo git.
+
+Après un shell_cd, l'agent appelle presque toujours git_status, git_log,
+local_list_directory puis lit le README ou le manifeste. Dès que le cwd du
+shell change vers un repo, ces outils en lecture seule sont exécutés dans un
+thread et leurs résultats déposés dans session_cache : le premier tour LLM du
+projet tombe sur des hits au lieu d'appels subprocess en série.
+
+- Annulation : un nouveau changement de cwd invalide le job en cours (vérifié
+  entre deux outils — un appel déjà lancé va à son terme, sans être stocké)
+- Plafond d'octets lus/stockés par job (max_bytes)
+- Les entrées déjà fraîches en cache ne sont pas recalculées
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+_MAX_BYTES = 512 * 1024
+
+_README_NAMES = ("README.md", "readme.md", "README.rst", "README.txt", "README")
+_MANIFEST_NAMES = (
+    "pyproject.toml", "package.json", "Cargo.toml", "go.mod", "requirements.txt",
+    "pom.xml", "build.gradle", "CMakeLists.txt",
+)
+
+
+def _plan(repo: Path) -> list[tuple[str, dict]]:
+    """Appels à préchauffer, dans l'ordre où l'agent les fait d'habitude."""
+    calls: list[tuple[str, dict]] = [
+        ("git_status", {}),
+        ("local_list_directory", {"path": str(repo)}),
+        ("git_log", {}),
+    ]
+    readme = next((repo / n for n in _README_NAMES if (repo / n).is_file()), None)
+    if readme is not None:
+        calls.append(("local_read_file", {"path": str(readme)}))
+    calls += [("local_read_file", {"path": str(repo / n)}) for n in _MANIFEST_NAMES if (repo / n).is_file()]
+    return calls
+
+
+def _tools() -> dict:
+    from src.agents.filesystem.tools import local_list_directory, local_read_file
+    from src.agents.git.tools import git_log, git_status
+    return {t.name: t for t in (git_status, git_log, local_list_directory, local_read_file)}
+
+
+class RepoPrefetcher:
+    def __init__(self, max_bytes: int = _MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="axon-prefetch")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._job: Future | None = None
+        self.counters = {"started": 0, "completed": 0, "cancelled": 0, "entries": 0, "bytes": 0, "skipped": 0}
+
+    def on_cwd_changed(self, cwd: Path) -> bool:
+        """Annule le job en cours et, si `cwd` est dans un repo git, en lance un nouveau."""
+        from src.infra.tools_cache import _git_dir
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        if _git_dir(Path(cwd)) is None:
+            return False
+        with self._lock:
+            self._job = self._executor.submit(self._run, generation, Path(cwd))
+            self.counters["started"] += 1
+        return True
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def _cancelled(self, generation: int) -> bool:
+        with self._lock:
+            if generation == self._generation:
+                return False
+            self.counters["cancelled"] += 1
+            return True
+
+    def _run(self, generation: int, repo: Path) -> None:
+        from langgraph.prebuilt.tool_node import msg_content_output
+        from src.infra.tools_cache import session_cache
+
+        tools = _tools()
+        session_cache.register_tools(tools.values())
+        budget = self.max_bytes
+        for name, args in _plan(repo):
+            if self._cancelled(generation):
+                return
+            if session_cache.has(name, args):
+                continue
+            if name == "local_read_file" and not self._fits(Path(args["path"]), budget):
+                continue
+            try:
+                result = tools[name].invoke(session_cache.normalize(name, args))
+            except Exception:
+                continue
+            if isinstance(result, dict) and result.get("status") != "ok":
+                continue
+            # Même forme que le contenu d'un ToolMessage produit par ToolNode
+            content = msg_content_output(result)
+            size = len(str(content).encode("utf-8"))
+            if size > budget:
+                with self._lock:
+                    self.counters["skipped"] += 1
+                continue
+            if self._cancelled(generation):
+                return
+            session_cache.set(name, args, content)
+            budget -= size
+            with self._lock:
+                self.counters["entries"] += 1
+                self.counters["bytes"] += size
+        with self._lock:
+            self.counters["completed"] += 1
+
+    def _fits(self, path: Path, budget: int) -> bool:
+        """Taille connue avant lecture : un fichier qui dépasse le reste du budget est sauté."""
+        try:
+            fits = path.stat().st_size <= budget
+        except OSError:
+            return False
+        if not fits:
+            with self._lock:
+                self.counters["skipped"] += 1
+        return fits
+
+    def wait(self, timeout: float | None = None) -> None:
+        with self._lock:
+            job = self._job
+        if job is not None:
+            try:
+                job.result(timeout=timeout)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = self._job is not None and not self._job.done()
+            return {**self.counters, "running": running}
+
+
+prefetcher = RepoPrefetcher()
@@ -0,0 +1,227 @@
+# src/infra/retention.py
+"""
+Rétention et compaction de ~/.axon/memory.db.
+
+SqliteSaver garde chaque checkpoint intermédiaire de chaque tour. Politiques
+(défauts ← configs/base.yaml, section retention) :
+
+- keep_checkpoints : seuls les N derniers checkpoints de chaque thread sont
+  gardés (avec leurs writes) — le dernier suffit pour reprendre un thread ;
+  un checkpoint de fork lu par une branche (/branch) est toujours gardé
+- idle_days        : un thread inactif depuis plus de X jours est supprimé,
+  sauf s'il est épinglé (/db pin) ou actif
+- interval_hours   : au plus une passe automatique par intervalle, au démarrage
+
+Les blobs de src.infra.blobs qu'aucun checkpoint restant ne cite sont
+supprimés à la fin de chaque passe.
+
+Sûr pendant une session : chaque suppression passe par le verrou du
+checkpointer, thread par thread, et le VACUUM incrémental procède par lots de
+pages — les écritures du tour en cours ne sont jamais bloquées longtemps.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.infra import checkpoint as _ckpt
+
+_DEFAULTS = {"keep_checkpoints": 20, "idle_days": 90, "interval_hours": 24}
+_LAST_RUN = _ckpt._AXON_DIR / "retention_last_run"
+_VACUUM_BATCH = 512          # pages libérées par prise de verrou
+
+_lock = threading.Lock()     # une seule passe à la fois
+_last_report: dict = {}
+
+
+def policy() -> dict:
+    from src.infra.settings import settings
+    configured = getattr(settings, "retention", None) or {}
+    return {k: int(configured.get(k, v)) for k, v in _DEFAULTS.items()}
+
+
+def prune_checkpoints(keep: int) -> int:
+    """Ne garde que les `keep` derniers checkpoints de chaque thread. Retourne le nombre supprimé."""
+    saver = _ckpt._checkpointer
+    with saver.cursor(transaction=False) as cur:
+        groups = cur.execute(
+            "SELECT thread_id, checkpoint_ns FROM checkpoints "
+            "GROUP BY thread_id, checkpoint_ns HAVING COUNT(*) > ?", (keep,),
+        ).fetchall()
+    deleted = 0
+    for thread_id, ns in groups:
+        with saver.cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id IN (
+                    SELECT checkpoint_id FROM checkpoints
+                    WHERE thread_id = ? AND checkpoint_ns = ?
+                    ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?
+                ) AND checkpoint_id NOT IN (
+                    SELECT fork_checkpoint_id FROM thread_branches WHERE parent_thread_id = ?
+                )
+                """,
+                (thread_id, ns, thread_id, ns, keep, thread_id),
+            )
+            deleted += cur.rowcount
+            cur.execute(
+                """
+                DELETE FROM writes
+                WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+                    SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+                )
+                """,
+                (thread_id, ns, thread_id, ns),
+            )
+    return deleted
+
+
+def drop_idle_threads(days: int, active_thread: str | None = None) -> list[str]:
+    """Supprime les threads sans activité depuis `days` jours, hors épinglés et thread actif."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    saver = _ckpt._checkpointer
+    _ckpt._backfill_meta()
+    with saver.cursor(transaction=False) as cur:
+        idle = [r[0] for r in cur.execute(
+            "SELECT thread_id FROM thread_meta WHERE updated_at < ? AND pinned = 0", (cutoff,),
+        ).fetchall()]
+    dropped = [tid for tid in idle if tid != active_thread]
+    for tid in dropped:
+        saver.delete_thread(tid)
+    return dropped
+
+
+def incremental_vacuum() -> int:
+    """Rend les pages libres au système par lots. Sans effet si auto_vacuum ≠ INCREMENTAL."""
+    saver = _ckpt._checkpointer
+    freed = 0
+    while True:
+        with saver.cursor() as cur:
+            if cur.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return freed
+            free = cur.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free:
+                return freed
+            batch = min(free, _VACUUM_BATCH)
+            cur.execute(f"PRAGMA incremental_vacuum({batch})").fetchall()
+            freed += batch
+
+
+def enable_incremental_vacuum() -> None:
+    """Bascule une base existante en auto_vacuum INCREMENTAL (VACUUM complet, une fois)."""
+    with _ckpt._checkpointer.cursor() as cur:
+        cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # VACUUM ne peut pas tourner dans une transaction ouverte
+    with _ckpt._checkpointer.lock:
+        _ckpt._checkpointer.conn.commit()
+        _ckpt._checkpointer.conn.execute("VACUUM")
+
+
+def collect_blobs() -> tuple[int, int]:
+    """GC du blob store : seuls les digests cités par un checkpoint ou un write survivent."""
+    from src.infra.blobs import blob_store, referenced
+    saver = _ckpt._checkpointer
+    saver.wait()   # un checkpoint encore en file peut citer un blob
+    marker = b"[blob:"
+    with saver.cursor(transaction=False) as cur:
+        chunks = [r[0] for r in cur.execute(
+            "SELECT checkpoint FROM checkpoints WHERE instr(checkpoint, ?) > 0", (marker,))]
+        chunks += [r[0] for r in cur.execute(
+            "SELECT value FROM writes WHERE instr(value, ?) > 0", (marker,))]
+    return blob_store.gc(referenced(chunks))
+
+
+def run(active_thread: str | None = None) -> dict:
+    """Une passe complète : élagage, threads inactifs, VACUUM incrémental."""
+    global _last_report
+    with _lock:
+        p = policy()
+        t0 = time.perf_counter()
+        report = {
+            "checkpoints_deleted": prune_checkpoints(p["keep_checkpoints"]),
+            "threads_dropped": drop_idle_threads(p["idle_days"], active_thread),
+            "pages_freed": incremental_vacuum(),
+        }
+        report["blobs_removed"], report["blob_bytes_freed"] = collect_blobs()
+        report["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        report["at"] = time.strftime("%d/%m %H:%M")
+        _last_report = report
+        try:
+            _LAST_RUN.write_text(str(time.time()), encoding="utf-8")
+        except OSError:
+            pass
+        return report
+
+
+def maybe_run_in_background(active_thread: str | None = None) -> bool:
+    """Lance une passe dans un thread si la dernière date de plus de interval_hours."""
+    try:
+        last = float(_LAST_RUN.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        last = 0.0
+    if time.time() - last < policy()["interval_hours"] * 3600:
+        return False
+
+    def _job() -> None:
+        try:
+            run(active_thread)
+        except Exception:
+            pass   # la maintenance ne doit jamais gêner la session
+
+    threading.Thread(target=_job, name="axon-retention", daemon=True).start()
+    return True
+
+
+def last_report() -> dict:
+    return dict(_last_report)
+
+
+def set_pinned(thread_id: str, pinned: bool) -> bool:
+    """Épingle / désépingle un thread. False si le thread n'a pas encore de checkpoint."""
+    _ckpt._backfill_meta()
+    with _ckpt._checkpointer.cursor() as cur:
+        cur.execute("UPDATE thread_meta SET pinned = ? WHERE thread_id = ?", (int(pinned), thread_id))
+        return cur.rowcount > 0
+
+
+def db_stats(limit: int = 15) -> dict:
+    """Taille du fichier, pages libres et octets par thread (checkpoints + writes)."""
+    saver = _ckpt._checkpointer
+    _ckpt._backfill_meta()
+    with saver.cursor(transaction=False) as cur:
+        page_size = cur.execute("PRAGMA page_size").fetchone()[0]
+        pages = cur.execute("PRAGMA page_count").fetchone()[0]
+        free = cur.execute("PRAGMA freelist_count").fetchone()[0]
+        mode = cur.execute("PRAGMA auto_vacuum").fetchone()[0]
+        rows = cur.execute(
+            """
+            WITH c AS (
+                SELECT thread_id, COUNT(*) AS n,
+                       SUM(LENGTH(checkpoint) + LENGTH(metadata)) AS bytes
+                FROM checkpoints GROUP BY thread_id
+            ), w AS (
+                SELECT thread_id, SUM(LENGTH(value)) AS bytes FROM writes GROUP BY thread_id
+            )
+            SELECT c.thread_id, c.n, c.bytes + COALESCE(w.bytes, 0) AS total,
+                   COALESCE(m.title, ''), COALESCE(m.pinned, 0), COALESCE(m.updated_at, '')
+            FROM c
+            LEFT JOIN w ON w.thread_id = c.thread_id
+            LEFT JOIN thread_meta m ON m.thread_id = c.thread_id
+            ORDER BY total DESC
+            """
+        ).fetchall()
+    return {
+        "file_bytes": _ckpt._DB_PATH.stat().st_size if _ckpt._DB_PATH.exists() else 0,
+        "page_size": page_size,
+        "pages": pages,
+        "free_pages": free,
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}.get(mode, str(mode)),
+        "thread_count": len(rows),
+        "threads": [
+            {"thread_id": tid, "checkpoints": n, "bytes": total or 0, "title": title,
+             "pinned": bool(pinned), "updated_at": _ckpt._fmt_ts(updated)}
+            for tid, n, total, title, pinned, updated in rows[:limit]
+        ],
+    }
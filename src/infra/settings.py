@@ -44,6 +44,15 @@ class Settings(BaseSettings):
     # Laisser vide → l'IA cherchera depuis $HOME
     projects_dir: str = ""
 
+    # Politiques du cache d'outils par outil : {"web_search_news": {"ttl": 120, "stale_grace": 900}}
+    tool_cache: dict = {}
+
+    # Rétention de memory.db : {"keep_checkpoints": 20, "idle_days": 90, "interval_hours": 24}
+    retention: dict = {}
+
+    # Index des noms de fichiers : {"enabled": 1, "refresh_seconds": 300, "max_depth": 10}
+    file_index: dict = {}
+
     # Clés optionnelles
     openai_api_key: str | None = None
     google_api_key: str | None = None
@@ -92,6 +101,9 @@ def _merge_yaml_into_settings() -> Settings:
         groq_model=yml.get("groq", {}).get("model", "openai/gpt-oss-20b"),
         llm_backend=yml.get("llm_backend", "ollama_cloud"),
         coding_model=yml.get("coding_model", "qwen3-coder-next:cloud"),
+        tool_cache=yml.get("tool_cache") or {},
+        retention=yml.get("retention") or {},
+        file_index=yml.get("file_index") or {},
     )
 
 
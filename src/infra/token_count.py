@@ -0,0 +1,163 @@
+# src/infra/token_count.py
+"""
+Comptage de tokens du contexte, message par message, avec cache.
+
+- Tokenizer BPE via tiktoken quand il est installé et que l'encodage est
+  disponible localement (o200k_base / cl100k_base) — à quelques % près des
+  tokenizers Llama, Qwen, Kimi et Gemini
+- Sinon, estimation rapide mots + ponctuation, bien plus stable que len // 3
+  sur du code ou du texte accentué
+- Chaque message est compté une seule fois : cache par id de message (ou par
+  hash du contenu pour les messages sans id). Recompter tout l'historique ne
+  coûte que les messages nouveaux.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import OrderedDict
+
+# Encodage le plus proche du tokenizer de chaque backend
+_ENCODINGS: dict[str, str] = {
+    "ollama_cloud": "o200k_base",
+    "groq":         "o200k_base",
+    "gemini":       "o200k_base",
+    "ollama":       "cl100k_base",
+}
+
+# Tokens de structure par message (rôle, séparateurs du template de chat)
+_MESSAGE_OVERHEAD = 4
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _load_encoding(name: str):
+    """Encodage tiktoken, ou None si tiktoken est absent ou ne peut pas le charger (hors-ligne)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+
+def approx_tokens(text: str) -> int:
+    """Estimation sans tokenizer : ~4 caractères par token pour un mot ASCII,
+    ~3 pour les nombres et les mots accentués, 1 token par symbole."""
+    total = 0
+    for piece in _WORD_RE.findall(text):
+        if len(piece) == 1:
+            total += 1
+        elif piece.isascii() and not piece.isdigit():
+            total += (len(piece) + 3) // 4
+        else:
+            total += (len(piece) + 2) // 3
+    return total
+
+
+def _message_text(m) -> str:
+    content = m.get("content", "") if isinstance(m, dict) else getattr(m, "content", "")
+    text = content if isinstance(content, str) else str(content)
+    tool_calls = m.get("tool_calls") if isinstance(m, dict) else getattr(m, "tool_calls", None)
+    if tool_calls:
+        text += json.dumps(
+            [{"name": tc.get("name"), "args": tc.get("args")} for tc in tool_calls],
+            ensure_ascii=False, default=str,
+        )
+    return text
+
+
+class TokenCounter:
+    """Compteur pour un backend, avec cache borné message → tokens."""
+
+    def __init__(self, backend: str, maxsize: int = 4096) -> None:
+        self.backend = backend
+        self.encoding_name = _ENCODINGS.get(backend, "o200k_base")
+        self._encoding = None
+        self._cache: OrderedDict[tuple, int] = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.counted = 0
+        # tiktoken peut télécharger l'encodage au premier usage : jamais sur le chemin critique
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _load(self) -> None:
+        encoding = _load_encoding(self.encoding_name)
+        if encoding is None:
+            return
+        with self._lock:
+            self._encoding = encoding
+            self._cache.clear()   # les comptes approximatifs ne se mélangent pas aux exacts
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return approx_tokens(text)
+
+    def count_message(self, m) -> int:
+        if isinstance(m, dict):
+            mid, mtype = m.get("id"), m.get("type", m.get("role"))
+            content, tool_calls = m.get("content", ""), m.get("tool_calls")
+        else:
+            mid, mtype = getattr(m, "id", None), getattr(m, "type", None)
+            content, tool_calls = getattr(m, "content", ""), getattr(m, "tool_calls", None)
+        # Message avec id : clé calculée sans reconstruire le texte. Un id peut être
+        # réutilisé pour remplacer un message : longueur du contenu et nombre de tool
+        # calls servent de garde-fou.
+        text = None
+        if mid and isinstance(content, str):
+            key = (mtype, mid, len(content), len(tool_calls or ()))
+        else:
+            # hash(str) est mémorisé par CPython, donc gratuit au deuxième appel sur le même objet.
+            text = _message_text(m)
+            key = (mtype, hash(text), len(text))
+        with self._lock:
+            n = self._cache.get(key)
+            if n is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return n
+        n = self.count_text(text if text is not None else _message_text(m)) + _MESSAGE_OVERHEAD
+        with self._lock:
+            self._cache[key] = n
+            while len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+            self.counted += 1
+        return n
+
+    def count(self, messages) -> int:
+        return sum(self.count_message(m) for m in messages)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "tokenizer": self.encoding_name if self.exact else "approx",
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "counted": self.counted,
+            }
+
+
+_counters: dict[str, TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_counter(backend: str) -> TokenCounter:
+    with _counters_lock:
+        counter = _counters.get(backend)
+        if counter is None:
+            counter = _counters[backend] = TokenCounter(backend)
+        return counter
+
+
+def count_tokens(messages, backend: str = "ollama_cloud") -> int:
+    """Tokens estimés de `messages` pour `backend`, seuls les messages jamais vus sont tokenisés."""
+    return get_counter(backend).count(messages)
@@ -0,0 +1,116 @@
+# src/infra/tool_schemas.py
+"""
+Schémas function-calling précompilés, partagés par l'orchestrateur et le
+coding specialist.
+
+bind_tools() convertit chaque outil LangChain en schéma OpenAI
+(convert_to_openai_tool) : génération du modèle Pydantic d'arguments et parsing
+des longues docstrings. ~1 ms par outil, payé à chaque bind. Les trois
+backends (ChatOllama, ChatGroq, ChatGoogleGenerativeAI) acceptent directement
+un schéma déjà converti — on ne le calcule donc qu'une fois.
+
+- Un schéma par outil, identifié par une empreinte : nom, description,
+  signature de la fonction et version de langchain-core
+- Persisté dans ~/.axon/tool_schemas.json : au démarrage suivant, binder = lire
+  un dict
+- Une docstring ou une signature modifiée change l'empreinte → recalcul
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+
+from langchain_core import __version__ as _LC_VERSION
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+_SCHEMA_PATH = Path.home() / ".axon" / "tool_schemas.json"
+
+
+def fingerprint(tool) -> str | None:
+    """Empreinte du schéma d'un outil, ou None si on ne sait pas la calculer sans le convertir."""
+    func = getattr(tool, "func", None) or getattr(tool, "coroutine", None)
+    if func is None:
+        return None
+    try:
+        sig = str(inspect.signature(func))
+    except (TypeError, ValueError):
+        return None
+    schema = getattr(tool, "args_schema", None)
+    schema_name = getattr(schema, "__qualname__", "") if isinstance(schema, type) else ""
+    raw = "\x00".join((_LC_VERSION, tool.name, tool.description or "", sig, schema_name))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class ToolSchemaCache:
+    """nom d'outil → (empreinte, schéma OpenAI), en mémoire et sur disque."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or _SCHEMA_PATH
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] | None = None   # chargé au premier usage
+        self._dirty = False
+        self.hits = 0
+        self.compiled = 0
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    self._entries = data
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    def schema(self, tool) -> dict:
+        """Schéma function-calling de `tool`, converti au plus une fois par empreinte."""
+        fp = fingerprint(tool)
+        with self._lock:
+            entry = self._load().get(tool.name)
+            if fp is not None and entry and entry.get("hash") == fp:
+                self.hits += 1
+                return entry["schema"]
+        schema = convert_to_openai_tool(tool)
+        if fp is not None:
+            with self._lock:
+                self._entries[tool.name] = {"hash": fp, "schema": schema}
+                self._dirty = True
+        self.compiled += 1
+        return schema
+
+    def schemas(self, tools: list) -> list[dict]:
+        out = [self.schema(t) for t in tools]
+        self.save()
+        return out
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or not self._entries:
+                return
+            payload = json.dumps(self._entries, ensure_ascii=False)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries or {})
+        return {"schemas": size, "hits": self.hits, "compiled": self.compiled}
+
+
+tool_schemas = ToolSchemaCache()
+
+
+def bind_tools(llm, tools: list, **kwargs):
+    """llm.bind_tools() avec des schémas précompilés au lieu des objets outils."""
+    return llm.bind_tools(tool_schemas.schemas(tools), **kwargs)
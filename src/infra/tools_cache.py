@@ -2,7 +2,18 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+_DB_PATH = Path.home() / ".axon" / "tool_cache.db"
+_MEMORY_MAX_BYTES = 32 * 1024 * 1024
+_DISK_MAX_BYTES = 128 * 1024 * 1024
 
 # TTL en secondes par outil — None = pas de cache pour cet outil
 CACHE_TTLS: dict[str, int] = {
@@ -19,6 +30,56 @@ CACHE_TTLS: dict[str, int] = {
 
 CACHEABLE_TOOLS: frozenset[str] = frozenset(CACHE_TTLS)
 
+# Stale-while-revalidate : après expiration, pendant `stale_grace` secondes, la valeur
+# périmée est servie tout de suite (marquée comme telle) et rafraîchie en arrière-plan.
+# Surchargeable outil par outil dans configs/base.yaml (section tool_cache).
+_DEFAULT_POLICIES: dict[str, dict] = {
+    "web_research_report": {"stale_grace": 3600},
+    "web_search_news":     {"stale_grace": 900},
+}
+
+
+def policy(name: str) -> dict:
+    """Politique effective d'un outil : ttl et stale_grace (défauts ← configs/base.yaml)."""
+    from src.infra.settings import settings
+    configured = (getattr(settings, "tool_cache", None) or {}).get(name) or {}
+    merged = {"ttl": CACHE_TTLS.get(name, 60), "stale_grace": 0,
+              **_DEFAULT_POLICIES.get(name, {}), **configured}
+    return {"ttl": int(merged["ttl"]), "stale_grace": int(merged["stale_grace"])}
+
+
+def _flag_stale(value: object, age: float) -> object:
+    """Marque un résultat servi périmé pour que le LLM le sache."""
+    note = f"[résultat en cache de {int(age // 60)} min — actualisation en arrière-plan]"
+    if isinstance(value, str):
+        return f"{note}\n{value}"
+    if isinstance(value, dict):
+        return {**value, "stale": True, "cache_note": note}
+    return value
+
+
+# Outils réseau dont les résultats survivent au redémarrage (cache disque).
+# Les caches filesystem/git restent en mémoire : l'état local change hors session.
+PERSISTENT_TOOLS: frozenset[str] = frozenset({"web_research_report", "web_search_news"})
+
+# Outils en lecture seule, sans interaction utilisateur : plusieurs appels d'un même
+# batch peuvent s'exécuter en parallèle. Tout autre outil sert de barrière (exécuté
+# seul, dans l'ordre) — écritures, shell_cd, HITL, envois.
+PARALLEL_SAFE_TOOLS: frozenset[str] = CACHEABLE_TOOLS | frozenset({
+    "local_grep", "url_fetch", "shell_pwd", "shell_ls",
+    "arxiv_search", "arxiv_get_paper", "get_weather_by_city", "get_current_time",
+    "gmail_search", "gmail_summarize",
+    "drive_find_file_id", "drive_list_files", "drive_get_file_metadata", "drive_read_file",
+    "google_docs_read",
+    "calendar_list_events", "calendar_list_calendars", "calendar_search_events",
+    "slack_list_channels", "slack_read_channel", "slack_get_mentions", "slack_list_dms",
+    "slack_search_messages", "slack_find_user",
+    "jira_get_my_issues", "jira_get_issue", "jira_search_issues", "jira_get_project_summary",
+    "jira_get_sprint_issues", "jira_list_projects", "jira_get_workload",
+    "jira_get_issue_comments", "jira_search_users",
+    "process_list", "wifi_info",
+})
+
 # Caches filesystem + git invalidés ensemble après toute écriture de fichier
 _FILESYSTEM_CACHES = (
     "git_status", "git_diff", "git_log",
@@ -35,35 +96,506 @@ _INVALIDATES: dict[str, tuple[str, ...]] = {
     "propose_file_change": _FILESYSTEM_CACHES,
 }
 
+# Commandes shell sans effet sur le disque : shell_run n'invalide rien
+_READ_ONLY_COMMANDS = frozenset({
+    "ls", "cat", "head", "tail", "wc", "pwd", "echo", "grep", "rg", "fd", "find", "tree",
+    "stat", "file", "du", "df", "which", "whoami", "printenv", "uname", "ps",
+    "diff", "less", "sort", "uniq", "cut",
+})
+_READ_ONLY_GIT = frozenset({"status", "log", "diff", "show", "rev-parse", "ls-files", "blame"})
+# Options qui font écrire un fichier à une commande sinon en lecture seule
+_FIND_WRITE_ACTIONS = frozenset({"-delete", "-exec", "-execdir", "-ok", "-okdir", "-fls"})
+
+
+def _writes_output(words: list[str]) -> bool:
+    """--output=… (git diff, sort…), -o de sort (y compris groupé : -uo), -fprint* / -fls de find."""
+    for w in words[1:]:
+        if w.startswith("--output"):
+            return True
+        if words[0] == "find" and (w in _FIND_WRITE_ACTIONS or w.startswith("-fprint")):
+            return True
+        if words[0] == "sort" and w.startswith("-") and not w.startswith("--") and "o" in w:
+            return True
+    return False
+
+
+def is_read_only_command(command: str) -> bool:
+    """Vrai si chaque maillon de la commande est une lecture connue (pas de redirection)."""
+    if any(c in command for c in (">", "`", "$(")):
+        return False
+    # Séparateurs : ||, &&, |, ;, & (arrière-plan) et retour à la ligne
+    for segment in re.split(r"\|\||&&|[|;&\n]", command):
+        words = segment.split()
+        if not words:
+            continue
+        if words[0] == "git":
+            if len(words) < 2 or words[1] not in _READ_ONLY_GIT:
+                return False
+        elif words[0] not in _READ_ONLY_COMMANDS:
+            return False
+        if _writes_output(words):
+            return False
+    return True
+
+
+# ── Normalisation des arguments ───────────────────────────────────────────────
+
+# Arguments qui désignent un chemin : ~ développé, relatif au cwd du shell, résolu
+_PATH_ARGS = frozenset({"path", "root", "repo_path"})
+_GIT_TOOLS = frozenset({"git_status", "git_log", "git_diff"})
+# Arguments texte libre : espaces normalisés
+_QUERY_ARGS = frozenset({"query"})
+
+
+def _canonical_path(value: str) -> str:
+    from src.agents.shell.tools import get_cwd
+    p = Path(os.path.expanduser(value))
+    if not p.is_absolute():
+        p = get_cwd() / p
+    try:
+        return str(p.resolve())
+    except (OSError, RuntimeError):
+        return os.path.normpath(str(p))
+
+
+def schema_defaults(tool) -> dict:
+    """Valeurs par défaut déclarées dans le schéma d'arguments d'un outil LangChain."""
+    try:
+        props = tool.args
+    except Exception:
+        return {}
+    return {k: v["default"] for k, v in props.items() if isinstance(v, dict) and "default" in v}
+
+
+# ── Validateurs : l'état disque observé au moment du set ─────────────────────
+
+def _abspath(path: str | Path) -> str:
+    return os.path.abspath(os.path.expanduser(str(path)))
+
+
+def _file_sig(path: str) -> tuple[int, int] | None:
+    """(mtime_ns, taille) ou None si le chemin n'existe pas."""
+    try:
+        st = os.stat(os.path.expanduser(path))
+    except (OSError, ValueError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _git_dir(start: Path) -> Path | None:
+    for d in (start, *start.parents):
+        g = d / ".git"
+        if g.is_dir():
+            return g
+        if g.is_file():                      # worktree / sous-module : "gitdir: <chemin>"
+            try:
+                text = g.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if text.startswith("gitdir:"):
+                return (d / text[7:].strip()).resolve()
+    return None
+
+
+def _git_sig(repo_path: str | None, with_index: bool) -> tuple | None:
+    """HEAD résolu (+ mtime_ns de l'index) du repo que viseraient les outils git."""
+    gdir = None
+    if repo_path and os.path.exists(repo_path):
+        gdir = _git_dir(Path(_abspath(repo_path)))
+    else:
+        from src.utils.paths import get_projects_dir
+        for candidate in (Path.cwd(), get_projects_dir()):
+            if candidate and (gdir := _git_dir(Path(candidate))):
+                break
+    if gdir is None:
+        return None
+    try:
+        head = (gdir / "HEAD").read_text(encoding="utf-8").strip()
+        if head.startswith("ref:"):
+            ref = gdir / head[4:].strip()
+            # Ref empaquetée : packed-refs change quand elle bouge
+            head += ":" + (ref.read_text(encoding="utf-8").strip() if ref.exists()
+                           else str(_file_sig(str(gdir / "packed-refs"))))
+    except OSError:
+        return None
+    return (head, _file_sig(str(gdir / "index"))) if with_index else (head,)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    tool        TEXT    NOT NULL,
+    ts          REAL    NOT NULL,
+    ttl         INTEGER NOT NULL,
+    last_access REAL    NOT NULL,
+    size        INTEGER NOT NULL,
+    value       TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_tool   ON entries(tool);
+"""
+
 
 class SessionCache:
-    def __init__(self) -> None:
-        self._data: dict[str, tuple[float, object, int]] = {}
+    """
+    Cache à deux niveaux des résultats d'outils.
+
+    - Mémoire : LRU bornée en octets (max_bytes), tous outils confondus
+    - Disque  : SQLite (~/.axon/tool_cache.db) pour les seuls PERSISTENT_TOOLS,
+      bornée par disk_max_bytes, éviction par dernier accès
+    Un échec mémoire sur un outil persistant relit le disque et promeut l'entrée.
+    Les TTL s'appliquent aux deux niveaux (horodatage d'écriture conservé).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = _MEMORY_MAX_BYTES,
+        disk_max_bytes: int = _DISK_MAX_BYTES,
+    ) -> None:
+        self.path = path                       # None = mémoire seule
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._data: OrderedDict[str, tuple[float, object, int, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        # Générations : invalider = incrémenter un compteur, jamais parcourir les clés
+        self._tool_gen: dict[str, int] = {}
+        self._dir_gen: dict[str, int] = {}     # enfants directs d'un dossier modifiés
+        self._tree_gen: dict[str, int] = {}    # un descendant quelconque modifié
+        self._subtree_gen: dict[str, int] = {} # shell_run : n'importe quoi sous ce dossier a pu changer
+        self._write_gen = 0                    # toute écriture connue (git status/diff, recherches par nom)
+        self._defaults: dict[str, dict] = {}   # outil → défauts de son schéma (register_tools)
+        self._tools: dict[str, object] = {}    # outils rafraîchissables en arrière-plan
+        self._refreshing: dict[str, Future] = {}
+        self._refresher: ThreadPoolExecutor | None = None
+        self.counters = {
+            "hits": 0, "disk_hits": 0, "misses": 0, "stale": 0, "normalized_hits": 0,
+            "stale_served": 0, "refreshes": 0, "refresh_failures": 0,
+            "evictions": 0, "disk_evictions": 0,
+        }
 
     def _key(self, name: str, args: dict) -> str:
         return f"{name}:{json.dumps(args, sort_keys=True, default=str)}"
 
-    def get(self, name: str, args: dict) -> object | None:
-        entry = self._data.get(self._key(name, args))
-        if entry is None:
+    # ── Normalisation ────────────────────────────────────────────────────────
+
+    def register_tools(self, tools) -> None:
+        """Mémorise les défauts des outils cachables (appelé par les nœuds d'outils)."""
+        for t in tools:
+            name = getattr(t, "name", None)
+            if name in CACHEABLE_TOOLS and name not in self._defaults:
+                self._defaults[name] = schema_defaults(t)
+            if name in _DEFAULT_POLICIES or name in PERSISTENT_TOOLS:
+                self._tools[name] = t
+
+    def normalize(self, name: str, args: dict) -> dict:
+        """
+        Forme canonique des arguments d'un outil cachable : défauts du schéma
+        remplis, chemins absolus (relatifs au cwd du shell), requêtes aux espaces
+        normalisés. Un outil git sans repo_path vise le repo du cwd du shell s'il
+        y en a un. Les appelants exécutent l'outil avec ces arguments, pour que
+        la clé et le résultat désignent toujours la même chose.
+        """
+        if name not in CACHEABLE_TOOLS:
+            return args
+        out = {**self._defaults.get(name, {}), **args}
+        if name in _GIT_TOOLS and not out.get("repo_path"):
+            from src.agents.shell.tools import get_cwd
+            cwd = get_cwd()
+            if _git_dir(cwd) is not None:
+                out["repo_path"] = str(cwd)
+        for k, v in out.items():
+            if not isinstance(v, str) or not v:
+                continue
+            if k in _PATH_ARGS:
+                out[k] = _canonical_path(v)
+            elif k in _QUERY_ARGS:
+                out[k] = " ".join(v.split())
+        return out
+
+    def has(self, name: str, args: dict) -> bool:
+        """Entrée fraîche et valide présente en mémoire — sans toucher aux compteurs ni à la LRU."""
+        args = self.normalize(name, args)
+        key = self._key(name, args)
+        stamp = self._stamp(name, args)
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[4] == stamp and time.time() - entry[0] <= entry[2]
+
+    # ── Disque ───────────────────────────────────────────────────────────────
+
+    def _db(self) -> sqlite3.Connection | None:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                conn.executescript(_SCHEMA)
+                # Les entrées expirées pendant l'arrêt ne servent plus à rien
+                grace = max((policy(n)["stale_grace"] for n in PERSISTENT_TOOLS), default=0)
+                conn.execute("DELETE FROM entries WHERE ts + ttl + ? < ?", (grace, time.time()))
+                conn.commit()
+                self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                self._conn = conn
+            except sqlite3.Error:
+                self.path = None             # disque indisponible : cache mémoire seul
+                return None
+        return self._conn
+
+    def _disk_get(self, key: str, grace: int = 0) -> tuple[float, object, int, int] | None:
+        db = self._db()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT ts, ttl, size, value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            ts, ttl, size, raw = row
+            if time.time() - ts > ttl + grace:
+                self._disk_delete(db, "key = ?", (key,))
+                return None
+            db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+            return ts, json.loads(raw), ttl, size
+        except (sqlite3.Error, ValueError):
             return None
-        ts, value, ttl = entry
-        if time.time() - ts > ttl:
-            del self._data[self._key(name, args)]
+
+    def _disk_set(self, key: str, tool: str, ts: float, raw: str, ttl: int) -> None:
+        db = self._db()
+        if db is None:
+            return
+        size = len(raw.encode("utf-8"))
+        if size > self.disk_max_bytes:
+            return
+        try:
+            old = db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, tool, ts, ttl, last_access, size, value) "
+                "VALUES (?,?,?,?,?,?,?)",
+                (key, tool, ts, ttl, ts, size, raw),
+            )
+            self._disk_bytes += size - (old[0] if old else 0)
+            while self._disk_bytes > self.disk_max_bytes:
+                victim = db.execute(
+                    "SELECT key, size FROM entries ORDER BY last_access LIMIT 1"
+                ).fetchone()
+                if victim is None:
+                    break
+                db.execute("DELETE FROM entries WHERE key = ?", (victim[0],))
+                self._disk_bytes -= victim[1]
+                self.counters["disk_evictions"] += 1
+            db.commit()
+        except sqlite3.Error:
+            pass   # le cache disque ne doit jamais faire échouer un outil
+
+    def _disk_delete(self, db: sqlite3.Connection, where: str, params: tuple) -> None:
+        freed = db.execute(f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE {where}", params).fetchone()[0]
+        db.execute(f"DELETE FROM entries WHERE {where}", params)
+        db.commit()
+        self._disk_bytes -= freed
+
+    # ── Validation ───────────────────────────────────────────────────────────
+
+    def _stamp(self, name: str, args: dict) -> tuple:
+        """
+        Empreinte de l'état dont dépend une entrée, comparée entre set et get.
+
+        - local_read_file      : (mtime_ns, taille) du fichier
+        - local_list_directory : mtime_ns du dossier + génération de ses enfants directs
+        - local_glob           : mtime_ns de la base + génération de toute l'arborescence
+          (les deux : + générations de sous-arbre du dossier et de ses ancêtres)
+        - git_log              : HEAD résolu ; git_status / git_diff : + mtime de l'index
+          et génération d'écriture (le worktree ne se voit pas dans HEAD ni l'index)
+        - local_find_file, recherche par nom : génération d'écriture
+        """
+        gen = self._tool_gen.get(name, 0)
+        if name == "local_read_file":
+            return gen, _file_sig(args.get("path", ""))
+        if name == "local_list_directory":
+            path = args.get("path", "")
+            if path and os.path.isdir(os.path.expanduser(path)):
+                return gen, _file_sig(path), self._dir_gen.get(_abspath(path), 0), self._subtree_sig(path)
+            return gen, self._write_gen
+        if name == "local_glob":
+            base = args.get("path", "")
+            if not base:
+                from src.utils.paths import get_projects_dir
+                base = str(get_projects_dir() or Path.home())
+            return gen, _file_sig(base), self._tree_gen.get(_abspath(base), 0), self._subtree_sig(base)
+        if name == "git_log":
+            return gen, _git_sig(args.get("repo_path"), with_index=False)
+        if name in ("git_status", "git_diff"):
+            return gen, _git_sig(args.get("repo_path"), with_index=True), self._write_gen
+        if name == "local_find_file":
+            return gen, self._write_gen
+        return (gen,)
+
+    def _subtree_sig(self, path: str) -> int:
+        """Somme des générations de sous-arbre du dossier et de ses ancêtres, O(profondeur) :
+        un shell_run dans un ancêtre invalide tout ce qui est en dessous."""
+        p = Path(_abspath(path))
+        return sum(self._subtree_gen.get(str(d), 0) for d in (p, *p.parents))
+
+    # ── Mémoire ──────────────────────────────────────────────────────────────
+
+    def _store(self, key: str, entry: tuple[float, object, int, int, tuple, str | None]) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[3]
+        if entry[3] > self.max_bytes:
+            return
+        self._data[key] = entry
+        self._bytes += entry[3]
+        while self._bytes > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self._bytes -= evicted[3]
+            self.counters["evictions"] += 1
+
+    def _drop(self, key: str) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[3]
+
+    # ── API ──────────────────────────────────────────────────────────────────
+
+    def get(self, name: str, args: dict) -> object | None:
+        raw_key = self._key(name, args)
+        args = self.normalize(name, args)
+        key = self._key(name, args)
+        stamp = self._stamp(name, args)
+        grace = policy(name)["stale_grace"] if name in self._tools else 0
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                ts, value, ttl, _, stored, set_key = entry
+                age = time.time() - ts
+                if stored != stamp:
+                    self._drop(key)
+                    self.counters["stale"] += 1
+                elif age <= ttl:
+                    self._data.move_to_end(key)
+                    self.counters["hits"] += 1
+                    if set_key != raw_key:
+                        # Écrit sous une autre forme : hit dû à la normalisation
+                        self.counters["normalized_hits"] += 1
+                    return value
+                elif age <= ttl + grace:
+                    return self._serve_stale(name, key, args, value, age)
+                else:
+                    self._drop(key)
+            if name in PERSISTENT_TOOLS:
+                entry = self._disk_get(key, grace)
+                if entry is not None:
+                    self._store(key, (*entry, stamp, raw_key))
+                    self.counters["disk_hits"] += 1
+                    age = time.time() - entry[0]
+                    if age > entry[2]:
+                        return self._serve_stale(name, key, args, entry[1], age)
+                    return entry[1]
+            self.counters["misses"] += 1
             return None
-        return value
+
+    # ── Stale-while-revalidate ───────────────────────────────────────────────
+
+    def _serve_stale(self, name: str, key: str, args: dict, value: object, age: float) -> object:
+        """Sert la valeur périmée et lance (une fois par clé) son rafraîchissement."""
+        self.counters["stale_served"] += 1
+        job = self._refreshing.get(key)
+        if job is None or job.done():
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="axon-swr")
+            self._refreshing[key] = self._refresher.submit(self._refresh, name, key, args)
+        return _flag_stale(value, age)
+
+    def _refresh(self, name: str, key: str, args: dict) -> None:
+        try:
+            result = self._tools[name].invoke(args)
+        except Exception:
+            result = None
+        ok = result is not None and not (isinstance(result, dict) and result.get("status") == "error")
+        if ok:
+            self.set(name, args, result)
+        # En cas d'échec, la valeur périmée reste servie jusqu'à la fin de la grâce
+        with self._lock:
+            self.counters["refreshes" if ok else "refresh_failures"] += 1
+            self._refreshing.pop(key, None)
+
+    def wait_refreshes(self, timeout: float | None = None) -> None:
+        """Attend les rafraîchissements en cours (tests, arrêt propre)."""
+        with self._lock:
+            jobs = list(self._refreshing.values())
+        for job in jobs:
+            try:
+                job.result(timeout=timeout)
+            except Exception:
+                pass
 
     def set(self, name: str, args: dict, value: object, ttl: int | None = None) -> None:
-        t = ttl if ttl is not None else CACHE_TTLS.get(name, 60)
-        self._data[self._key(name, args)] = (time.time(), value, t)
+        t = ttl if ttl is not None else policy(name)["ttl"]
+        raw_key = self._key(name, args)
+        args = self.normalize(name, args)
+        key = self._key(name, args)
+        ts = time.time()
+        try:
+            encoded = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            encoded = None                   # non sérialisable : mémoire seule
+        size = len(encoded.encode("utf-8")) if encoded is not None else len(str(value).encode("utf-8"))
+        stamp = self._stamp(name, args)
+        with self._lock:
+            self._store(key, (ts, value, t, size, stamp, raw_key))
+            if encoded is not None and name in PERSISTENT_TOOLS:
+                self._disk_set(key, name, ts, encoded, t)
 
     def invalidate(self, *names: str) -> None:
-        prefix_set = {n + ":" for n in names}
-        for key in list(self._data):
-            if any(key.startswith(p) for p in prefix_set):
-                del self._data[key]
+        """O(len(names)) : les entrées périmées tombent au prochain get ou par LRU."""
+        with self._lock:
+            for n in names:
+                self._tool_gen[n] = self._tool_gen.get(n, 0) + 1
+            persistent = [n for n in names if n in PERSISTENT_TOOLS]
+            db = self._db() if persistent else None
+            if db is not None:
+                try:
+                    marks = ",".join("?" * len(persistent))
+                    self._disk_delete(db, f"tool IN ({marks})", tuple(persistent))
+                except sqlite3.Error:
+                    pass
 
-    def on_tool_executed(self, tool_name: str) -> None:
+    def invalidate_paths(self, *paths: str | Path) -> None:
+        """Des fichiers ont été écrits : générations du dossier parent et de chaque
+        ancêtre, O(profondeur). Les lectures de fichier sont validées par stat."""
+        with self._lock:
+            self._write_gen += 1
+            for path in paths:
+                p = Path(_abspath(path))
+                for d in (p, p.parent):
+                    self._dir_gen[str(d)] = self._dir_gen.get(str(d), 0) + 1
+                for d in (p, *p.parents):
+                    self._tree_gen[str(d)] = self._tree_gen.get(str(d), 0) + 1
+
+    def invalidate_tree(self, directory: str | Path) -> None:
+        """Une commande a pu écrire n'importe où sous `directory` : tout son sous-arbre
+        (et les arborescences des ancêtres) est invalidé, O(profondeur)."""
+        with self._lock:
+            d = _abspath(directory)
+            self._subtree_gen[d] = self._subtree_gen.get(d, 0) + 1
+        self.invalidate_paths(directory)
+
+    def on_tool_executed(self, tool_name: str, args: dict | None = None) -> None:
+        """Sans `args`, invalidation conservatrice par groupe (_INVALIDATES)."""
+        if args is not None:
+            if tool_name == "shell_run":
+                if not is_read_only_command(args.get("command", "")):
+                    from src.agents.shell.tools import get_cwd
+                    self.invalidate_tree(args.get("cwd") or get_cwd())
+                return
+            if tool_name == "propose_file_change" and args.get("path"):
+                self.invalidate_paths(args["path"])
+                return
         targets = _INVALIDATES.get(tool_name)
         if targets:
             self.invalidate(*targets)
@@ -73,10 +605,44 @@ class SessionCache:
         self.invalidate(*_FILESYSTEM_CACHES)
 
     def clear(self) -> None:
-        self._data.clear()
+        """Vide les deux niveaux."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self._tool_gen.clear()
+            self._dir_gen.clear()
+            self._tree_gen.clear()
+            self._subtree_gen.clear()
+            self._write_gen = 0
+            db = self._db()
+            if db is not None:
+                try:
+                    self._disk_delete(db, "1", ())
+                except sqlite3.Error:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            c = self.counters
+            lookups = c["hits"] + c["disk_hits"] + c["misses"]
+            return {
+                **c,
+                "hit_ratio": round((c["hits"] + c["disk_hits"]) / lookups, 3) if lookups else 0.0,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_bytes": self._disk_bytes if self._conn is not None else 0,
+                "disk_max_bytes": self.disk_max_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def __len__(self) -> int:
         return len(self._data)
 
 
-session_cache = SessionCache()
+session_cache = SessionCache(_DB_PATH)
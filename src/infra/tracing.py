@@ -0,0 +1,226 @@
+# src/infra/tracing.py
+"""
+Traceur de spans léger pour comprendre où passe le temps d'un tour.
+
+- span(name, cat)      : context manager — un intervalle mesuré (perf_counter_ns)
+- traced(cat)          : décorateur équivalent
+- start(key) / finish(key) : intervalle ouvert à un endroit et fermé ailleurs
+  (ex. time-to-first-token : ouvert par le nœud LLM, fermé par l'UI)
+- Chaque tour (begin_turn / end_turn) garde ses spans ; anneau des N derniers
+  tours seulement. Hors tour, les spans ne sont pas enregistrés : coût ~nul.
+- Export Chrome trace (chrome://tracing, Perfetto) et JSONL
+
+Catégories utilisées : retrieval, prompt, llm, ttft, tool, compression,
+checkpoint, render, specialist. Les durées sont inclusives (un span de
+specialist est contenu dans le span tool de run_coding_agent).
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+_TRACE_DIR = Path.home() / ".axon" / "traces"
+_MAX_SPANS_PER_TURN = 5_000
+
+
+class Turn:
+    """Un tour utilisateur : ses spans et ses bornes."""
+
+    __slots__ = ("index", "label", "start_ns", "end_ns", "spans")
+
+    def __init__(self, index: int, label: str) -> None:
+        self.index = index
+        self.label = label
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: int | None = None
+        self.spans: list[dict] = []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+    def by_category(self) -> dict[str, float]:
+        """Temps total (ms) par catégorie sur ce tour."""
+        out: dict[str, float] = {}
+        for s in self.spans:
+            out[s["cat"]] = out.get(s["cat"], 0.0) + s["dur_ns"] / 1e6
+        return out
+
+
+class Tracer:
+    def __init__(self, max_turns: int = 50) -> None:
+        self._lock = threading.Lock()
+        self._turns: deque[Turn] = deque(maxlen=max_turns)
+        self._current: Turn | None = None
+        self._open: dict[str, tuple[int, str, dict]] = {}
+        self._count = 0
+        self._origin_ns = time.perf_counter_ns()
+
+    # ── Tours ────────────────────────────────────────────────────────────────
+
+    def begin_turn(self, label: str = "") -> Turn:
+        with self._lock:
+            if self._current is not None:
+                self._close_current()
+            self._count += 1
+            self._current = Turn(self._count, label[:80])
+            self._open.clear()
+            return self._current
+
+    def end_turn(self) -> Turn | None:
+        with self._lock:
+            return self._close_current()
+
+    def _close_current(self) -> Turn | None:
+        turn = self._current
+        if turn is None:
+            return None
+        turn.end_ns = time.perf_counter_ns()
+        self._turns.append(turn)
+        self._current = None
+        return turn
+
+    def turns(self) -> list[Turn]:
+        with self._lock:
+            return list(self._turns)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns.clear()
+            self._current = None
+            self._open.clear()
+
+    # ── Spans ────────────────────────────────────────────────────────────────
+
+    def _record(self, name: str, cat: str, start_ns: int, end_ns: int, args: dict) -> None:
+        with self._lock:
+            turn = self._current
+            if turn is None or len(turn.spans) >= _MAX_SPANS_PER_TURN:
+                return
+            turn.spans.append({
+                "name": name, "cat": cat, "start_ns": start_ns,
+                "dur_ns": end_ns - start_ns, "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    @contextmanager
+    def span(self, name: str, cat: str | None = None, **args):
+        if self._current is None:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(name, cat or name, start, time.perf_counter_ns(), args)
+
+    def traced(self, cat: str, name: str | None = None):
+        """Décorateur : chaque appel de la fonction devient un span."""
+        def deco(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*a, **kw):
+                with self.span(label, cat):
+                    return fn(*a, **kw)
+            return wrapper
+        return deco
+
+    def start(self, key: str, cat: str | None = None, **args) -> None:
+        """Ouvre un intervalle nommé `key`, fermé plus tard par finish(key)."""
+        if self._current is None:
+            return
+        with self._lock:
+            self._open[key] = (time.perf_counter_ns(), cat or key, args)
+
+    def finish(self, key: str) -> None:
+        """Ferme l'intervalle `key` s'il est ouvert — le premier appel gagne."""
+        with self._lock:
+            opened = self._open.pop(key, None)
+        if opened is not None:
+            start, cat, args = opened
+            self._record(key, cat, start, time.perf_counter_ns(), args)
+
+    # ── Statistiques ─────────────────────────────────────────────────────────
+
+    def summary(self) -> dict:
+        """Par catégorie : total du dernier tour, nombre de spans et p50/p95 sur la session."""
+        turns = self.turns()
+        durations: dict[str, list[float]] = {}
+        per_turn: dict[str, list[float]] = {}
+        for t in turns:
+            for s in t.spans:
+                durations.setdefault(s["cat"], []).append(s["dur_ns"] / 1e6)
+            for cat, total in t.by_category().items():
+                per_turn.setdefault(cat, []).append(total)
+        last = turns[-1].by_category() if turns else {}
+        phases = {}
+        for cat, values in sorted(durations.items()):
+            arr = np.asarray(values)
+            phases[cat] = {
+                "last_ms": round(last.get(cat, 0.0), 2),
+                "count": len(values),
+                "p50_ms": round(float(np.percentile(arr, 50)), 2),
+                "p95_ms": round(float(np.percentile(arr, 95)), 2),
+                "per_turn_p50_ms": round(float(np.percentile(per_turn[cat], 50)), 2),
+            }
+        totals = np.asarray([t.duration_ms for t in turns]) if turns else None
+        return {
+            "turns": len(turns),
+            "turn_p50_ms": round(float(np.percentile(totals, 50)), 2) if totals is not None else 0.0,
+            "turn_p95_ms": round(float(np.percentile(totals, 95)), 2) if totals is not None else 0.0,
+            "last_turn_ms": round(turns[-1].duration_ms, 2) if turns else 0.0,
+            "phases": phases,
+        }
+
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    def chrome_trace(self) -> dict:
+        """Format Trace Event (chrome://tracing, ui.perfetto.dev) : un événement "X" par span."""
+        pid = os.getpid()
+        events = []
+        for t in self.turns():
+            events.append({
+                "name": f"tour {t.index}: {t.label}", "cat": "turn", "ph": "X", "pid": pid, "tid": 0,
+                "ts": (t.start_ns - self._origin_ns) / 1e3, "dur": (t.end_ns - t.start_ns) / 1e3,
+            })
+            for s in t.spans:
+                events.append({
+                    "name": s["name"], "cat": s["cat"], "ph": "X", "pid": pid, "tid": s["tid"],
+                    "ts": (s["start_ns"] - self._origin_ns) / 1e3, "dur": s["dur_ns"] / 1e3,
+                    "args": {k: str(v) for k, v in s["args"].items()},
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, directory: Path | None = None) -> tuple[Path, Path]:
+        """Écrit trace-<horodatage>.json (Chrome) et .jsonl (un span par ligne)."""
+        directory = directory or _TRACE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = directory / time.strftime("trace-%Y%m%d-%H%M%S")
+        chrome = stem.with_suffix(".json")
+        chrome.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        jsonl = stem.with_suffix(".jsonl")
+        with jsonl.open("w", encoding="utf-8") as f:
+            for t in self.turns():
+                for s in t.spans:
+                    f.write(json.dumps({
+                        "turn": t.index, "name": s["name"], "cat": s["cat"],
+                        "start_ms": round((s["start_ns"] - t.start_ns) / 1e6, 3),
+                        "dur_ms": round(s["dur_ns"] / 1e6, 3),
+                        "args": {k: str(v) for k, v in s["args"].items()},
+                    }, ensure_ascii=False) + "\n")
+        return chrome, jsonl
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
@@ -0,0 +1,148 @@
+# src/infra/usage_ledger.py
+"""
+Journal persistant des appels LLM : tokens et latences.
+
+- Une ligne par appel dans ~/.axon/usage.db (à côté de memory.db) :
+  thread, backend, modèle, source (chat · specialist · compaction),
+  tokens d'entrée/sortie, TTFT, latence totale, tokens/s
+- Agrégations par jour, par modèle et par thread pour /usage
+- Fichier séparé de memory.db : aucune contention avec le checkpointer
+- WAL + synchronous=NORMAL : l'insert de chaque appel, fait sur le thread du
+  tour, ne coûte pas un fsync
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_DB_PATH = Path.home() / ".axon" / "usage.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id            INTEGER PRIMARY KEY,
+    ts            REAL    NOT NULL,
+    thread_id     TEXT,
+    backend       TEXT    NOT NULL,
+    model         TEXT,
+    source        TEXT    NOT NULL DEFAULT 'chat',
+    input_tokens  INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    ttft_ms       REAL,
+    latency_ms    REAL    NOT NULL,
+    tokens_per_s  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_ts     ON llm_calls(ts);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_thread ON llm_calls(thread_id);
+"""
+
+# Colonnes agrégées communes aux vues /usage
+_AGG = """
+    COUNT(*)                    AS calls,
+    SUM(input_tokens)           AS input_tokens,
+    SUM(output_tokens)          AS output_tokens,
+    AVG(ttft_ms)                AS ttft_ms,
+    AVG(latency_ms)             AS latency_ms,
+    AVG(tokens_per_s)           AS tokens_per_s
+"""
+
+
+def model_name(llm) -> str:
+    """Nom du modèle d'un client LangChain (ChatOllama.model, ChatGroq.model_name…)."""
+    for attr in ("model", "model_name"):
+        value = getattr(llm, attr, None)
+        if isinstance(value, str) and value:
+            return value.removeprefix("models/")
+    return ""
+
+
+class UsageLedger:
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or _DB_PATH
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None   # ouverte au premier usage
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def record(
+        self,
+        backend: str,
+        model: str,
+        usage: dict | None,
+        latency_ms: float,
+        ttft_ms: float | None = None,
+        thread_id: str | None = None,
+        source: str = "chat",
+        ts: float | None = None,
+    ) -> None:
+        """Enregistre un appel. `usage` est le usage_metadata LangChain (peut être absent)."""
+        usage = usage or {}
+        inp = int(usage.get("input_tokens") or 0)
+        out = int(usage.get("output_tokens") or 0)
+        # Débit de génération : hors attente du premier token quand on la connaît
+        gen_ms = latency_ms - (ttft_ms or 0.0)
+        tps = out / (gen_ms / 1000) if out and gen_ms > 0 else None
+        with self._lock:
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT INTO llm_calls (ts, thread_id, backend, model, source, input_tokens, "
+                    "output_tokens, ttft_ms, latency_ms, tokens_per_s) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                    (ts or time.time(), thread_id, backend, model, source, inp, out,
+                     ttft_ms, latency_ms, tps),
+                )
+                db.commit()
+            except (sqlite3.Error, OSError):
+                pass   # le journal ne doit jamais faire échouer un tour (~/.axon illisible compris)
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        with self._lock:
+            try:
+                return [dict(r) for r in self._db().execute(sql, params).fetchall()]
+            except (sqlite3.Error, OSError):
+                return []
+
+    def by_day(self, days: int = 7) -> list[dict]:
+        since = time.time() - days * 86_400
+        return self._query(
+            f"SELECT date(ts, 'unixepoch', 'localtime') AS day, {_AGG} FROM llm_calls "
+            "WHERE ts >= ? GROUP BY day ORDER BY day DESC", (since,),
+        )
+
+    def by_model(self, days: int | None = None) -> list[dict]:
+        since = time.time() - days * 86_400 if days else 0
+        return self._query(
+            f"SELECT backend, model, {_AGG} FROM llm_calls WHERE ts >= ? "
+            "GROUP BY backend, model ORDER BY input_tokens + output_tokens DESC", (since,),
+        )
+
+    def by_thread(self, limit: int = 10) -> list[dict]:
+        return self._query(
+            f"SELECT thread_id, MAX(ts) AS last_ts, {_AGG} FROM llm_calls "
+            "GROUP BY thread_id ORDER BY input_tokens + output_tokens DESC LIMIT ?", (limit,),
+        )
+
+    def totals(self, thread_id: str | None = None) -> dict:
+        if thread_id:
+            rows = self._query(f"SELECT {_AGG} FROM llm_calls WHERE thread_id = ?", (thread_id,))
+        else:
+            rows = self._query(f"SELECT {_AGG} FROM llm_calls")
+        return rows[0] if rows else {}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+ledger = UsageLedger()
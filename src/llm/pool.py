@@ -0,0 +1,100 @@
+# src/llm/pool.py
+"""
+Pool de clients LLM réutilisés entre les tours.
+
+Construire un ChatOllama / ChatGroq / ChatGoogleGenerativeAI instancie un
+client HTTP neuf (pas de keep-alive) et bind_tools() regénère le JSON schema de
+chaque outil. Dans une boucle d'outils, on payait les deux à chaque round.
+
+- get_client(backend)        → un client par (backend, modèle, température)
+- get_bound(backend, tools)  → runnable bindé, mis en cache par frozenset des noms d'outils
+
+invalidate() vide les deux caches — appelé par /backend, /model et /temp.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from src.llm import models
+from src.infra.settings import settings
+from src.infra.tool_schemas import bind_tools
+
+_FACTORIES = {
+    "groq":         "make_llm_groq",
+    "ollama_cloud": "make_llm_ollama_cloud",
+    "ollama":       "make_llm",
+    "gemini":       "make_llm_gemini",
+}
+
+# Combinaisons d'outils distinctes gardées bindées (une par sélection du retriever)
+_MAX_BOUND = 32
+
+_lock = threading.Lock()
+_clients: dict[tuple, object] = {}
+_bound: OrderedDict[tuple, object] = OrderedDict()
+_counters = {"client_hits": 0, "client_builds": 0, "bound_hits": 0, "bound_builds": 0}
+
+
+def _model_for(backend: str) -> str:
+    if backend == "groq":
+        return settings.groq_model
+    if backend == "ollama_cloud":
+        return settings.ollama_cloud_model
+    if backend == "gemini":
+        return settings.gemini_model
+    return settings.ollama_model
+
+
+def client_key(backend: str) -> tuple[str, str, float]:
+    """Clé du pool : (backend, modèle, température) lus dans settings."""
+    if backend not in _FACTORIES:
+        backend = "ollama_cloud"
+    return backend, _model_for(backend), float(settings.temperature)
+
+
+def get_client(backend: str | None = None):
+    """Client LLM sans outils pour `backend` (défaut : backend actif), construit une seule fois."""
+    key = client_key(backend or settings.llm_backend)
+    with _lock:
+        llm = _clients.get(key)
+        if llm is not None:
+            _counters["client_hits"] += 1
+            return llm
+    # Construction hors verrou — les factories peuvent être lentes (import gemini)
+    llm = getattr(models, _FACTORIES[key[0]])()
+    with _lock:
+        llm = _clients.setdefault(key, llm)
+        _counters["client_builds"] += 1
+    return llm
+
+
+def get_bound(backend: str | None, tools: list):
+    """Client bindé sur `tools`, réutilisé tant que la même sélection d'outils revient."""
+    key = client_key(backend or settings.llm_backend) + (frozenset(t.name for t in tools),)
+    with _lock:
+        bound = _bound.get(key)
+        if bound is not None:
+            _bound.move_to_end(key)
+            _counters["bound_hits"] += 1
+            return bound
+    bound = bind_tools(get_client(key[0]), tools)
+    with _lock:
+        bound = _bound.setdefault(key, bound)
+        _bound.move_to_end(key)
+        while len(_bound) > _MAX_BOUND:
+            _bound.popitem(last=False)
+        _counters["bound_builds"] += 1
+    return bound
+
+
+def invalidate() -> None:
+    """Oublie tous les clients et runnables bindés (changement de backend/modèle/température)."""
+    with _lock:
+        _clients.clear()
+        _bound.clear()
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_counters, "clients": len(_clients), "bound": len(_bound)}
@@ -0,0 +1,232 @@
+# src/orchestrator/compactor.py
+"""
+Compaction de contexte en arrière-plan.
+
+Au lieu d'un gros appel LLM bloquant quand la limite est atteinte :
+
+- dès que le contexte dépasse un seuil doux (60 % du budget), les segments
+  fermés les plus anciens (tour humain → réponses IA → résultats d'outils) sont
+  résumés dans un thread, en prolongeant le résumé précédent
+- le résumé roulant et l'id du dernier message couvert sont gardés dans le
+  checkpoint (rolling_summary / rolling_summary_upto)
+- à la limite dure, il suffit de remplacer les messages couverts par le résumé
+  précalculé — aucun appel LLM sur le chemin critique
+
+Le segment en cours et le dernier segment fermé restent toujours bruts.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+
+SUMMARY_MARKER = "[CONTEXTE COMPRESSÉ"
+SOFT_RATIO = 0.6            # part du budget utilisable qui déclenche une compaction
+_MIN_NEW_TOKENS = 4_000     # pas de job pour moins que ça de nouveaux messages fermés
+_KEEP_RECENT = 1            # segments fermés laissés bruts en plus du segment courant
+
+
+def _content_str(m) -> str:
+    content = getattr(m, "content", "")
+    if isinstance(content, list):
+        return " ".join(p.get("text", "") if isinstance(p, dict) else str(p) for p in content)
+    return content if isinstance(content, str) else str(content)
+
+
+def is_summary(m) -> bool:
+    return isinstance(m, HumanMessage) and SUMMARY_MARKER in _content_str(m)
+
+
+def transcript(messages: List) -> str:
+    """Transcription texte compacte (tronquée par message) pour un prompt de résumé."""
+    parts = []
+    for m in messages:
+        content = _content_str(m)
+        if isinstance(m, HumanMessage):
+            parts.append(f"[USER]: {content[:4000]}")
+        elif isinstance(m, AIMessage):
+            if content.strip():
+                parts.append(f"[ASSISTANT]: {content[:4000]}")
+            for tc in getattr(m, "tool_calls", []) or []:
+                args_str = str(tc.get("args", {}))[:1500]
+                parts.append(f"[TOOL CALL] {tc.get('name', '?')}({args_str})")
+        elif isinstance(m, ToolMessage):
+            name = getattr(m, "name", "tool") or "tool"
+            parts.append(f"[TOOL RESULT] {name}: {content[:3000]}")
+    return "\n".join(parts)
+
+
+def closed_segments(messages: List) -> list[list]:
+    """Segments fermés, du plus ancien au plus récent : chacun commence par un
+    HumanMessage et s'arrête avant le suivant. Le dernier segment (en cours)
+    est exclu, tout comme le système et un éventuel résumé."""
+    segments: list[list] = []
+    current: list | None = None
+    for m in messages:
+        if isinstance(m, SystemMessage) or is_summary(m):
+            continue
+        if isinstance(m, HumanMessage):
+            if current:
+                segments.append(current)
+            current = [m]
+        elif current is not None:
+            current.append(m)
+    return segments
+
+
+def summary_base(messages: List) -> str:
+    """Texte du dernier résumé présent dans l'historique (sans le marqueur), ou ""."""
+    for m in reversed(messages):
+        if is_summary(m):
+            return _content_str(m).split("\n", 1)[-1]
+    return ""
+
+
+def summarize(llm, previous: str, segments: list[list], thread_id: str | None = None) -> str:
+    """Prolonge `previous` avec les segments donnés — un seul appel LLM."""
+    body = "\n\n".join(transcript(seg) for seg in segments)
+    prev = f"RÉSUMÉ EXISTANT (à conserver et compléter) :\n{previous}\n\n" if previous else ""
+    prompt = (
+        "Tu es un assistant de mémoire pour un agent. Mets à jour le résumé de session "
+        "avec la suite de la transcription ci-dessous.\n\n"
+        "Génère un résumé DENSE et TECHNIQUE qui permettra à l'agent de continuer "
+        "comme si de rien n'était. Préserve ABSOLUMENT :\n"
+        "1. Les demandes de l'utilisateur (objectif global)\n"
+        "2. Le plan d'action — étapes complétées ✓ et restantes ○\n"
+        "3. Chaque fichier lu, modifié ou créé — chemin exact + contenu clé\n"
+        "4. Le répertoire de travail courant (dernier shell_cd)\n"
+        "5. Erreurs rencontrées et solutions appliquées (ou en suspens)\n"
+        "6. Commandes exécutées et leurs résultats, choix techniques et pourquoi\n\n"
+        f"{prev}SUITE DE LA TRANSCRIPTION :\n{body}\n\n"
+        "Réponds uniquement avec le résumé structuré complet. Chemins exacts, noms de "
+        "variables, valeurs de config — pas de généralités."
+    )
+    from src.infra.settings import settings
+    from src.infra.usage_ledger import ledger, model_name
+    t0 = time.perf_counter()
+    response = llm.invoke([HumanMessage(content=prompt)])
+    ledger.record(
+        settings.llm_backend, model_name(llm), getattr(response, "usage_metadata", None),
+        latency_ms=(time.perf_counter() - t0) * 1000, thread_id=thread_id, source="compaction",
+    )
+    return _content_str(response)
+
+
+def summary_message(summary: str, msg_id: str | None = None) -> HumanMessage:
+    return HumanMessage(
+        content=f"{SUMMARY_MARKER} — continue la tâche à partir d'ici]\n{summary}",
+        id=msg_id,
+    )
+
+
+def apply_summary(messages: List, summary: str, upto_id: str) -> tuple[List, List] | None:
+    """
+    Remplace tous les messages jusqu'à `upto_id` inclus par le résumé.
+
+    Retourne (working, updates) : la liste à envoyer au LLM et les mises à jour
+    d'état. Le résumé reprend l'id du plus ancien message couvert pour que
+    add_messages le remplace en place (il reste avant les messages gardés).
+    None si `upto_id` n'est plus dans l'historique.
+    """
+    idx = next((i for i, m in enumerate(messages) if getattr(m, "id", None) == upto_id), None)
+    if idx is None:
+        return None
+    covered = [m for m in messages[: idx + 1] if not isinstance(m, SystemMessage)]
+    ids = [m.id for m in covered if getattr(m, "id", None)]
+    if not ids:
+        return None
+    system = [m for m in messages[: idx + 1] if isinstance(m, SystemMessage)]
+    new_summary = summary_message(summary, ids[0])
+    working = system + [new_summary] + list(messages[idx + 1:])
+    updates = [new_summary] + [RemoveMessage(id=i) for i in ids[1:]]
+    return working, updates
+
+
+class RollingCompactor:
+    """Un job de résumé au plus par thread, exécuté hors du chemin critique."""
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="axon-compact")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Future] = {}
+        self._ready: dict[str, tuple[str, str]] = {}
+        self.counters = {"started": 0, "completed": 0, "failed": 0, "swaps": 0, "fallbacks": 0}
+
+    def maybe_start(
+        self,
+        thread_id: str,
+        messages: List,
+        used_tokens: int,
+        budget: int,
+        count_tokens: Callable[[List], int],
+        llm_factory: Callable[[], object],
+        rolling: tuple[str, str] | None = None,
+    ) -> bool:
+        """Lance un résumé en arrière-plan si le seuil doux est dépassé et qu'il y a
+        assez de segments fermés que le résumé roulant `rolling` (résumé, upto_id)
+        ne couvre pas encore."""
+        if used_tokens < SOFT_RATIO * budget:
+            return False
+        with self._lock:
+            job = self._jobs.get(thread_id)
+            if (job is not None and not job.done()) or thread_id in self._ready:
+                return False
+
+        segments = closed_segments(messages)
+        if _KEEP_RECENT:
+            segments = segments[:-_KEEP_RECENT]
+        previous = summary_base(messages)
+        if rolling:
+            ends = [getattr(seg[-1], "id", None) for seg in segments]
+            if rolling[1] in ends:
+                # Le résumé roulant est toujours valide : on ne résume que la suite
+                previous, segments = rolling[0], segments[ends.index(rolling[1]) + 1:]
+        if not segments or not getattr(segments[-1][-1], "id", None):
+            return False
+        if count_tokens([m for seg in segments for m in seg]) < _MIN_NEW_TOKENS:
+            return False
+
+        upto_id = segments[-1][-1].id
+
+        def _job() -> None:
+            try:
+                text = summarize(llm_factory(), previous, segments, thread_id)
+            except Exception:
+                with self._lock:
+                    self.counters["failed"] += 1
+                return
+            with self._lock:
+                self._ready[thread_id] = (text, upto_id)
+                self.counters["completed"] += 1
+
+        with self._lock:
+            self._jobs[thread_id] = self._executor.submit(_job)
+            self.counters["started"] += 1
+        return True
+
+    def take_ready(self, thread_id: str) -> tuple[str, str] | None:
+        """(résumé, id du dernier message couvert) si un job vient de se terminer."""
+        with self._lock:
+            return self._ready.pop(thread_id, None)
+
+    def wait(self, thread_id: str, timeout: float) -> tuple[str, str] | None:
+        """Attend le job en cours (s'il y en a un) puis retourne son résultat."""
+        with self._lock:
+            job = self._jobs.get(thread_id)
+        if job is not None:
+            try:
+                job.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.take_ready(thread_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if not j.done())
+            return {**self.counters, "running": running}
+
+
+compactor = RollingCompactor()
@@ -1,6 +1,7 @@
 # src/orchestrator/graph.py
 from __future__ import annotations
 
+import time
 from datetime import datetime
 from typing import List
 
@@ -9,6 +10,9 @@ from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import ToolNode, tools_condition
 from rich.console import Console as RichConsole
 
+from src.orchestrator.compactor import transcript as _transcript
+from src.infra.tracing import span, tracer
+
 _console = RichConsole()
 
 # ── Context budget constants ───────────────────────────────────────────────────
@@ -23,6 +27,7 @@ _PRUNE_PROTECT     = 40_000
 _PRUNE_MINIMUM     = 12_000
 _MAX_TOOL_MSG_CHARS = 3_000
 _MAX_TOOL_ROUNDS    = 12
+_COMPACT_WAIT       = 60.0   # attente max d'un résumé en arrière-plan déjà lancé, à la limite dure
 
 # ── Compile callback ───────────────────────────────────────────────────────────
 _compile_callback = None
@@ -56,6 +61,28 @@ def get_last_selected_tools() -> list[str]:
     return _last_selected_tools
 
 
+# ── First streamed token (TTFT, set by the UI) ────────────────────────────────
+_first_token_at: float = 0.0
+
+
+def mark_first_token() -> None:
+    """Called by the UI on every streamed chunk; only the first one of each LLM
+    call counts (the node resets the mark before each invoke)."""
+    global _first_token_at
+    if _first_token_at:
+        return
+    _first_token_at = time.perf_counter()
+    tracer.finish("llm.ttft")
+
+
+# ── Tool retrieval stats (for /debug) ─────────────────────────────────────────
+_retriever = None
+
+
+def get_retrieval_stats() -> dict:
+    return _retriever.stats() if _retriever else {}
+
+
 def _on_compress() -> None:
     if _compile_callback:
         _compile_callback()
@@ -77,12 +104,9 @@ def _consecutive_tool_rounds(messages: List) -> int:
 
 # ── Token estimation ───────────────────────────────────────────────────────────
 
-def _estimate_tokens(messages: List) -> int:
-    total = 0
-    for m in messages:
-        content = m.content if isinstance(m.content, str) else str(m.content)
-        total += len(content) // 3
-    return total
+def _estimate_tokens(messages: List, backend: str = "ollama_cloud") -> int:
+    from src.infra.token_count import count_tokens
+    return count_tokens(messages, backend)
 
 
 def _usable_budget(backend: str) -> int:
@@ -90,7 +114,7 @@ def _usable_budget(backend: str) -> int:
 
 
 def _should_compress(messages: List, backend: str) -> bool:
-    return _estimate_tokens(messages) > _usable_budget(backend)
+    return _estimate_tokens(messages, backend) > _usable_budget(backend)
 
 
 # ── Context helpers ────────────────────────────────────────────────────────────
@@ -144,23 +168,7 @@ def _compress_context(messages: List, llm, backend: str = "ollama_cloud") -> tup
     if not conversation:
         return messages, []
 
-    # Build full transcript of everything
-    transcript_parts = []
-    for m in conversation:
-        content = m.content if isinstance(m.content, str) else str(m.content)
-        if isinstance(m, HumanMessage):
-            transcript_parts.append(f"[USER]: {content[:4000]}")
-        elif isinstance(m, AIMessage):
-            if content.strip():
-                transcript_parts.append(f"[ASSISTANT]: {content[:4000]}")
-            for tc in getattr(m, "tool_calls", []) or []:
-                args_str = str(tc.get("args", {}))[:1500]
-                transcript_parts.append(f"[TOOL CALL] {tc.get('name', '?')}({args_str})")
-        elif isinstance(m, ToolMessage):
-            name = getattr(m, "name", "tool") or "tool"
-            transcript_parts.append(f"[TOOL RESULT] {name}: {content[:3000]}")
-
-    transcript = "\n".join(transcript_parts)
+    transcript = _transcript(conversation)
 
     try:
         prompt = (
@@ -202,58 +210,125 @@ def _compress_context(messages: List, llm, backend: str = "ollama_cloud") -> tup
 
 # ── Cached ToolNode ────────────────────────────────────────────────────────────
 
+_TOOL_WORKERS = 6   # appels d'outils en parallèle au maximum dans un batch
+
+_last_tool_timings: list[dict] = []
+
+
+def get_last_tool_timings() -> list[dict]:
+    """Per-call timing of the last tool batch: [{name, ms, cached}, ...] in call order."""
+    return _last_tool_timings
+
+
 class CachedToolNode:
     """Wraps LangGraph's ToolNode with session-level result caching.
-    If ALL tool calls in a batch are cached, skips execution entirely.
-    Otherwise executes normally and caches eligible results.
+
+    Each tool call is resolved on its own: cache hits are answered immediately,
+    only the misses run. Consecutive read-only misses (PARALLEL_SAFE_TOOLS) run
+    concurrently on a bounded pool; any other tool is a barrier executed alone,
+    in order, so writes and cache invalidations keep their sequence. Results
+    come back in tool-call order with per-call timing.
     """
 
     def __init__(self, tools: list) -> None:
-        from src.infra.tools_cache import session_cache, CACHEABLE_TOOLS
+        from concurrent.futures import ThreadPoolExecutor
+        from src.infra.tools_cache import session_cache, CACHEABLE_TOOLS, PARALLEL_SAFE_TOOLS
         self._inner = ToolNode(tools=tools)
         self._cache = session_cache
+        self._cache.register_tools(tools)
         self._cacheable = CACHEABLE_TOOLS
+        self._parallel_safe = PARALLEL_SAFE_TOOLS
+        self._executor = ThreadPoolExecutor(max_workers=_TOOL_WORKERS, thread_name_prefix="axon-tool")
+
+    def _run_one(self, tc: dict, config) -> tuple[list, float]:
+        """Runs a single tool call through ToolNode (error handling, injection)."""
+        t0 = time.perf_counter()
+        # Cacheable tools run with normalized args so the result matches its cache key
+        args = self._cache.normalize(tc["name"], tc.get("args", {}))
+        call = AIMessage(content="", tool_calls=[{**tc, "args": args}])
+        with span(f"tool:{tc['name']}", "tool"):
+            out = self._inner.invoke({"messages": [call]}, config or {})
+        msgs = out.get("messages", []) if isinstance(out, dict) else list(out or [])
+        return msgs, (time.perf_counter() - t0) * 1000
+
+    def _lookup(self, tc: dict) -> ToolMessage | None:
+        if tc["name"] not in self._cacheable:
+            return None
+        hit = self._cache.get(tc["name"], tc.get("args", {}))
+        if hit is None:
+            return None
+        if not isinstance(hit, (str, list)):
+            # Cached raw by the coding specialist: render it like ToolNode would
+            from langgraph.prebuilt.tool_node import msg_content_output
+            hit = msg_content_output(hit)
+        return ToolMessage(content=hit, tool_call_id=tc["id"], name=tc["name"])
+
+    def _after_run(self, tc: dict, msgs: list) -> None:
+        for msg in msgs:
+            if isinstance(msg, ToolMessage) and tc["name"] in self._cacheable and msg.status != "error":
+                self._cache.set(tc["name"], tc.get("args", {}), msg.content)
+        self._cache.on_tool_executed(tc["name"], tc.get("args", {}))
+
+    def _run_wave(self, wave: list[int], tool_calls: list, config, results: dict, timings: dict) -> None:
+        """Resolves a group of read-only calls: hits now, misses concurrently."""
+        import contextvars
+        misses = []
+        for i in wave:
+            t0 = time.perf_counter()
+            hit = self._lookup(tool_calls[i])
+            if hit is not None:
+                results[i] = [hit]
+                timings[i] = ((time.perf_counter() - t0) * 1000, True)
+            else:
+                misses.append(i)
+        if len(misses) == 1:
+            i = misses[0]
+            results[i], ms = self._run_one(tool_calls[i], config)
+            timings[i] = (ms, False)
+        elif misses:
+            futures = {
+                i: self._executor.submit(contextvars.copy_context().run, self._run_one, tool_calls[i], config)
+                for i in misses
+            }
+            for i, fut in futures.items():
+                results[i], ms = fut.result()
+                timings[i] = (ms, False)
+        for i in misses:
+            self._after_run(tool_calls[i], results[i])
 
     def __call__(self, state: dict, config=None) -> dict:
         last = state["messages"][-1] if state.get("messages") else None
         tool_calls = getattr(last, "tool_calls", None) or []
 
-        # Attempt full-batch cache hit
-        cached_msgs: list[ToolMessage] = []
-        for tc in tool_calls:
-            name, args = tc["name"], tc.get("args", {})
-            if name not in self._cacheable:
-                cached_msgs = []
-                break
-            hit = self._cache.get(name, args)
-            if hit is None:
-                cached_msgs = []
-                break
-            cached_msgs.append(ToolMessage(content=hit, tool_call_id=tc["id"], name=name))
-
-        if cached_msgs:
-            return {"messages": cached_msgs}
-
-        # Execute and cache eligible results
-        result = self._inner.invoke(state, config or {})
-        tc_by_id = {tc["id"]: tc for tc in tool_calls}
-
-        for msg in result.get("messages", []):
-            if not isinstance(msg, ToolMessage):
+        results: dict[int, list] = {}
+        timings: dict[int, tuple[float, bool]] = {}
+        wave: list[int] = []
+        for i, tc in enumerate(tool_calls):
+            if tc["name"] in self._parallel_safe:
+                wave.append(i)
                 continue
-            tc = tc_by_id.get(msg.tool_call_id)
-            if tc and tc["name"] in self._cacheable:
-                from src.infra.tools_cache import CACHE_TTLS
-                self._cache.set(tc["name"], tc.get("args", {}), msg.content, CACHE_TTLS[tc["name"]])
-            if tc:
-                self._cache.on_tool_executed(tc["name"])
+            # Barrier: flush pending reads, then run this call alone
+            self._run_wave(wave, tool_calls, config, results, timings)
+            wave = []
+            results[i], ms = self._run_one(tc, config)
+            timings[i] = (ms, False)
+            self._after_run(tc, results[i])
+        self._run_wave(wave, tool_calls, config, results, timings)
+
+        global _last_tool_timings
+        _last_tool_timings = [
+            {"name": tc["name"], "ms": round(timings[i][0], 2), "cached": timings[i][1]}
+            for i, tc in enumerate(tool_calls)
+        ]
+        messages = [m for i in range(len(tool_calls)) for m in results.get(i, [])]
 
         # Redact sensitive data before it enters the LLM context on cloud backends
         from src.infra.settings import settings
         from src.infra.redactor import should_redact, redact, is_sensitive_path
         if should_redact(settings.llm_backend):
+            tc_by_id = {tc["id"]: tc for tc in tool_calls}
             cleaned: list[ToolMessage] = []
-            for msg in result.get("messages", []):
+            for msg in messages:
                 if isinstance(msg, ToolMessage) and isinstance(msg.content, str):
                     tc = tc_by_id.get(msg.tool_call_id, {})
                     args = tc.get("args", {}) if tc else {}
@@ -267,19 +342,24 @@ class CachedToolNode:
                         name=getattr(msg, "name", None),
                     )
                 cleaned.append(msg)
-            result = {"messages": cleaned}
+            messages = cleaned
 
-        return result
+        # Large results live in the blob store; the checkpoint keeps a handle + preview
+        from src.infra.blobs import blob_store
+        return {"messages": [blob_store.offload(m) for m in messages]}
 
 
 # ── Orchestrator ───────────────────────────────────────────────────────────────
 
 from src.orchestrator.state import GlobalState
-from src.llm.models import make_llm, make_llm_ollama_cloud, make_llm_groq, make_llm_gemini
+from src.llm import pool as llm_pool
 from src.llm.prompts import build_system_prompt
 from src.orchestrator.registry import build_all_tools
+from src.infra.tool_schemas import tool_schemas
 from src.infra.checkpoint import build_checkpointer
 from src.orchestrator.tool_retriever import ToolRetriever
+from src.orchestrator.compactor import compactor, apply_summary
+from src.infra.usage_ledger import ledger
 
 
 def _ensure_system_prompt(
@@ -301,20 +381,16 @@ def _ensure_system_prompt(
 
 
 def _chat_node_factory():
-    _factories = {
-        "groq":         make_llm_groq,
-        "ollama_cloud": make_llm_ollama_cloud,
-        "ollama":       make_llm,
-        "gemini":       make_llm_gemini,
-    }
     tools = build_all_tools()
+    tool_schemas.schemas(tools)   # précompile (ou relit depuis ~/.axon) tous les schémas
     retriever = ToolRetriever(tools)
+    global _retriever
+    _retriever = retriever
 
-    def chatbot(state: GlobalState):
+    def chatbot(state: GlobalState, config=None):
         from src.infra.settings import settings
         from src.ui.plan_mode import is_active as _is_plan_mode, BLOCKED_TOOLS
         backend = settings.llm_backend
-        factory = _factories.get(backend, make_llm_ollama_cloud)
 
         last_human = next((m for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), None)
         last_message = state["messages"][-1]
@@ -335,7 +411,8 @@ def _chat_node_factory():
                 query = " ".join(human_msgs[-3:])
         else:
             query = _content_to_str(last_message.content) if hasattr(last_message, "content") else str(last_message)
-        selected_tools = retriever.get(query)
+        with span("retrieval"):
+            selected_tools = retriever.get(query)
         global _last_selected_tools
         _last_selected_tools = [t.name for t in selected_tools]
 
@@ -348,32 +425,72 @@ def _chat_node_factory():
         force_text = _consecutive_tool_rounds(state["messages"]) >= _MAX_TOOL_ROUNDS
         if force_text:
             _console.print(f"[dim]  ↩  {_MAX_TOOL_ROUNDS} rounds atteints — synthèse forcée[/dim]")
-            llm_with_tools = factory()
+            llm_with_tools = llm_pool.get_client(backend)
         else:
-            llm_with_tools = factory().bind_tools(selected_tools)
+            llm_with_tools = llm_pool.get_bound(backend, selected_tools)
 
         messages = state["messages"]
         today = datetime.now().strftime("%Y-%m-%d")
-        messages = _ensure_system_prompt(messages, selected_tools, today, plan_mode=plan_mode)
+        with span("prompt"):
+            messages = _ensure_system_prompt(messages, selected_tools, today, plan_mode=plan_mode)
+            # Offloaded tool results: full content for the LLM only, never written back
+            from src.infra.blobs import blob_store
+            messages = blob_store.hydrate(messages)
 
         # Proactive compression before calling the LLM (once per user turn max)
         working = messages
         global _compressed_this_turn
         _state_removals: list = []   # original msgs replaced by summary → RemoveMessage
         _summary_msg = None          # the summary HumanMessage to persist
+        _state_extra: dict = {}      # rolling summary fields to persist in the checkpoint
+        _swap_updates: list = []     # precomputed summary swapped in + RemoveMessage
+
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id", "default")
+        rolling = None
+        if state.get("rolling_summary") and state.get("rolling_summary_upto"):
+            rolling = (state["rolling_summary"], state["rolling_summary_upto"])
+        ready = compactor.take_ready(thread_id)
+        if ready:
+            rolling = ready
+            _state_extra = {"rolling_summary": ready[0], "rolling_summary_upto": ready[1]}
 
         if _should_compress(working, backend) and not _compressed_this_turn:
             _compressed_this_turn = True
-            _console.print("[dim]  ↩  contexte chargé — compression proactive…[/dim]")
-            _on_compress()
-            plain_llm = factory()
-            working = _cap_tool_messages(working)
-            working, _state_removals = _compress_context(working, plain_llm, backend)
-            # The summary msg is the first HumanMessage in the compressed list
-            _summary_msg = next(
-                (m for m in working if isinstance(m, HumanMessage)
-                 and "[CONTEXTE COMPRESSÉ" in str(m.content)),
-                None,
+            # A background summary in flight is always closer to done than a new one
+            with span("compaction.wait", "compression"):
+                ready = compactor.wait(thread_id, _COMPACT_WAIT)
+            if ready:
+                rolling = ready
+            swapped = apply_summary(working, *rolling) if rolling else None
+            if swapped and not _should_compress(swapped[0], backend):
+                working, _swap_updates = swapped
+                _state_extra = {"rolling_summary": "", "rolling_summary_upto": ""}
+                compactor.counters["swaps"] += 1
+                _console.print("[dim]  ↩  contexte compacté — résumé précalculé[/dim]")
+            else:
+                compactor.counters["fallbacks"] += 1
+                _console.print("[dim]  ↩  contexte chargé — compression proactive…[/dim]")
+                _on_compress()
+                plain_llm = llm_pool.get_client(backend)
+                working = _cap_tool_messages(working)
+                with span("compression.blocking", "compression"):
+                    working, _state_removals = _compress_context(working, plain_llm, backend)
+                # The summary msg is the first HumanMessage in the compressed list
+                _summary_msg = next(
+                    (m for m in working if isinstance(m, HumanMessage)
+                     and "[CONTEXTE COMPRESSÉ" in str(m.content)),
+                    None,
+                )
+                _state_extra = {"rolling_summary": "", "rolling_summary_upto": ""}
+        else:
+            # Soft threshold — summarise the oldest closed rounds off the critical path
+            compactor.maybe_start(
+                thread_id, working,
+                used_tokens=_estimate_tokens(working, backend),
+                budget=_usable_budget(backend),
+                count_tokens=lambda ms: _estimate_tokens(ms, backend),
+                llm_factory=lambda: llm_pool.get_client(backend),
+                rolling=rolling,
             )
 
         capped = False
@@ -381,12 +498,26 @@ def _chat_node_factory():
 
         while True:
             try:
-                response = llm_with_tools.invoke(working)
+                global _first_token_at
+                _first_token_at = 0.0
+                tracer.start("llm.ttft", "ttft", backend=backend)
+                t_call = time.perf_counter()
+                with span("llm", backend=backend, messages=len(working)):
+                    response = llm_with_tools.invoke(working)
+                t_done = time.perf_counter()
+                tracer.finish("llm.ttft")   # no streamed token (tool call only) → full latency
 
                 usage = getattr(response, "usage_metadata", None)
                 if usage:
                     from src.ui.token_gauge import update_usage
                     update_usage(usage)
+                ttft = _first_token_at - t_call if t_call < _first_token_at <= t_done else None
+                ledger.record(
+                    backend, llm_pool.client_key(backend)[1], usage,
+                    latency_ms=(t_done - t_call) * 1000,
+                    ttft_ms=ttft * 1000 if ttft is not None else None,
+                    thread_id=thread_id,
+                )
 
                 break
 
@@ -405,8 +536,9 @@ def _chat_node_factory():
                     if not _compressed_this_turn:
                         _compressed_this_turn = True
                         _on_compress()
-                    plain_llm = factory()
-                    working, removed = _compress_context(working, plain_llm, backend)
+                    plain_llm = llm_pool.get_client(backend)
+                    with span("compression.blocking", "compression"):
+                        working, removed = _compress_context(working, plain_llm, backend)
                     _state_removals.extend(r for r in removed if r not in _state_removals)
                     _summary_msg = next(
                         (m for m in working if isinstance(m, HumanMessage)
@@ -425,13 +557,13 @@ def _chat_node_factory():
         # Persist compression to LangGraph state so subsequent chatbot calls
         # start with the compressed history, not the original bloated one.
         from langchain_core.messages import RemoveMessage
-        result: list = []
+        result: list = list(_swap_updates)
         if _state_removals:
             result += [RemoveMessage(id=m.id) for m in _state_removals if getattr(m, "id", None)]
             if _summary_msg:
                 result.append(_summary_msg)
         result.append(response)
-        return {"messages": result}
+        return {"messages": result, **_state_extra}
 
     return chatbot, tools
 
@@ -0,0 +1,86 @@
+# src/orchestrator/lexical_search.py
+"""
+Score lexical BM25 sur le corpus de sélection d'outils.
+
+Même corpus et même ordre de lignes que VectorSearch (nom + description de
+chaque outil, puis ses anchors) : les deux vecteurs de scores s'additionnent
+ligne à ligne. Sert aussi de repli quand l'embedder Ollama est lent ou absent —
+un score complet prend bien moins d'une milliseconde.
+"""
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Mots vides FR/EN — trop fréquents pour discriminer un outil
+_STOPWORDS = frozenset("""
+    le la les un une des du de d l au aux et ou en dans sur pour par avec sans ce cet cette ces
+    mon ma mes ton ta tes son sa ses notre nos votre vos leur leurs je tu il elle on nous vous ils
+    elles me moi te toi se qui que quoi dont est sont suis etre a ai as ont avoir fait faire fais
+    pas ne plus tout tous toute toutes y c qu s n m t j
+    the a an and or of to in on for with without is are be this that these those my your it
+    me i you we they what which who please can could would do does
+""".split())
+
+
+def _fold(text: str) -> str:
+    """Minuscules sans accents : "Créé" → "cree"."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    """Tokens normalisés : sans accents, sans mots vides, pluriels simples repliés.
+    Les noms d'outils sont découpés sur "_" (gmail_search → gmail, search)."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(_fold(text)):
+        if tok in _STOPWORDS or len(tok) < 2:
+            continue
+        if len(tok) > 3 and tok.endswith("s"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+class BM25Index:
+    """BM25 (Okapi) sur une liste de documents courts."""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75) -> None:
+        self._n = len(texts)
+        self._k1, self._b = k1, b
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        lengths = np.zeros(self._n, dtype=np.float32)
+        for i, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[i] = sum(counts.values())
+            for tok, tf in counts.items():
+                self._postings.setdefault(tok, []).append((i, tf))
+        avg = float(lengths.mean()) if self._n else 1.0
+        # Normalisation de longueur précalculée : k1 * (1 - b + b * len / avg)
+        self._norm = k1 * (1 - b + b * lengths / (avg or 1.0))
+        self._idf = {
+            tok: math.log(1 + (self._n - len(p) + 0.5) / (len(p) + 0.5))
+            for tok, p in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return self._n
+
+    def scores(self, query: str) -> np.ndarray:
+        """Score BM25 de la requête pour chaque document (n_docs,), 0 si aucun terme commun."""
+        out = np.zeros(self._n, dtype=np.float32)
+        for tok in set(tokenize(query)):
+            postings = self._postings.get(tok)
+            if not postings:
+                continue
+            idf = self._idf[tok]
+            for i, tf in postings:
+                out[i] += idf * tf * (self._k1 + 1) / (tf + self._norm[i])
+        return out
@@ -0,0 +1,212 @@
+# src/orchestrator/retrieval_bench.py
+"""
+Benchmark de la sélection d'outils (ToolRetriever).
+
+Rejoue le corpus étiqueté de retrieval_corpus.py et mesure, pour chaque k :
+- recall@k   : part des groupes attendus présents dans les outils sélectionnés
+- exact      : part des requêtes dont TOUS les groupes attendus sont couverts
+- outils     : nombre d'outils bindés (moyenne, p95) et taille estimée de leurs
+               descriptions en tokens — c'est ce que paie chaque appel LLM
+- bruit      : outils bindés sur les questions qui n'en demandent aucun
+- latence    : p50 / p95 de ToolRetriever.get()
+
+Par défaut tout tourne hors-ligne avec HashingEmbeddings, un embedder
+déterministe (hachage de mots et trigrammes) : les chiffres sont reproductibles
+d'une machine à l'autre et servent à comparer deux versions de TOOL_GROUPS,
+_TOOL_ANCHORS ou k. --ollama utilise le vrai nomic-embed-text.
+
+    python -m src.orchestrator.retrieval_bench --k 5 7 9
+    python -m src.orchestrator.retrieval_bench --lexical --misses 20
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.orchestrator.lexical_search import tokenize
+from src.orchestrator.retrieval_corpus import LABELLED_QUERIES
+from src.orchestrator.tool_retriever import ToolRetriever, _TOOL_TO_GROUP
+
+
+class HashingEmbeddings(Embeddings):
+    """Embedder déterministe hors-ligne : mots + trigrammes de caractères hachés
+    (blake2b, signe aléatoire) dans un vecteur de dimension fixe."""
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> list[str]:
+        feats = []
+        for tok in tokenize(text):
+            feats.append(f"w:{tok}")
+            padded = f"#{tok}#"
+            feats.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return feats
+
+    def _vec(self, text: str) -> list[float]:
+        v = np.zeros(self.dim, dtype=np.float32)
+        for feat in self._features(text):
+            h = int.from_bytes(hashlib.blake2b(feat.encode(), digest_size=8).digest(), "little")
+            v[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        return v.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._vec(text)
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    return float(np.percentile(np.asarray(values, dtype=np.float64), p))
+
+
+def run_benchmark(
+    tools: list,
+    k: int = 7,
+    corpus: list[tuple[str, tuple[str, ...]]] | None = None,
+    embeddings: Embeddings | None = None,
+    model: str = "bench-hashing",
+    lexical_only: bool = False,
+    index_dir: Path | None = None,
+) -> dict:
+    """Rejoue `corpus` sur un ToolRetriever neuf et retourne les métriques agrégées."""
+    corpus = LABELLED_QUERIES if corpus is None else corpus
+    with tempfile.TemporaryDirectory() as tmp:
+        retriever = ToolRetriever(
+            tools, k=k,
+            embeddings=embeddings if embeddings is not None else HashingEmbeddings(),
+            model=model,
+            index_dir=index_dir or Path(tmp),
+        )
+        if lexical_only:
+            retriever._down_until = float("inf")
+
+        recalls: list[float] = []
+        exact = 0
+        bound: list[int] = []
+        prompt_tokens: list[int] = []
+        noise: list[int] = []
+        latencies: list[float] = []
+        per_group: dict[str, list[int]] = {}
+        misses: list[dict] = []
+
+        for query, expected in corpus:
+            t0 = time.perf_counter()
+            selected = retriever.get(query)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+            names = [t.name for t in selected]
+            groups = {_TOOL_TO_GROUP[n] for n in names if n in _TOOL_TO_GROUP}
+            bound.append(len(selected))
+            prompt_tokens.append(sum(len(t.name) + len(t.description or "") for t in selected) // 3)
+
+            if not expected:
+                noise.append(len(selected))
+                continue
+
+            found = [g for g in expected if g in groups]
+            recalls.append(len(found) / len(expected))
+            if len(found) == len(expected):
+                exact += 1
+            else:
+                misses.append({"query": query, "expected": list(expected), "got": sorted(groups)})
+            for g in expected:
+                per_group.setdefault(g, []).append(int(g in groups))
+
+    labelled = len(recalls)
+    return {
+        "k": k,
+        "mode": "lexical" if lexical_only else "fused",
+        "queries": len(corpus),
+        "recall": round(float(np.mean(recalls)), 4) if recalls else 0.0,
+        "exact": round(exact / labelled, 4) if labelled else 0.0,
+        "tools_mean": round(float(np.mean(bound)), 2) if bound else 0.0,
+        "tools_p95": _percentile(bound, 95),
+        "prompt_tokens_mean": int(np.mean(prompt_tokens)) if prompt_tokens else 0,
+        "noise_tools_mean": round(float(np.mean(noise)), 2) if noise else 0.0,
+        "latency_p50_ms": round(_percentile(latencies, 50), 3),
+        "latency_p95_ms": round(_percentile(latencies, 95), 3),
+        "per_group": {g: round(sum(v) / len(v), 3) for g, v in sorted(per_group.items())},
+        "misses": misses,
+    }
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _print_report(reports: list[dict], show_misses: int) -> None:
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    console = Console()
+    tbl = Table(box=box.SIMPLE_HEAD, title="tool retrieval", title_style="bold color(214)")
+    for col in ("k", "mode", "recall@k", "exact", "outils", "p95", "tokens", "bruit", "p50 ms", "p95 ms"):
+        tbl.add_column(col, justify="right", no_wrap=True)
+    for r in reports:
+        tbl.add_row(
+            str(r["k"]), r["mode"], f"{r['recall']:.3f}", f"{r['exact']:.3f}",
+            f"{r['tools_mean']:.1f}", f"{r['tools_p95']:.0f}", str(r["prompt_tokens_mean"]),
+            f"{r['noise_tools_mean']:.1f}", f"{r['latency_p50_ms']:.2f}", f"{r['latency_p95_ms']:.2f}",
+        )
+    console.print(tbl)
+
+    groups = Table(box=box.SIMPLE_HEAD, title="recall par groupe", title_style="dim")
+    groups.add_column("groupe", style="dim")
+    for r in reports:
+        groups.add_column(f"k={r['k']}", justify="right")
+    for g in reports[0]["per_group"]:
+        groups.add_row(g, *(f"{r['per_group'].get(g, 0):.2f}" for r in reports))
+    console.print(groups)
+
+    if show_misses:
+        last = reports[-1]
+        console.print(f"[dim]requêtes ratées (k={last['k']}) :[/dim]")
+        for m in last["misses"][:show_misses]:
+            console.print(f"  [color(214)]›[/color(214)] {m['query']}  "
+                          f"[dim]attendu {m['expected']} · obtenu {m['got']}[/dim]")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la sélection d'outils")
+    parser.add_argument("--k", type=int, nargs="+", default=[7], help="valeurs de k à comparer")
+    parser.add_argument("--lexical", action="store_true", help="BM25 seul (simule Ollama indisponible)")
+    parser.add_argument("--ollama", action="store_true", help="vrai embedder nomic-embed-text au lieu du stand-in")
+    parser.add_argument("--misses", type=int, default=0, help="affiche N requêtes ratées")
+    parser.add_argument("--json", action="store_true", help="sortie JSON brute")
+    args = parser.parse_args(argv)
+
+    from src.orchestrator.registry import build_all_tools
+    tools = build_all_tools()
+
+    reports = []
+    for k in args.k:
+        if args.ollama:
+            from langchain_ollama import OllamaEmbeddings
+            from src.orchestrator.tool_retriever import _EMBED_MODEL
+            report = run_benchmark(
+                tools, k=k, embeddings=OllamaEmbeddings(model=_EMBED_MODEL),
+                model=_EMBED_MODEL, lexical_only=args.lexical,
+                index_dir=Path.home() / ".axon" / "embeddings",
+            )
+        else:
+            report = run_benchmark(tools, k=k, lexical_only=args.lexical)
+        reports.append(report)
+
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        _print_report(reports, args.misses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# src/orchestrator/retrieval_corpus.py
+"""
+Corpus étiqueté pour le benchmark de sélection d'outils (retrieval_bench).
+
+Chaque entrée : (requête utilisateur, groupes TOOL_GROUPS attendus).
+Un tuple vide = question générale, aucun outil n'est nécessaire — ces requêtes
+ne comptent pas dans le rappel mais mesurent combien d'outils sont bindés
+pour rien.
+
+Mélange FR/EN, formulations courtes et longues, fautes de frappe incluses :
+c'est ce que l'orchestrateur reçoit vraiment.
+"""
+from __future__ import annotations
+
+LABELLED_QUERIES: list[tuple[str, tuple[str, ...]]] = [
+    # ── coding ────────────────────────────────────────────────────────────────
+    ("va dans mon projet axon et corrige le bug dans auth.ts", ("coding",)),
+    ("ajoute une route /health à mon API express", ("coding",)),
+    ("refactorise le module de paiement, il est trop long", ("coding",)),
+    ("il y a une exception NullPointer au démarrage de l'app, trouve pourquoi", ("coding",)),
+    ("écris des tests unitaires pour la fonction parse_config", ("coding",)),
+    ("convertis ce projet JavaScript en TypeScript", ("coding",)),
+    ("rends le site responsive sur mobile", ("coding",)),
+    ("change le thème de l'interface en dark mode", ("coding",)),
+    ("explique-moi l'architecture de ce repo", ("coding",)),
+    ("fais une code review de mon projet et dis ce qui peut être amélioré", ("coding",)),
+    ("optimise les performances du dashboard react", ("coding",)),
+    ("crée un Dockerfile pour mon backend python", ("coding",)),
+    ("mets en place une CI github actions pour lancer les tests", ("coding",)),
+    ("configure eslint et prettier sur le projet", ("coding",)),
+    ("migre le projet vers Next.js 14", ("coding",)),
+    ("supprime le code mort et les imports inutilisés", ("coding",)),
+    ("implémente l'authentification JWT dans mon backend", ("coding",)),
+    ("fix the failing build in my rust project", ("coding",)),
+    ("add a dark mode toggle to my web app", ("coding",)),
+    ("refactor this class to use dependency injection", ("coding",)),
+    ("write integration tests for the checkout flow", ("coding",)),
+    ("debug why my flask server returns 500", ("coding",)),
+    ("documente les fonctions publiques du module utils", ("coding",)),
+    ("initialise un nouveau projet fastapi from scratch", ("coding",)),
+    ("trouve où est définie la classe SessionCache dans le projet", ("coding",)),
+    ("améliore le score lighthouse du site vitrine", ("coding",)),
+
+    # ── git ───────────────────────────────────────────────────────────────────
+    ("git status du repo courant", ("git",)),
+    ("montre-moi les derniers commits", ("git",)),
+    ("quels fichiers ont changé depuis le dernier commit ?", ("git",)),
+    ("affiche le diff de mes modifications", ("git",)),
+    ("propose-moi un message de commit", ("git",)),
+    ("ajoute tous les fichiers et commit", ("git",)),
+    ("passe sur la branche develop", ("git",)),
+    ("stash mes changements en cours", ("git",)),
+    ("show me the git log of this repository", ("git",)),
+    ("what's the current branch and status?", ("git",)),
+    ("commit with message 'fix typo in readme'", ("git",)),
+    ("crée une nouvelle branche feature/login", ("git",)),
+    ("récupère le contenu de cette page web https://example.com/docs", ("git",)),
+    ("fetch this url and summarize it: https://blog.example.org/post", ("git",)),
+
+    # ── filesystem ────────────────────────────────────────────────────────────
+    ("trouve mon CV sur le disque", ("filesystem",)),
+    ("où est le fichier budget 2024 ?", ("filesystem",)),
+    ("liste le contenu de mon dossier Downloads", ("filesystem",)),
+    ("ouvre et lis le fichier notes.txt", ("filesystem",)),
+    ("lis le pdf du rapport de stage", ("filesystem",)),
+    ("cherche toutes les occurrences de TODO dans mes fichiers", ("filesystem",)),
+    ("liste tous les fichiers python du dossier scripts", ("filesystem",)),
+    ("qu'est-ce qu'il y a dans le dossier Documents ?", ("filesystem",)),
+    ("find my invoice pdf from last month", ("filesystem",)),
+    ("read the file ~/todo.md", ("filesystem",)),
+    ("list files in my Desktop folder", ("filesystem",)),
+    ("grep for 'api_key' in my config files", ("filesystem",)),
+    ("trouve les fichiers json dans le dossier data", ("filesystem",)),
+    ("localise la facture edf sur mon ordinateur", ("filesystem",)),
+
+    # ── shell ─────────────────────────────────────────────────────────────────
+    ("lance la commande df -h", ("shell",)),
+    ("combien d'espace disque il me reste ?", ("shell",)),
+    ("exécute le script backup.sh", ("shell",)),
+    ("installe le paquet htop", ("shell",)),
+    ("dans quel dossier je suis ?", ("shell",)),
+    ("va dans le dossier ~/projets", ("shell",)),
+    ("envoie-moi une notification dans 5 minutes", ("shell",)),
+    ("copie ce texte dans le presse-papiers", ("shell",)),
+    ("qu'est-ce que j'ai dans mon presse-papier ?", ("shell",)),
+    ("run npm install in the frontend folder", ("shell",)),
+    ("check the uptime of this machine", ("shell",)),
+    ("ping google.com", ("shell",)),
+    ("liste les fichiers du dossier courant avec ls", ("shell",)),
+    ("quelle version de python est installée ?", ("shell",)),
+
+    # ── system ────────────────────────────────────────────────────────────────
+    ("prends une capture d'écran", ("system",)),
+    ("fais un screenshot de mon écran", ("system",)),
+    ("quels processus consomment le plus de CPU ?", ("system",)),
+    ("tue le processus chrome", ("system",)),
+    ("liste les processus en cours", ("system",)),
+    ("à quel réseau wifi je suis connecté ?", ("system",)),
+    ("quelle est la force du signal wifi ?", ("system",)),
+    ("take a screenshot", ("system",)),
+    ("kill the process using port 3000", ("system",)),
+    ("show running processes sorted by memory", ("system",)),
+    ("what wifi network am I on?", ("system",)),
+
+    # ── gmail ─────────────────────────────────────────────────────────────────
+    ("résume mes mails non lus", ("gmail",)),
+    ("est-ce que j'ai reçu un mail de la banque ?", ("gmail",)),
+    ("envoie un email à paul pour décaler la réunion", ("gmail",)),
+    ("écris un mail de remerciement à mon manager", ("gmail",)),
+    ("cherche les emails d'amazon de cette semaine", ("gmail",)),
+    ("rédige un brouillon de réponse au recruteur", ("gmail",)),
+    ("modifie le brouillon, rends-le plus formel", ("gmail",)),
+    ("confirme l'envoi du mail", ("gmail",)),
+    ("summarize my unread emails", ("gmail",)),
+    ("send an email to alice about the invoice", ("gmail",)),
+    ("search my inbox for messages from github", ("gmail",)),
+    ("any new mail from my landlord?", ("gmail",)),
+    ("fais le point sur ma boîte mail", ("gmail",)),
+    ("réponds au dernier mail de julie", ("gmail",)),
+
+    # ── calendar ──────────────────────────────────────────────────────────────
+    ("qu'est-ce que j'ai dans mon agenda demain ?", ("calendar",)),
+    ("ajoute un rendez-vous chez le dentiste jeudi à 14h", ("calendar",)),
+    ("crée un événement réunion d'équipe lundi 10h", ("calendar",)),
+    ("décale mon rdv de vendredi à 16h", ("calendar",)),
+    ("supprime l'événement de ce soir", ("calendar",)),
+    ("liste mes calendriers", ("calendar",)),
+    ("quand est mon prochain rendez-vous médical ?", ("calendar",)),
+    ("suis-je libre mercredi après-midi ?", ("calendar",)),
+    ("what's on my calendar this week?", ("calendar",)),
+    ("schedule a meeting with bob tomorrow at 3pm", ("calendar",)),
+    ("cancel my dentist appointment", ("calendar",)),
+    ("move the standup to 9:30", ("calendar",)),
+    ("mon planning de la semaine prochaine", ("calendar",)),
+
+    # ── drive ─────────────────────────────────────────────────────────────────
+    ("liste mes fichiers google drive", ("drive",)),
+    ("trouve le document 'plan marketing' sur mon drive", ("drive",)),
+    ("lis le fichier compta sur google drive", ("drive",)),
+    ("supprime le fichier brouillon du drive", ("drive",)),
+    ("quand a été modifié le fichier budget sur drive ?", ("drive",)),
+    ("show my recent google drive files", ("drive",)),
+    ("find the id of the 'roadmap' file in drive", ("drive",)),
+    ("open the quarterly report stored in my drive", ("drive",)),
+    ("quels sont les derniers fichiers partagés sur mon drive ?", ("drive",)),
+    ("récupère les métadonnées du fichier contrat.pdf sur drive", ("drive",)),
+
+    # ── docs ──────────────────────────────────────────────────────────────────
+    ("crée un google doc avec le compte rendu de la réunion", ("docs",)),
+    ("mets à jour le google doc du projet avec ces notes", ("docs",)),
+    ("lis le google doc 'spécifications'", ("docs",)),
+    ("rédige un document google docs sur la stratégie produit", ("docs",)),
+    ("create a google doc with this outline", ("docs",)),
+    ("append these notes to my google doc", ("docs",)),
+    ("read my google doc about onboarding", ("docs",)),
+    ("écris un cahier des charges dans un google doc", ("docs",)),
+
+    # ── slides ────────────────────────────────────────────────────────────────
+    ("crée une présentation google slides sur l'IA générative", ("slides",)),
+    ("ajoute une slide de conclusion à la présentation", ("slides",)),
+    ("fais-moi un diaporama pour la soutenance", ("slides",)),
+    ("prépare des slides pour la réunion client", ("slides",)),
+    ("make a google slides presentation about our roadmap", ("slides",)),
+    ("add a slide with the quarterly numbers", ("slides",)),
+    ("génère une présentation de 5 slides sur le RGPD", ("slides",)),
+    ("create a pitch deck in google slides", ("slides",)),
+
+    # ── slack ─────────────────────────────────────────────────────────────────
+    ("envoie un message slack à thomas", ("slack",)),
+    ("lis les derniers messages du channel #dev", ("slack",)),
+    ("est-ce qu'on m'a mentionné sur slack ?", ("slack",)),
+    ("liste les channels slack", ("slack",)),
+    ("mes messages privés slack", ("slack",)),
+    ("cherche 'release' dans les messages slack", ("slack",)),
+    ("trouve l'utilisateur marie sur slack", ("slack",)),
+    ("post a message in #general saying the deploy is done", ("slack",)),
+    ("did anyone mention me on slack today?", ("slack",)),
+    ("read the latest messages in the team channel", ("slack",)),
+    ("DM sarah on slack about the meeting", ("slack",)),
+    ("quoi de neuf sur le slack de l'équipe ?", ("slack",)),
+
+    # ── jira ──────────────────────────────────────────────────────────────────
+    ("quels tickets jira me sont assignés ?", ("jira",)),
+    ("montre le ticket PROJ-123", ("jira",)),
+    ("crée un ticket jira pour le bug de login", ("jira",)),
+    ("passe le ticket AX-42 en done", ("jira",)),
+    ("ajoute un commentaire sur le ticket AX-12", ("jira",)),
+    ("avancement du projet sur jira", ("jira",)),
+    ("qu'est-ce qu'il y a dans le sprint actuel ?", ("jira",)),
+    ("qui fait quoi dans l'équipe sur jira ?", ("jira",)),
+    ("crée tous ces tickets dans mon projet jira", ("jira",)),
+    ("assigne le ticket AX-7 à julien", ("jira",)),
+    ("liste les projets jira", ("jira",)),
+    ("supprime le ticket AX-99", ("jira",)),
+    ("rattache la story AX-15 à l'epic AX-2", ("jira",)),
+    ("show my open jira issues", ("jira",)),
+    ("create a jira bug for the crash on startup", ("jira",)),
+    ("move ticket ABC-10 to in progress", ("jira",)),
+    ("what's left in the current sprint?", ("jira",)),
+    ("import this backlog into jira", ("jira",)),
+    ("mon backlog jira", ("jira",)),
+
+    # ── search ────────────────────────────────────────────────────────────────
+    ("quelles sont les actualités du jour ?", ("search",)),
+    ("résultat du match PSG hier soir", ("search",)),
+    ("dernières nouvelles sur OpenAI", ("search",)),
+    ("fais une recherche approfondie sur les batteries solides", ("search",)),
+    ("cherche sur le web les meilleures pratiques kubernetes", ("search",)),
+    ("qui a gagné les élections hier ?", ("search",)),
+    ("quel est le classement de ligue 1 ?", ("search",)),
+    ("news about the latest iphone release", ("search",)),
+    ("research the state of the art in vector databases", ("search",)),
+    ("what happened in the stock market today?", ("search",)),
+    ("compare les prix des forfaits mobiles en ce moment", ("search",)),
+    ("trouve des infos récentes sur la réforme des retraites", ("search",)),
+    ("score du match de foot de ce soir", ("search",)),
+    ("quoi de neuf dans l'actualité tech cette semaine ?", ("search",)),
+    ("rapport détaillé sur le marché des voitures électriques", ("search",)),
+    ("latest news on the war", ("search",)),
+
+    # ── arxiv ─────────────────────────────────────────────────────────────────
+    ("cherche des papiers arxiv sur les RAG hybrides", ("arxiv",)),
+    ("trouve des articles scientifiques sur les transformers efficaces", ("arxiv",)),
+    ("récupère le papier arxiv 2401.01234", ("arxiv",)),
+    ("publications récentes sur la diffusion vidéo", ("arxiv",)),
+    ("search arxiv for papers on mixture of experts", ("arxiv",)),
+    ("get the abstract of arxiv paper 2310.06825", ("arxiv",)),
+    ("papers about graph neural networks for chemistry", ("arxiv",)),
+    ("état de l'art académique sur le reinforcement learning from human feedback", ("arxiv",)),
+
+    # ── time ──────────────────────────────────────────────────────────────────
+    ("quelle heure est-il ?", ("time",)),
+    ("on est quel jour aujourd'hui ?", ("time",)),
+    ("quelle heure est-il à Tokyo ?", ("time",)),
+    ("what's the date today?", ("time",)),
+    ("what time is it in New York?", ("time",)),
+    ("dans combien de jours est noël ?", ("time",)),
+
+    # ── weather ───────────────────────────────────────────────────────────────
+    ("quel temps fait-il à Lyon ?", ("weather",)),
+    ("météo à Paris demain", ("weather",)),
+    ("est-ce qu'il va pleuvoir ce week-end à Nantes ?", ("weather",)),
+    ("température actuelle à Marseille", ("weather",)),
+    ("what's the weather in London?", ("weather",)),
+    ("will it rain in Berlin tomorrow?", ("weather",)),
+    ("dois-je prendre un parapluie aujourd'hui à Lille ?", ("weather",)),
+    ("prévisions météo pour Bordeaux", ("weather",)),
+
+    # ── diagrams ──────────────────────────────────────────────────────────────
+    ("fais-moi un schéma de l'architecture microservices", ("diagrams",)),
+    ("dessine un flowchart du processus de commande", ("diagrams",)),
+    ("crée un diagramme de séquence pour l'authentification OAuth", ("diagrams",)),
+    ("schématise le fonctionnement d'un RAG", ("diagrams",)),
+    ("fais un mind map sur le machine learning", ("diagrams",)),
+    ("diagramme entité-relation de la base de données", ("diagrams",)),
+    ("draw an architecture diagram of a CDN", ("diagrams",)),
+    ("diagram this data pipeline", ("diagrams",)),
+    ("représente visuellement le cycle de vie d'une requête HTTP", ("diagrams",)),
+    ("fais un organigramme de l'équipe", ("diagrams",)),
+
+    # ── memory ────────────────────────────────────────────────────────────────
+    ("note que l'API de paiement utilise des webhooks signés", ("memory",)),
+    ("retiens pour ce projet qu'on utilise pnpm et pas npm", ("memory",)),
+    ("enregistre dans la mémoire du projet que la DB est postgres 15", ("memory",)),
+    ("remember that this repo deploys with fly.io", ("memory",)),
+    ("ajoute une note projet : le cache redis expire après 10 minutes", ("memory",)),
+
+    # ── multi-groupes ─────────────────────────────────────────────────────────
+    ("lis mes mails et crée les tickets jira correspondants", ("gmail", "jira")),
+    ("résume le channel #support et envoie le résumé par mail à l'équipe", ("slack", "gmail")),
+    ("regarde mon agenda de demain et préviens marc sur slack si je suis occupé", ("calendar", "slack")),
+    ("trouve le fichier rapport.pdf et envoie-le par mail à mon prof", ("filesystem", "gmail")),
+    ("cherche les dernières news sur mistral et fais-en un google doc", ("search", "docs")),
+    ("fais un schéma de l'architecture décrite dans ce papier arxiv", ("arxiv", "diagrams")),
+    ("quel temps fera-t-il demain à Rennes et ai-je des rendez-vous ?", ("weather", "calendar")),
+    ("crée un événement pour la démo et poste l'info sur slack", ("calendar", "slack")),
+    ("lis le ticket AX-5 et envoie un résumé au client par email", ("jira", "gmail")),
+    ("fais une présentation à partir des dernières actualités sur l'IA", ("search", "slides")),
+    ("look up recent papers on RAG and summarize the news around them", ("arxiv", "search")),
+    ("check my calendar and email bob if I'm free friday", ("calendar", "gmail")),
+    ("git log du projet puis poste le changelog sur slack", ("git", "slack")),
+    ("fais une capture d'écran et copie le chemin dans le presse-papiers", ("system", "shell")),
+    ("cherche mon CV et résume-le dans un google doc", ("filesystem", "docs")),
+    ("liste mes tickets jira en cours et bloque du temps dans l'agenda pour chacun", ("jira", "calendar")),
+
+    # ── aucune outil ──────────────────────────────────────────────────────────
+    ("explique-moi la relativité restreinte", ()),
+    ("c'est quoi la différence entre un processus et un thread ?", ()),
+    ("traduis 'good morning' en espagnol", ()),
+    ("donne-moi une recette de crêpes", ()),
+    ("what is the capital of australia?", ()),
+    ("explain big-O notation with examples", ()),
+    ("écris un poème sur l'automne", ()),
+    ("quels sont les avantages de rust par rapport à c++ ?", ()),
+    ("merci !", ()),
+    ("salut, ça va ?", ()),
+    ("résume la théorie de l'évolution en 3 phrases", ()),
+    ("how does a hash map work internally?", ()),
+]
@@ -5,3 +5,7 @@ from langgraph.graph.message import add_messages
 
 class GlobalState(TypedDict, total=False):
     messages: Annotated[List, add_messages]
+    # Rolling summary computed in the background (see compactor.py) and the id
+    # of the last message it covers — swapped in when the hard limit is hit
+    rolling_summary: str
+    rolling_summary_upto: str
@@ -1,7 +1,25 @@
 # src/orchestrator/tool_retriever.py
-from langchain_community.vectorstores import Chroma
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
 from langchain_ollama import OllamaEmbeddings
-from langchain_core.documents import Document
+
+from src.infra.embedding_cache import CachedEmbeddings, EmbeddingIndex, QueryCache
+from src.orchestrator.lexical_search import BM25Index
+from src.orchestrator.vector_search import VectorSearch, top_k
+
+_EMBED_MODEL = "nomic-embed-text"
+
+# Embedding de la requête : attente bornée à quelques ms, au-delà le tour part
+# en lexical seul et le calcul se termine en arrière-plan pour le round suivant.
+# Après une erreur, l'embedder n'est plus sollicité pendant _EMBED_COOLDOWN secondes.
+_EMBED_WAIT     = 0.005
+_EMBED_COOLDOWN = 30.0
+# Poids du score BM25 (normalisé sur [0, 1]) dans le score fusionné
+_LEXICAL_WEIGHT = 0.3
 
 # ── Groupes de tools ──────────────────────────────────────────
 TOOL_GROUPS: dict[str, list[str]] = {
@@ -90,7 +108,7 @@ _ALWAYS_INCLUDED = {"get_current_time"}
 # Pour les méta-outils dont la description parle de "déléguer" plutôt
 # que du travail concret, on indexe N phrases sémantiques supplémentaires
 # couvrant les différentes façons dont un utilisateur peut formuler sa demande.
-# Chaque anchor est un document séparé dans Chroma → N chances d'être trouvé.
+# Chaque anchor est une ligne séparée de l'index vectoriel → N chances d'être trouvé.
 _TOOL_ANCHORS: dict[str, list[str]] = {
     "run_coding_agent": [
         # ── Modifications & corrections ───────────────────────
@@ -290,37 +308,152 @@ _TOOL_ANCHORS: dict[str, list[str]] = {
 
 
 class ToolRetriever:
-    def __init__(self, tools: list, k: int = 7):
+    def __init__(
+        self,
+        tools: list,
+        k: int = 7,
+        embeddings: Embeddings | None = None,
+        model: str = _EMBED_MODEL,
+        index_dir: Path | None = None,
+    ):
         """
         k : nombre de documents récupérés par similarité.
+        embeddings / model / index_dir : embedder de remplacement (benchmarks,
+        tests) et emplacement de son index — par défaut Ollama nomic-embed-text
+        et ~/.axon/embeddings.
         Les méta-outils sont indexés avec plusieurs vecteurs sémantiques
         (multi-vector anchors) pour améliorer leur rappel sans les forcer.
+
+        Les vecteurs des documents viennent de l'index persistant
+        (~/.axon/embeddings) : seuls les descriptions et anchors nouveaux ou
+        modifiés sont ré-embeddés au démarrage. La recherche se fait ensuite
+        en mémoire (VectorSearch), fusionnée avec un score lexical BM25.
+
+        Si Ollama est lent ou absent, la sélection retombe sur le BM25 seul
+        au lieu de bloquer le tour.
         """
-        embeddings = OllamaEmbeddings(model="nomic-embed-text")
+        self._embeddings = embeddings or OllamaEmbeddings(model=model)
 
-        docs = []
+        texts: list[str] = []
+        labels: list[str] = []
         for t in tools:
             # Document principal
-            docs.append(Document(
-                page_content=f"{t.name}: {t.description}",
-                metadata={"tool_name": t.name},
-            ))
+            texts.append(f"{t.name}: {t.description}")
+            labels.append(t.name)
             # Ancres sémantiques supplémentaires (un doc par intention)
             for anchor in _TOOL_ANCHORS.get(t.name, []):
-                docs.append(Document(
-                    page_content=anchor,
-                    metadata={"tool_name": t.name},
-                ))
+                texts.append(anchor)
+                labels.append(t.name)
 
         self._tools = tools
-        self._store = Chroma.from_documents(docs, embeddings)
+        self._texts = texts
+        self._labels = labels
         self._k = k
 
+        self._lexical = BM25Index(texts)
+        self._queries = QueryCache()
+        self._index = EmbeddingIndex(model, directory=index_dir)
+        self._cached = CachedEmbeddings(self._embeddings, self._index, self._queries)
+        self._search: VectorSearch | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="axon-embed")
+        self._down_until = 0.0
+        self._pending = None   # embedding en cours en arrière-plan
+        self._counters = {"dense": 0, "lexical_only": 0, "timeouts": 0, "errors": 0}
+        self._build_dense()
+
+    # ── Dense index ───────────────────────────────────────────────────────────
+
+    def _build_dense(self) -> bool:
+        try:
+            vectors = self._index.sync(self._texts, self._embeddings)
+        except Exception:
+            self._counters["errors"] += 1
+            self._mark_down()
+            return False
+        self._search = VectorSearch(vectors, self._labels)
+        self._down_until = 0.0
+        return True
+
+    def _mark_down(self) -> None:
+        self._down_until = time.monotonic() + _EMBED_COOLDOWN
+
+    def _dense_available(self) -> bool:
+        if time.monotonic() < self._down_until:
+            return False
+        if self._search is None:
+            # Ollama absent au démarrage : reconstruit l'index en arrière-plan,
+            # ce tour-ci reste en lexical seul.
+            self._mark_down()
+            self._executor.submit(self._build_dense)
+            return False
+        return True
+
+    def _embed(self, queries: list[str]) -> dict[str, np.ndarray]:
+        """Vecteurs des requêtes, via le LRU puis un seul appel à l'embedder attendu
+        au plus _EMBED_WAIT. Les requêtes non résolues (calcul en cours, erreur,
+        embedder en pause) sont absentes : leur tour part en BM25 seul."""
+        found, missing = self._cached.lookup(queries)
+        if not missing or self._pending is not None or not self._dense_available():
+            return found
+
+        future = self._executor.submit(self._cached.embed_missing, missing)
+        try:
+            found.update(future.result(timeout=_EMBED_WAIT))
+        except FuturesTimeout:
+            self._counters["timeouts"] += 1
+            # Le calcul continue : son résultat alimentera le LRU pour le round suivant.
+            # Un seul calcul en vol à la fois, un embedder bloqué ne s'empile pas.
+            self._pending = future
+            future.add_done_callback(self._finish_late)
+        except Exception:
+            self._counters["errors"] += 1
+            self._mark_down()
+        return found
+
+    def _finish_late(self, future) -> None:
+        self._pending = None
+        if future.exception() is not None:
+            self._counters["errors"] += 1
+            self._mark_down()
+
+    # ── Ranking ───────────────────────────────────────────────────────────────
+
+    def _rank(self, query: str, query_vec: np.ndarray | None) -> set[str]:
+        lexical = self._lexical.scores(query)
+        peak = float(lexical.max()) if len(lexical) else 0.0
+        if peak > 0:
+            lexical = lexical / peak
+
+        if query_vec is None or self._search is None:
+            self._counters["lexical_only"] += 1
+            if peak <= 0:
+                return set()
+            hits = top_k(lexical, self._labels, self._k)
+            return {name for name, score in hits if score > 0}
+
+        self._counters["dense"] += 1
+        fused = (1 - _LEXICAL_WEIGHT) * self._search.scores(query_vec) + _LEXICAL_WEIGHT * lexical
+        return {name for name, _ in top_k(fused, self._labels, self._k)}
+
     def get(self, query: str) -> list:
-        # 1. Récupère les k documents les plus similaires (dédupliqués par tool_name)
-        results = self._store.as_retriever(search_kwargs={"k": self._k}).invoke(query)
-        seed_names = {r.metadata["tool_name"] for r in results}
+        # 1. Récupère les k documents les plus proches (dense + BM25, dédupliqués par tool_name)
+        return self._select(self._rank(query, self._embed([query]).get(query)))
+
+    def get_many(self, queries: list[str]) -> list[list]:
+        """Version batch de get() : un seul appel d'embedding pour toutes les requêtes non cachées."""
+        if not queries:
+            return []
+        vectors = self._embed(list(queries))
+        return [self._select(self._rank(q, vectors.get(q))) for q in queries]
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "dense_ready": self._search is not None,
+            "query_cache": self._queries.stats(),
+        }
 
+    def _select(self, seed_names: set[str]) -> list:
         # 2. Étend aux groupes complets
         groups_needed: set[str] = set()
         for name in seed_names:
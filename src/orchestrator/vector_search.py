@@ -0,0 +1,68 @@
+# src/orchestrator/vector_search.py
+"""
+Recherche vectorielle en mémoire pour la sélection d'outils.
+
+Le corpus (descriptions d'outils + anchors) fait quelques centaines de vecteurs :
+une matrice float32 contiguë et normalisée suffit. Un score = un produit
+matrice·vecteur (similarité cosinus), le top-k = un argpartition.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def top_k(scores: np.ndarray, labels: Sequence[str], k: int) -> list[tuple[str, float]]:
+    """Les k meilleures lignes de `scores`, triées : [(label, score), ...]."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    idx = np.argpartition(-scores, k - 1)[:k]
+    idx = idx[np.argsort(-scores[idx])]
+    return [(labels[i], float(scores[i])) for i in idx]
+
+
+class VectorSearch:
+    """Top-k cosinus sur une matrice (n_docs, dim) avec un label par ligne."""
+
+    def __init__(self, vectors: np.ndarray, labels: Sequence[str]) -> None:
+        if len(vectors) != len(labels):
+            raise ValueError(f"{len(vectors)} vecteurs pour {len(labels)} labels")
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        self._matrix = np.ascontiguousarray(_normalize(matrix))
+        self._labels = list(labels)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @property
+    def labels(self) -> list[str]:
+        return self._labels
+
+    def scores(self, query_vec: Sequence[float]) -> np.ndarray:
+        """Similarité cosinus de la requête avec chaque document (n_docs,)."""
+        q = _normalize(np.asarray(query_vec, dtype=np.float32).reshape(1, -1))[0]
+        return self._matrix @ q
+
+    def search(self, query_vec: Sequence[float], k: int) -> list[tuple[str, float]]:
+        """Retourne les k documents les plus proches : [(label, score), ...] triés."""
+        if not self._labels:
+            return []
+        return top_k(self.scores(query_vec), self._labels, k)
+
+    def search_many(self, query_vecs: Sequence[Sequence[float]], k: int) -> list[list[tuple[str, float]]]:
+        """Version batch : une seule multiplication (n_queries, dim) @ (dim, n_docs)."""
+        if not len(query_vecs):
+            return []
+        if not self._labels:
+            return [[] for _ in query_vecs]
+        q = _normalize(np.asarray(query_vecs, dtype=np.float32).reshape(len(query_vecs), -1))
+        all_scores = q @ self._matrix.T
+        return [top_k(row, self._labels, k) for row in all_scores]
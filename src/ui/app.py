@@ -10,7 +10,7 @@ from src.ui.config import SessionConfig
 from src.ui.panels import banner, command_panel, ACCENT, _BOX, _BORDER
 from src.ui.streaming import stream_once
 from src.infra.checkpoint import (
-    load_last_thread, save_last_thread, get_recent_messages,
+    load_last_thread, save_last_thread, get_recent_messages, warm_thread,
 )
 
 load_dotenv()
@@ -20,7 +20,7 @@ _RESUME_MESSAGES = 6   # nombre de messages à afficher au démarrage
 
 
 def _show_resume(thread_id: str) -> None:
-    """Affiche les derniers messages du thread repris."""
+    """Affiche les derniers messages du thread repris (thread_meta.tail, sans décoder le checkpoint)."""
     messages = get_recent_messages(thread_id, n=_RESUME_MESSAGES)
     if not messages:
         return
@@ -62,6 +62,16 @@ def run_cli():
     last = load_last_thread()
     if last:
         cfg.thread_id = last
+        # L'état complet se décode pendant que l'utilisateur tape son premier message
+        warm_thread(last)
+
+    # Rétention de memory.db (au plus une fois par intervalle, hors chemin critique)
+    from src.infra import retention
+    retention.maybe_run_in_background(cfg.thread_id)
+
+    # Index des noms de fichiers : rechargé depuis le disque puis tenu à jour en fond
+    from src.infra.file_index import file_index
+    file_index.start()
 
     console.clear()
     console.print(banner())
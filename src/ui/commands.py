@@ -5,6 +5,7 @@ from rich.panel import Panel
 from .panels import config_table, command_panel, banner, _BOX
 from .transcript import save_transcript
 from .config import SessionConfig
+from src.llm import pool as llm_pool
 
 debug_state = {"enabled": False}
 
@@ -20,6 +21,7 @@ _COMMANDS = [
     ("/clear",             "efface l'écran et réaffiche l'en-tête"),
     ("/new",               "démarre un nouveau thread de conversation"),
     ("/history",           "liste les threads passés et permet d'en reprendre un (flèches ↑↓)"),
+    ("/history search <q>", "recherche plein texte dans tous les messages — threads classés par pertinence"),
     ("/help",              "affiche cette liste de commandes"),
     ("/backend <b>",       "change le backend LLM — groq · ollama · ollama_cloud · gemini"),
     ("/model <nom>",       "change le modèle du backend actif (ex: llama3.1:8b, openai/gpt-oss-20b)"),
@@ -32,6 +34,9 @@ _COMMANDS = [
     ("/mode <ask|auto>",   "mode d'édition — ask (valide fichier par fichier) ou auto (écrit sans confirmation)"),
     ("/branch",            "fork le thread actuel pour explorer une autre piste"),
     ("/debug",             "active/désactive le mode debug"),
+    ("/perf [export]",     "temps par phase du dernier tour + p50/p95 de la session — export : trace Chrome/JSONL"),
+    ("/usage [jours]",     "tokens et latences des appels LLM — par jour, par modèle et par thread (7 jours par défaut)"),
+    ("/db [stats|prune|vacuum|pin|unpin]", "taille de memory.db par thread — prune : applique la rétention · pin : protège le thread courant"),
     ("/dump",              "affiche tous les messages du thread"),
     ("q / exit",           "quitte Axon"),
     ("Ctrl+T",             "bascule le mode plan — l'IA planifie sans écrire"),
@@ -108,11 +113,51 @@ def _set_model(settings, model: str) -> None:
         settings.gemini_model = model
     else:
         settings.ollama_model = model
-
-
-def _handle_history(cfg: SessionConfig, state: dict, console) -> None:
-    """Picker flèches pour naviguer dans les threads passés."""
-    from src.infra.checkpoint import list_threads, save_last_thread, get_recent_messages
+    llm_pool.invalidate()
+
+
+_HISTORY_PAGE = 20   # threads par page dans /history
+
+
+def _branch_tree(threads: list[dict]) -> list[tuple[dict, int]]:
+    """Ordonne une page de threads en arbre : chaque branche juste sous son parent
+    (profondeur croissante), les racines dans l'ordre reçu. Une branche dont le
+    parent n'est pas sur la page reste à sa place, profondeur 0."""
+    on_page = {t["thread_id"] for t in threads}
+    children: dict[str, list[dict]] = {}
+    roots = []
+    for t in threads:
+        parent = t.get("parent")
+        if parent in on_page and parent != t["thread_id"]:
+            children.setdefault(parent, []).append(t)
+        else:
+            roots.append(t)
+    out: list[tuple[dict, int]] = []
+    seen: set[str] = set()
+
+    def _walk(t: dict, depth: int) -> None:
+        if t["thread_id"] in seen:
+            return
+        seen.add(t["thread_id"])
+        out.append((t, depth))
+        for child in children.get(t["thread_id"], []):
+            _walk(child, depth + 1)
+
+    for t in roots:
+        _walk(t, 0)
+    # Cycle parent ↔ enfant (ne devrait pas arriver) : rien ne disparaît de la page
+    for t in threads:
+        _walk(t, 0)
+    return out
+
+
+def _handle_history(cfg: SessionConfig, state: dict, console, query: str = ""):
+    """Picker flèches pour naviguer dans les threads passés — ou dans les résultats
+    d'une recherche plein texte si `query` est donné."""
+    import time
+    from src.infra.checkpoint import (
+        list_threads, count_threads, save_last_thread, get_recent_messages, search_threads, warm_thread,
+    )
     from prompt_toolkit import Application
     from prompt_toolkit.layout import Layout
     from prompt_toolkit.layout.containers import Window
@@ -131,13 +176,39 @@ def _handle_history(cfg: SessionConfig, state: dict, console) -> None:
         "hint":     "ansiyellow",
     })
 
-    threads = list_threads()
-
     # Entrée spéciale "nouveau thread" en tête de liste
     _NEW = "__new__"
-    entries = [_NEW] + [t["thread_id"] for t in threads]
-    thread_map = {t["thread_id"]: t for t in threads}
-
+    page = [0]
+    entries: list[str] = []
+    thread_map: dict[str, dict] = {}
+
+    if query:
+        t0 = time.perf_counter()
+        found = search_threads(query, limit=_HISTORY_PAGE)
+        search_ms = (time.perf_counter() - t0) * 1000
+        if not found:
+            return command_panel(f"aucun message ne correspond à « {query} » ({search_ms:.0f} ms)")
+        for t in found:
+            # Extrait du meilleur message à la place de l'aperçu
+            t["preview"] = t["snippet"]
+        pages = 1
+        entries[:] = [t["thread_id"] for t in found]
+        thread_map.update({t["thread_id"]: t for t in found})
+        heading = f"  « {query} » · {len(found)} thread{'s' if len(found) > 1 else ''} · {search_ms:.0f} ms\n\n"
+    else:
+        total = count_threads()
+        pages = max(1, -(-total // _HISTORY_PAGE))
+        heading = ""
+
+    def _load_page() -> None:
+        if query:
+            return
+        tree = _branch_tree(list_threads(limit=_HISTORY_PAGE, offset=page[0] * _HISTORY_PAGE))
+        entries[:] = [_NEW] + [t["thread_id"] for t, _ in tree]
+        thread_map.clear()
+        thread_map.update({t["thread_id"]: {**t, "depth": depth} for t, depth in tree})
+
+    _load_page()
     idx = [0]
     # Pré-sélectionne le thread actif
     try:
@@ -156,24 +227,41 @@ def _handle_history(cfg: SessionConfig, state: dict, console) -> None:
 
         t = thread_map.get(tid, {})
         updated  = t.get("updated_at", "")
+        count    = t.get("message_count", 0)
+        title    = t.get("title", "")
         preview  = t.get("preview", "")
         active   = " ★" if tid == cfg.thread_id else ""
         short_id = tid[:8] if len(tid) > 8 else tid
+        depth    = t.get("depth", 0)
+        indent   = "   " * (depth - 1) + "└─ " if depth else ""
 
         parts = []
-        parts.append((cls_a, f"{arrow}{short_id}{active}"))
+        parts.append((cls_a, f"{arrow}{indent}{short_id}{active}"))
+        if t.get("parent") and not depth:
+            # Branche dont le parent est sur une autre page
+            parts.append((cls_m, f"  ↳ {t['parent'][:8]}"))
         if updated:
             parts.append((cls_m, f"  {updated}"))
+        if count:
+            parts.append((cls_m, f"  · {count} msg"))
+        if t.get("hits"):
+            parts.append((cls_m, f"  · {t['hits']} résultat{'s' if t['hits'] > 1 else ''}"))
+        if title and title != preview:
+            parts.append((cls_a, f"  {title}"))
         parts.append(("", "\n"))
         if preview:
-            parts.append((cls_p, f"       {preview}\n"))
+            parts.append((cls_p, f"       {'   ' * depth}{preview}\n"))
         return parts
 
     def get_tokens():
-        parts: list = [("class:title", "  historique des conversations\n\n")]
+        pager = f"  ·  page {page[0] + 1}/{pages}" if pages > 1 else ""
+        title = heading or f"  historique des conversations{pager}\n\n"
+        parts: list = [("class:title", title)]
         for i, tid in enumerate(entries):
             parts.extend(_label(tid, i == idx[0]))
-        parts.append(("class:hint", "\n  ↑↓ · Entrée pour reprendre · Échap pour annuler"))
+        hint = "\n  ↑↓ · ←→ page · Entrée pour reprendre · Échap pour annuler" if pages > 1 else \
+            "\n  ↑↓ · Entrée pour reprendre · Échap pour annuler"
+        parts.append(("class:hint", hint))
         return parts
 
     kb = KeyBindings()
@@ -186,6 +274,22 @@ def _handle_history(cfg: SessionConfig, state: dict, console) -> None:
     @kb.add("s-tab")
     def _bwd(event): idx[0] = (idx[0] - 1) % len(entries)
 
+    @kb.add("right")
+    @kb.add("pagedown")
+    def _next(event):
+        if page[0] + 1 < pages:
+            page[0] += 1
+            _load_page()
+            idx[0] = 0
+
+    @kb.add("left")
+    @kb.add("pageup")
+    def _prev(event):
+        if page[0] > 0:
+            page[0] -= 1
+            _load_page()
+            idx[0] = 0
+
     @kb.add("enter")
     def _ok(event): event.app.exit(result=entries[idx[0]])
 
@@ -217,6 +321,7 @@ def _handle_history(cfg: SessionConfig, state: dict, console) -> None:
         cfg.thread_id = chosen
         state["messages"] = []
         save_last_thread(chosen)
+        warm_thread(chosen)
 
         # Affiche les derniers messages du thread repris
         if console:
@@ -245,6 +350,156 @@ def _handle_history(cfg: SessionConfig, state: dict, console) -> None:
     return command_panel(f"déjà sur ce thread : {chosen[:8]}")
 
 
+def _handle_perf(cmd: str):
+    """/perf — répartition du temps par phase (spans de src.infra.tracing)."""
+    from rich.table import Table
+    from rich import box
+    from src.infra.tracing import tracer
+
+    if cmd.split(maxsplit=1)[1:] == ["export"]:
+        if not tracer.turns():
+            return command_panel("aucun tour tracé pour l'instant")
+        chrome, jsonl = tracer.export()
+        return command_panel(f"trace : {chrome}  ·  {jsonl.name}  (chrome://tracing ou ui.perfetto.dev)")
+
+    summary = tracer.summary()
+    if not summary["turns"]:
+        return command_panel("aucun tour tracé pour l'instant")
+    tbl = Table(box=box.SIMPLE_HEAD, padding=(0, 2))
+    tbl.add_column("phase", style="color(214)", no_wrap=True)
+    for col in ("dernier tour", "spans", "p50", "p95"):
+        tbl.add_column(col, justify="right", style="dim", no_wrap=True)
+    for cat, p in sorted(summary["phases"].items(), key=lambda kv: -kv[1]["last_ms"]):
+        tbl.add_row(cat, f"{p['last_ms']:.0f} ms", str(p["count"]), f"{p['p50_ms']:.1f}", f"{p['p95_ms']:.1f}")
+    tbl.add_row(
+        "tour complet", f"{summary['last_turn_ms']:.0f} ms", str(summary["turns"]),
+        f"{summary['turn_p50_ms']:.0f}", f"{summary['turn_p95_ms']:.0f}", style="bold",
+    )
+    return Panel(tbl, box=_BOX, border_style="dim color(214)", title="perf", padding=(0, 1))
+
+
+def _fmt_ms(value) -> str:
+    return f"{value:.0f} ms" if value is not None else "—"
+
+
+def _usage_table(first: str, rows: list[dict], label):
+    from rich.table import Table
+    from rich import box
+    tbl = Table(box=box.SIMPLE_HEAD, padding=(0, 2))
+    tbl.add_column(first, style="color(214)", no_wrap=True)
+    for col in ("appels", "entrée", "sortie", "ttft", "latence", "tok/s"):
+        tbl.add_column(col, justify="right", style="dim", no_wrap=True)
+    for r in rows:
+        tps = r.get("tokens_per_s")
+        tbl.add_row(
+            label(r), str(r["calls"]), f"{r['input_tokens'] or 0:,}", f"{r['output_tokens'] or 0:,}",
+            _fmt_ms(r.get("ttft_ms")), _fmt_ms(r.get("latency_ms")), f"{tps:.0f}" if tps else "—",
+        )
+    return tbl
+
+
+def _handle_usage(cmd: str, cfg: SessionConfig):
+    """/usage — agrégats du journal des appels LLM (src.infra.usage_ledger)."""
+    from rich.console import Group
+    from rich.text import Text
+    from src.infra.usage_ledger import ledger
+
+    arg = cmd.split(maxsplit=1)[1:]
+    if arg and not arg[0].isdigit():
+        return command_panel("usage : /usage [jours]")
+    days = int(arg[0]) if arg else 7
+
+    by_day = ledger.by_day(days)
+    if not by_day:
+        return command_panel(f"aucun appel LLM enregistré sur {days} jour{'s' if days > 1 else ''}")
+    current = ledger.totals(cfg.thread_id)
+    return Panel(
+        Group(
+            _usage_table("jour", by_day, lambda r: r["day"]),
+            _usage_table("modèle", ledger.by_model(days), lambda r: f"{r['backend']} · {r['model'] or '?'}"),
+            _usage_table(
+                "thread", ledger.by_thread(),
+                lambda r: (r["thread_id"] or "—")[:8] + (" ←" if r["thread_id"] == cfg.thread_id else ""),
+            ),
+            Text(
+                f"  thread courant : {current.get('calls') or 0} appels · "
+                f"{current.get('input_tokens') or 0:,} ↑ · {current.get('output_tokens') or 0:,} ↓",
+                style="dim",
+            ),
+        ),
+        box=_BOX, border_style="dim color(214)", title=f"usage · {days} j", padding=(0, 1),
+    )
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("o", "Ko", "Mo"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} Go"
+
+
+def _handle_db(cmd: str, cfg: SessionConfig):
+    """/db — taille de memory.db et rétention (src.infra.retention)."""
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+    from rich import box
+    from src.infra import retention
+    from src.infra.blobs import blob_store
+
+    arg = (cmd.split(maxsplit=1)[1:] or ["stats"])[0]
+    if arg in ("pin", "unpin"):
+        if not retention.set_pinned(cfg.thread_id, arg == "pin"):
+            return command_panel("thread courant encore vide — rien à épingler")
+        return command_panel(f"thread {cfg.thread_id[:8]} {'épinglé' if arg == 'pin' else 'désépinglé'}")
+    if arg == "prune":
+        r = retention.run(cfg.thread_id)
+        return command_panel(
+            f"{r['checkpoints_deleted']} checkpoints · {len(r['threads_dropped'])} threads inactifs "
+            f"supprimés · {r['pages_freed']} pages rendues · {r['blobs_removed']} blobs "
+            f"({_fmt_bytes(r['blob_bytes_freed'])}) — {r['ms']:.0f} ms"
+        )
+    if arg == "vacuum":
+        before = retention.db_stats(limit=0)["file_bytes"]
+        retention.enable_incremental_vacuum()
+        after = retention.db_stats(limit=0)["file_bytes"]
+        return command_panel(f"memory.db compactée : {_fmt_bytes(before)} → {_fmt_bytes(after)}")
+    if arg != "stats":
+        return command_panel("usage : /db [stats|prune|vacuum|pin|unpin]")
+
+    stats = retention.db_stats()
+    tbl = Table(box=box.SIMPLE_HEAD, padding=(0, 2))
+    tbl.add_column("thread", style="color(214)", no_wrap=True)
+    for col in ("taille", "checkpoints", "modifié"):
+        tbl.add_column(col, justify="right", style="dim", no_wrap=True)
+    tbl.add_column("titre", style="dim", no_wrap=True, max_width=40)
+    for t in stats["threads"]:
+        label = t["thread_id"][:8] + (" 📌" if t["pinned"] else "") + (" ←" if t["thread_id"] == cfg.thread_id else "")
+        tbl.add_row(label, _fmt_bytes(t["bytes"]), str(t["checkpoints"]), t["updated_at"], t["title"])
+    p = retention.policy()
+    blob_store_stats = blob_store.stats()
+    last = retention.last_report()
+    lines = [
+        f"  fichier : {_fmt_bytes(stats['file_bytes'])} · {stats['thread_count']} threads · "
+        f"{stats['free_pages']}/{stats['pages']} pages libres · auto_vacuum {stats['auto_vacuum']}",
+        f"  blobs : {blob_store_stats['files']} · {_fmt_bytes(blob_store_stats['disk_bytes'])} "
+        f"({blob_store_stats['codec']}) · hydratés {blob_store_stats['hydrated']} · manquants {blob_store_stats['missing']}",
+        f"  rétention : {p['keep_checkpoints']} checkpoints/thread · threads inactifs > {p['idle_days']} j",
+    ]
+    if last:
+        lines.append(
+            f"  dernière passe ({last['at']}) : {last['checkpoints_deleted']} checkpoints · "
+            f"{len(last['threads_dropped'])} threads · {last['pages_freed']} pages"
+        )
+    if stats["auto_vacuum"] != "incremental":
+        lines.append("  /db vacuum pour activer le VACUUM incrémental sur cette base")
+    return Panel(
+        Group(tbl, Text("\n".join(lines), style="dim")),
+        box=_BOX, border_style="dim color(214)", title="memory.db", padding=(0, 1),
+    )
+
+
 def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=None):
     cmd = cmd.strip()
 
@@ -271,6 +526,12 @@ def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=
         save_last_thread(cfg.thread_id)
         return command_panel(f"nouveau thread : {cfg.thread_id}")
 
+    if cmd.startswith("/history search"):
+        query = cmd[len("/history search"):].strip()
+        if not query:
+            return command_panel("usage : /history search <texte>")
+        return _handle_history(cfg, state, console, query=query)
+
     if cmd == "/history":
         return _handle_history(cfg, state, console)
 
@@ -285,11 +546,13 @@ def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=
             if chosen is None:
                 return command_panel("annulé")
             settings.llm_backend = chosen
+            llm_pool.invalidate()
             return command_panel(f"backend : {chosen}")
         b = parts[1].strip().lower()
         if b not in _BACKENDS:
             return command_panel("backend invalide. options : groq · ollama · ollama_cloud · gemini", error=True)
         settings.llm_backend = b
+        llm_pool.invalidate()
         return command_panel(f"backend : {b}")
 
     if cmd.startswith("/model"):
@@ -313,6 +576,7 @@ def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=
         from src.infra.settings import settings
         try:
             settings.temperature = float(cmd.split(" ", 1)[1])
+            llm_pool.invalidate()
             return command_panel(f"température : {settings.temperature}")
         except ValueError:
             return command_panel("valeur invalide. exemple : /temp 0.2", error=True)
@@ -358,21 +622,16 @@ def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=
         return command_panel("mode invalide. options : ask · auto", error=True)
 
     if cmd == "/branch":
-        from src.infra.checkpoint import save_last_thread
+        from src.infra.checkpoint import branch_thread, save_last_thread
         old_thread = cfg.thread_id
         new_thread = str(uuid.uuid4())[:8]
 
-        # Copy current checkpoint state to the new thread
-        if graph:
-            try:
-                old_config = {"configurable": {"thread_id": old_thread}}
-                snapshot = graph.get_state(old_config)
-                msgs = snapshot.values.get("messages", []) if snapshot.values else []
-                if msgs:
-                    new_config = {"configurable": {"thread_id": new_thread}}
-                    graph.update_state(new_config, {"messages": msgs})
-            except Exception:
-                pass  # branch with empty state is still useful
+        # Copy-on-write : la branche pointe vers le dernier checkpoint du thread
+        # actuel, rien n'est recopié
+        try:
+            branch_thread(old_thread, new_thread)
+        except Exception:
+            pass  # branch with empty state is still useful
 
         cfg.thread_id = new_thread
         state["messages"] = []
@@ -395,6 +654,9 @@ def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=
                 t.append(p, style="dim")
                 console.print(t)
         restored = snapshots.restore_all()
+        if restored:
+            from src.infra.tools_cache import session_cache
+            session_cache.invalidate_paths(*restored)
         n = len(restored)
         return command_panel(f"{n} fichier{'s' if n > 1 else ''} restauré{'s' if n > 1 else ''}")
 
@@ -403,6 +665,15 @@ def handle_slash(cmd: str, state: dict, cfg: SessionConfig, graph=None, console=
         status = "on" if debug_state["enabled"] else "off"
         return command_panel(f"debug : {status}")
 
+    if cmd == "/perf" or cmd.startswith("/perf "):
+        return _handle_perf(cmd)
+
+    if cmd == "/usage" or cmd.startswith("/usage "):
+        return _handle_usage(cmd, cfg)
+
+    if cmd == "/db" or cmd.startswith("/db "):
+        return _handle_db(cmd, cfg)
+
     if cmd == "/dump":
         try:
             if graph:
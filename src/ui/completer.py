@@ -40,6 +40,9 @@ _COMMANDS: list[tuple[str, str]] = [
     ("/branch",       "fork le thread actuel pour explorer une autre piste"),
     ("/mode",         "mode d'édition — ask · auto"),
     ("/debug",        "active/désactive le mode debug"),
+    ("/perf",         "temps par phase du dernier tour · p50/p95 de la session"),
+    ("/usage",        "tokens et latences LLM par jour, modèle et thread"),
+    ("/db",           "taille de memory.db par thread · rétention"),
     ("/dump",         "affiche tous les messages du thread"),
 ]
 
@@ -47,6 +50,9 @@ _SUBCOMMANDS: dict[str, list[str]] = {
     "/backend": ["groq", "ollama", "ollama_cloud", "gemini"],
     "/lang":    ["fr", "en", "auto"],
     "/mode":    ["ask", "auto"],
+    "/perf":    ["export"],
+    "/history": ["search"],
+    "/db":      ["stats", "prune", "vacuum", "pin", "unpin"],
 }
 
 # ── Git file cache (refreshed every 5 s to avoid subprocess spam) ─────────────
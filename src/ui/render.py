@@ -4,6 +4,7 @@ from rich.panel import Panel
 from rich.markdown import Markdown
 from rich import box
 
+from src.infra.tracing import span, traced
 from .panels import final_panel, _BOX, _BORDER
 
 _DEBOUNCE = 0.03
@@ -12,15 +13,17 @@ _DEBOUNCE = 0.03
 def update_live_markdown(live: Live, text: str, debounce_state: dict, cursor: bool = True):
     now = time.time()
     if now - debounce_state.setdefault("last_update", 0.0) > debounce_state.get("DEBOUNCE", _DEBOUNCE):
-        live.update(Panel(
-            Markdown(text + ("▌" if cursor else "")),
-            box=_BOX,
-            border_style=_BORDER,
-            padding=(1, 2),
-        ))
+        with span("render.markdown", "render"):
+            live.update(Panel(
+                Markdown(text + ("▌" if cursor else "")),
+                box=_BOX,
+                border_style=_BORDER,
+                padding=(1, 2),
+            ))
         debounce_state["last_update"] = now
 
 
+@traced("render", "render.final")
 def finalize_live(live: Live, text: str, footer: str = ""):
     content = text + (f"\n\n[dim]{footer}[/dim]" if footer else "")
     live.update(final_panel(content))
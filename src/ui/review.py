@@ -196,7 +196,7 @@ def review_single_latest() -> Tuple[str, str | None]:
             p.parent.mkdir(parents=True, exist_ok=True)
             snapshots.save(change.path, change.original)  # save before overwriting
             p.write_text(change.proposed, encoding="utf-8")
-            session_cache.invalidate_filesystem()
+            session_cache.invalidate_paths(p)
             t = Text()
             t.append("  ✓  ", style="bold green")
             t.append(str(p), style="dim")
@@ -244,7 +244,7 @@ def auto_write_all(console_override=None) -> None:
             errors.append(f"{change.path}: {e}")
 
     if applied:
-        session_cache.invalidate_filesystem()
+        session_cache.invalidate_paths(*applied)
         t = Text()
         t.append("  ✓  ", style="bold green")
         t.append(
@@ -442,7 +442,7 @@ def review_pending() -> Tuple[str, str | None]:
             except Exception as e:
                 errors.append(f"{change.path}: {e}")
         if applied:
-            session_cache.invalidate_filesystem()
+            session_cache.invalidate_paths(*applied)
 
         t = Text()
         t.append("  ✓  ", style="bold green")
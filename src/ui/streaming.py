@@ -24,6 +24,7 @@ from .render import update_live_markdown, finalize_live
 from .commands import debug_state
 from .attachments import AttachmentStore, open_file_picker, get_clipboard_image, build_message_with_attachments
 from .completer import SlashCompleter
+from src.infra.tracing import tracer
 
 console = Console()
 _attachments = AttachmentStore()
@@ -152,7 +153,7 @@ def _attachment_hint() -> str:
 
 def _debug_prompt(state: dict, graph, cfg: SessionConfig):
     try:
-        from src.llm.prompts import build_system_prompt
+        from src.llm.prompts import build_system_prompt, last_system_prompt, prompt_stats
         from src.utils.tools import get_tool_names
 
         config = {"configurable": {"thread_id": cfg.thread_id}}
@@ -163,13 +164,73 @@ def _debug_prompt(state: dict, graph, cfg: SessionConfig):
         import os
         _user_name = os.getenv("USER_NAME", "l'utilisateur")
         _tool_list = get_tool_names()  # already a list
-        _prompt_preview = build_system_prompt(_tool_list, str(date.today()), _user_name)[:300]
+        _prompt_preview = (
+            last_system_prompt()
+            or build_system_prompt(_tool_list, str(date.today()), _user_name, record=False)
+        )[:300]
+        _pst = prompt_stats()
+        _prefix_str = (
+            f"préfixe identique {_pst['prefix_identical']}/{_pst['calls']} · "
+            f"memo {_pst['memo_hits']} · {_pst['prefix_chars']} car."
+        )
 
-        from src.orchestrator.graph import get_last_selected_tools
+        from src.orchestrator.graph import get_last_selected_tools, get_retrieval_stats
         _selected = get_last_selected_tools()
         _selected_str = ", ".join(_selected) if _selected else "—"
+        _rstats = get_retrieval_stats()
+        _qc = _rstats.get("query_cache", {})
+        _retrieval_str = (
+            f"dense {_rstats.get('dense', 0)} · lexical {_rstats.get('lexical_only', 0)} · "
+            f"timeouts {_rstats.get('timeouts', 0)} · cache {_qc.get('hits', 0)}/{_qc.get('hits', 0) + _qc.get('misses', 0)}"
+        ) if _rstats else "—"
+        from src.llm.pool import stats as _pool_stats
+        _ps = _pool_stats()
+        _pool_str = (
+            f"clients {_ps['client_hits']}/{_ps['client_hits'] + _ps['client_builds']} · "
+            f"bindés {_ps['bound_hits']}/{_ps['bound_hits'] + _ps['bound_builds']}"
+        )
+        from src.orchestrator.graph import get_last_tool_timings
+        _timings_str = " · ".join(
+            f"{t['name']} " + ("cache" if t["cached"] else f"{t['ms']:.0f}ms")
+            for t in get_last_tool_timings()
+        ) or "—"
+        from src.orchestrator.compactor import compactor as _compactor
+        _cs = _compactor.stats()
+        _compact_str = (
+            f"arrière-plan {_cs['completed']}/{_cs['started']} · en cours {_cs['running']} · "
+            f"swaps {_cs['swaps']} · bloquantes {_cs['fallbacks']}"
+        )
+        from src.infra.tools_cache import session_cache as _tool_cache
+        _tc = _tool_cache.stats()
+        _tool_cache_str = (
+            f"hit {_tc['hit_ratio']:.0%} (disque {_tc['disk_hits']} · normalisés {_tc['normalized_hits']}) · "
+            f"{_tc['bytes'] // 1024} Ko mémoire · {_tc['disk_bytes'] // 1024} Ko disque · "
+            f"évictions {_tc['evictions']} · périmés servis {_tc['stale_served']} "
+            f"(rafraîchis {_tc['refreshes']})"
+        )
+        from src.infra.prefetch import prefetcher as _prefetcher
+        _pf = _prefetcher.stats()
+        _prefetch_str = (
+            f"jobs {_pf['completed']}/{_pf['started']} · annulés {_pf['cancelled']} · "
+            f"{_pf['entries']} entrées · {_pf['bytes'] // 1024} Ko"
+        )
+        from src.infra.checkpoint import _checkpointer
+        _ck = _checkpointer.stats()
+        _checkpoint_str = (
+            f"{_ck['written']} écritures en {_ck['batches']} lots (max {_ck['max_batch']}) · "
+            f"{_ck['write_ms']:.0f} ms writer · en file {_ck['pending']} · erreurs {_ck['errors']} · "
+            f"reprise préchargée {_ck['warm_hits']}/{_ck['warm_hits'] + _ck['warm_misses']}"
+        )
         parts = [
             f"[dim]tools sélectionnés :[/dim] {_selected_str}",
+            f"[dim]retrieval :[/dim] {_retrieval_str}",
+            f"[dim]pool llm :[/dim] {_pool_str}",
+            f"[dim]prompt :[/dim] {_prefix_str}",
+            f"[dim]compaction :[/dim] {_compact_str}",
+            f"[dim]derniers outils :[/dim] {_timings_str}",
+            f"[dim]cache outils :[/dim] {_tool_cache_str}",
+            f"[dim]préchargement :[/dim] {_prefetch_str}",
+            f"[dim]checkpoints :[/dim] {_checkpoint_str}",
             f"[dim]system:[/dim] {_prompt_preview}...",
         ]
         for m in messages:
@@ -1294,13 +1355,14 @@ def stream_once(graph, state: dict, cfg: SessionConfig) -> None:
     current_state = {"messages": [message_dict]}
 
     config = {"configurable": {"thread_id": cfg.thread_id}}
+    tracer.begin_turn(user_message)
 
     if cfg.debug:
         _debug_prompt(state, graph, cfg)
 
     from src.ui.edit_mode import get_mode
     from src.agents.coding.specialist import set_progress_callback
-    from src.orchestrator.graph import set_compile_callback
+    from src.orchestrator.graph import set_compile_callback, mark_first_token
 
     pending_refinements: list[str] = []
     stop_thinking = threading.Event()
@@ -1451,7 +1513,7 @@ def stream_once(graph, state: dict, cfg: SessionConfig) -> None:
                         p.parent.mkdir(parents=True, exist_ok=True)
                         snapshots.save(change.path, change.original)
                         p.write_text(change.proposed, encoding="utf-8")
-                        session_cache.invalidate_filesystem()
+                        session_cache.invalidate_paths(p)
                         t = Text()
                         t.append("  ✓  ", style="bold green")
                         t.append(str(p), style="dim")
@@ -1579,6 +1641,8 @@ def stream_once(graph, state: dict, cfg: SessionConfig) -> None:
                     )
                 else:
                     chunk_text = raw
+                if isinstance(msg, AIMessageChunk) and (chunk_text or getattr(msg, "tool_call_chunks", None)):
+                    mark_first_token()   # TTFT de chaque appel LLM, tool calls compris
                 if not chunk_text:
                     continue
                 if last_node == "tools":
@@ -1729,3 +1793,9 @@ def stream_once(graph, state: dict, cfg: SessionConfig) -> None:
 
     for refinement in pending_refinements:
         _stream_message(graph, refinement, cfg)
+    # Tour terminé : les checkpoints en file du writer sont écrits avant de rendre la main
+    from src.infra.checkpoint import flush as _flush_checkpoints
+    _ckpt_error = _flush_checkpoints()
+    if _ckpt_error is not None:
+        console.print(command_panel(f"checkpoint non enregistré : {_ckpt_error}", error=True))
+    tracer.end_turn()
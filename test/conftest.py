@@ -21,9 +21,59 @@ def reset_pending_changes():
 
 
 @pytest.fixture(autouse=True)
-def reset_session_cache():
-    """Reset the module-level session_cache between every test."""
+def reset_session_cache(tmp_path_factory, monkeypatch):
+    """Reset the module-level session_cache between every test, on a temporary disk tier."""
+    from src.infra.prefetch import prefetcher
     from src.infra.tools_cache import session_cache
+    prefetcher.cancel()          # a shell_cd in a previous test must not fill this one's cache
+    session_cache.close()
+    monkeypatch.setattr(session_cache, "path", tmp_path_factory.mktemp("cache") / "tool_cache.db")
     session_cache.clear()
     yield
     session_cache.clear()
+    session_cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolate_usage_ledger(tmp_path_factory, monkeypatch):
+    """Point the usage ledger at a temporary database so tests never touch ~/.axon."""
+    from src.infra.usage_ledger import ledger
+    ledger.close()
+    monkeypatch.setattr(ledger, "path", tmp_path_factory.mktemp("usage") / "usage.db")
+    yield
+    ledger.close()
+
+
+@pytest.fixture(autouse=True)
+def isolate_blob_store(tmp_path_factory, monkeypatch):
+    """Point the blob store at a temporary directory so tests never touch ~/.axon/blobs."""
+    from src.infra.blobs import blob_store
+    monkeypatch.setattr(blob_store, "root", tmp_path_factory.mktemp("blobs"))
+    blob_store.clear_cache()
+    yield
+    blob_store.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolate_file_index(tmp_path_factory, monkeypatch):
+    """Keep the file-name index unloaded and off ~/.axon so tools use fd / find unless a test says otherwise."""
+    from src.infra import file_index as fi
+    monkeypatch.setattr(fi, "file_index", fi.FileIndex(tmp_path_factory.mktemp("file_index") / "file_index.db"))
+    yield
+
+
+@pytest.fixture
+def checkpoint_db(tmp_path, monkeypatch):
+    """Point the checkpoint module at a temporary memory.db; yields the saver."""
+    import sqlite3
+    from src.infra import checkpoint as cp
+    path = tmp_path / "memory.db"
+    conn = cp.configure(sqlite3.connect(str(path), check_same_thread=False))
+    saver = cp._TracedSaver(conn)
+    monkeypatch.setattr(cp, "_DB_PATH", path)
+    monkeypatch.setattr(cp, "_conn", conn)
+    monkeypatch.setattr(cp, "_checkpointer", saver)
+    monkeypatch.setattr(cp, "_backfilled", False)
+    monkeypatch.setattr(cp, "_fts_backfilled", False)
+    yield saver
+    conn.close()
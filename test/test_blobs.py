@@ -0,0 +1,110 @@
+"""Tests for src/infra/blobs.py — offload/hydrate round trip, dedup, GC and retention wiring."""
+import os
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import START, MessagesState, StateGraph
+
+from src.infra import retention
+from src.infra.blobs import HANDLE_RE, blob_store, referenced
+
+_BIG = "".join(f"ligne {i} du fichier\n" for i in range(2_000))
+
+
+def _tool_msg(content, call_id="c1"):
+    return ToolMessage(content=content, tool_call_id=call_id, name="local_read_file", id=f"m-{call_id}")
+
+
+def test_large_message_becomes_handle_and_preview():
+    msg = blob_store.offload(_tool_msg(_BIG))
+    assert HANDLE_RE.match(msg.content)
+    assert "ligne 0 du fichier" in msg.content
+    assert len(msg.content) < 1_200
+    assert (msg.id, msg.tool_call_id, msg.name) == ("m-c1", "c1", "local_read_file")
+
+
+def test_small_and_non_tool_messages_untouched():
+    small = _tool_msg("court")
+    human = HumanMessage(_BIG)
+    assert blob_store.offload(small) is small
+    assert blob_store.offload(human) is human
+
+
+def test_hydrate_restores_full_content_and_keeps_ids():
+    msgs = [HumanMessage("lis"), blob_store.offload(_tool_msg(_BIG)), AIMessage("ok")]
+    blob_store.clear_cache()   # force une lecture disque
+    out = blob_store.hydrate(msgs)
+    assert out[1].content == _BIG
+    assert out[1].id == "m-c1"
+    assert out[0] is msgs[0] and out[2] is msgs[2]
+
+
+def test_identical_content_stored_once():
+    a = blob_store.offload(_tool_msg(_BIG, "c1"))
+    b = blob_store.offload(_tool_msg(_BIG, "c2"))
+    assert HANDLE_RE.match(a.content).group(1) == HANDLE_RE.match(b.content).group(1)
+    stats = blob_store.stats()
+    assert stats["files"] == 1 and stats["deduped"] == 1
+    assert stats["disk_bytes"] < len(_BIG) / 3
+
+
+def test_already_offloaded_message_not_wrapped_again():
+    once = blob_store.offload(_tool_msg(_BIG))
+    assert blob_store.offload(once) is once
+
+
+def test_missing_blob_keeps_preview():
+    msg = blob_store.offload(_tool_msg(_BIG))
+    blob_store.gc(set(), grace_s=0)
+    out = blob_store.hydrate([msg])[0]
+    assert out.content.startswith("ligne 0 du fichier")
+    assert out.content.endswith("[contenu complet indisponible]")
+    assert blob_store.stats()["missing"] == 1
+
+
+def test_gc_keeps_live_and_recent_blobs():
+    live = HANDLE_RE.match(blob_store.offload(_tool_msg(_BIG)).content).group(1)
+    dead = HANDLE_RE.match(blob_store.offload(_tool_msg(_BIG + "x")).content).group(1)
+    recent = HANDLE_RE.match(blob_store.offload(_tool_msg(_BIG + "y")).content).group(1)
+    old = time.time() - 7200
+    for path in blob_store.root.glob("*/*"):
+        if path.stem in (live, dead):
+            os.utime(path, (old, old))
+
+    removed, freed = blob_store.gc({live})
+
+    assert removed == 1 and freed > 0
+    assert {p.stem for p in blob_store.root.glob("*/*")} == {live, recent}
+
+
+
+def test_re_put_old_blob_survives_gc():
+    digest = blob_store.put(_BIG)
+    old = time.time() - 7200
+    for path in blob_store.root.glob("*/*"):
+        os.utime(path, (old, old))
+
+    assert blob_store.put(_BIG) == digest   # dedupe hit, checkpoint not written yet
+    assert blob_store.gc(live=set()) == (0, 0)
+    assert blob_store.get(digest) == _BIG
+
+def test_retention_collects_blobs_no_checkpoint_references(checkpoint_db):
+    g = StateGraph(MessagesState)
+    g.add_node("tool", lambda s: {"messages": [blob_store.offload(_tool_msg(_BIG, f"c{len(s['messages'])}"))]})
+    g.add_edge(START, "tool")
+    app = g.compile(checkpointer=checkpoint_db)
+    app.invoke({"messages": [HumanMessage("lis")]}, {"configurable": {"thread_id": "t1"}})
+    kept = HANDLE_RE.match(
+        app.get_state({"configurable": {"thread_id": "t1"}}).values["messages"][-1].content
+    ).group(1)
+    orphan = blob_store.put(_BIG + "orphelin")
+    old = time.time() - 7200
+    for path in blob_store.root.glob("*/*"):
+        os.utime(path, (old, old))
+
+    removed, _ = retention.collect_blobs()
+
+    assert removed == 1
+    assert blob_store.get(kept) is not None
+    blob_store.clear_cache()
+    assert blob_store.get(orphan) is None
@@ -0,0 +1,151 @@
+"""Tests for CachedToolNode — per-call cache hits, concurrent misses, call order."""
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import ToolException, tool
+
+from src.infra.settings import settings
+from src.infra.tools_cache import session_cache
+
+_calls: list[str] = []
+_lock = threading.Lock()
+
+
+def _record(name):
+    with _lock:
+        _calls.append(name)
+
+
+@tool("local_read_file")
+def fake_read(path: str) -> str:
+    """lit un fichier"""
+    _record(f"read:{path}")
+    time.sleep(0.2)
+    return f"contenu de {path}"
+
+
+@tool("web_research_report")
+def fake_web(query: str) -> str:
+    """recherche web"""
+    _record(f"web:{query}")
+    time.sleep(0.2)
+    return f"rapport {query}"
+
+
+@tool("git_add")
+def fake_add(paths: str) -> str:
+    """git add"""
+    _record(f"add:{paths}")
+    return "ok"
+
+
+@tool("local_grep")
+def fake_grep(pattern: str) -> str:
+    """grep"""
+    raise ToolException("boom")
+
+
+fake_grep.handle_tool_error = True
+
+
+@pytest.fixture
+def node(monkeypatch):
+    """Runs CachedToolNode inside a one-node graph (ToolNode needs the graph runtime)."""
+    from langgraph.graph import StateGraph, START
+    from src.orchestrator.graph import CachedToolNode
+    from src.orchestrator.state import GlobalState
+    monkeypatch.setattr(settings, "llm_backend", "ollama")   # no redaction
+    _calls.clear()
+    g = StateGraph(GlobalState)
+    g.add_node("tools", CachedToolNode([fake_read, fake_web, fake_add, fake_grep]))
+    g.add_edge(START, "tools")
+    graph = g.compile()
+
+    def _run(state):
+        out = graph.invoke(state)
+        return {"messages": out["messages"][len(state["messages"]):]}
+    return _run
+
+
+def _state(*calls):
+    tcs = [{"name": n, "args": a, "id": f"call{i}"} for i, (n, a) in enumerate(calls)]
+    return {"messages": [AIMessage(content="", tool_calls=tcs)]}
+
+
+def test_misses_run_concurrently_in_call_order(node):
+    state = _state(
+        ("web_research_report", {"query": "a"}),
+        ("web_research_report", {"query": "b"}),
+        ("web_research_report", {"query": "c"}),
+        ("local_read_file", {"path": "/proj/x.py"}),
+        ("local_read_file", {"path": "/proj/y.py"}),
+    )
+    t0 = time.perf_counter()
+    out = node(state)["messages"]
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 0.6          # 5 × 0.2 s sequentially
+    assert [m.tool_call_id for m in out] == [f"call{i}" for i in range(5)]
+    assert out[3].content == "contenu de /proj/x.py"
+
+
+def test_partial_hit_only_runs_misses(node):
+    session_cache.set("local_read_file", {"path": "/proj/x.py"}, "en cache")
+    out = node(_state(("local_read_file", {"path": "/proj/x.py"}), ("local_read_file", {"path": "/proj/y.py"})))["messages"]
+    assert _calls == ["read:/proj/y.py"]
+    assert [m.content for m in out] == ["en cache", "contenu de /proj/y.py"]
+
+
+def test_timings_recorded_per_call(node):
+    from src.orchestrator.graph import get_last_tool_timings
+    session_cache.set("local_read_file", {"path": "/proj/x.py"}, "en cache")
+    node(_state(("local_read_file", {"path": "/proj/x.py"}), ("web_research_report", {"query": "q"})))
+    timings = get_last_tool_timings()
+    assert [t["name"] for t in timings] == ["local_read_file", "web_research_report"]
+    assert timings[0]["cached"] is True and timings[1]["cached"] is False
+    assert timings[1]["ms"] >= 150
+
+
+def test_write_tool_is_a_barrier(node):
+    session_cache.set("git_status", {}, "stale")
+    node(_state(
+        ("local_read_file", {"path": "/proj/a"}),
+        ("git_add", {"paths": "."}),
+        ("local_read_file", {"path": "/proj/b"}),
+    ))
+    assert _calls.index("read:/proj/a") < _calls.index("add:.") < _calls.index("read:/proj/b")
+    assert session_cache.get("git_status", {}) is None   # invalidated by git_add
+
+
+def test_results_are_cached_for_next_batch(node):
+    node(_state(("local_read_file", {"path": "/proj/x.py"})))
+    node(_state(("local_read_file", {"path": "/proj/x.py"})))
+    assert _calls == ["read:/proj/x.py"]
+
+
+def test_tool_error_is_returned_not_cached(node):
+    out = node(_state(("local_grep", {"pattern": "x"}), ("local_read_file", {"path": "/proj/z"})))["messages"]
+    assert out[0].status == "error"
+    assert out[1].content == "contenu de /proj/z"
+    assert session_cache.get("local_grep", {"pattern": "x"}) is None
+
+
+def test_relative_path_runs_against_shell_cwd_and_shares_entry(node, monkeypatch, tmp_path):
+    from src.agents.shell import tools as shell_tools
+    monkeypatch.setattr(shell_tools, "_cwd", tmp_path)
+    node(_state(("local_read_file", {"path": "m.py"})))
+    node(_state(("local_read_file", {"path": str(tmp_path / "sub" / ".." / "m.py")})))
+    assert _calls == [f"read:{tmp_path / 'm.py'}"]
+    assert session_cache.stats()["normalized_hits"] == 1
+
+
+def test_large_result_offloaded_to_blob_store_but_cached_whole(node):
+    from src.infra.blobs import HANDLE_RE, blob_store
+    big = "ligne\n" * 5_000
+    session_cache.set("local_read_file", {"path": "/proj/big.txt"}, big)
+    out = node(_state(("local_read_file", {"path": "/proj/big.txt"})))["messages"]
+    digest = HANDLE_RE.match(out[0].content).group(1)
+    assert len(out[0].content) < 2_000
+    assert blob_store.get(digest) == big
+    assert session_cache.get("local_read_file", {"path": "/proj/big.txt"}) == big
@@ -0,0 +1,396 @@
+"""Tests for src/infra/checkpoint.py — thread_meta side table, paginated listing and the async writer."""
+import sqlite3
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import START, MessagesState, StateGraph
+
+from src.infra import checkpoint as cp
+
+
+def _graph(saver):
+    g = StateGraph(MessagesState)
+    g.add_node("bot", lambda s: {"messages": [AIMessage(f"réponse {len(s['messages'])}")]})
+    g.add_edge(START, "bot")
+    return g.compile(checkpointer=saver)
+
+
+def _say(app, thread_id, text):
+    app.invoke({"messages": [HumanMessage(text)]}, {"configurable": {"thread_id": thread_id}})
+
+
+def test_meta_maintained_on_checkpoint_writes(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "a", "premier sujet")
+    _say(app, "a", "deuxième question\nsur deux lignes")
+    [t] = cp.list_threads()
+    assert t["thread_id"] == "a"
+    assert t["title"] == "premier sujet"
+    assert t["preview"] == "deuxième question sur deux lignes"
+    assert t["message_count"] == 4
+    assert t["created_at"] and t["updated_at"]
+
+
+def test_listing_is_most_recent_first_and_paginated(checkpoint_db):
+    app = _graph(checkpoint_db)
+    for tid in ("a", "b", "c"):
+        _say(app, tid, f"sujet {tid}")
+    _say(app, "a", "relance")
+    assert [t["thread_id"] for t in cp.list_threads()] == ["a", "c", "b"]
+    assert [t["thread_id"] for t in cp.list_threads(limit=2, offset=1)] == ["c", "b"]
+    assert cp.count_threads() == 3
+
+
+def test_listing_does_not_deserialize_checkpoints(checkpoint_db, monkeypatch):
+    app = _graph(checkpoint_db)
+    _say(app, "a", "bonjour")
+    cp.list_threads()                       # backfill pass done once
+    monkeypatch.setattr(checkpoint_db, "get_tuple", lambda *a, **k: pytest.fail("checkpoint read"))
+    assert cp.list_threads()[0]["preview"] == "bonjour"
+
+
+def test_threads_written_before_meta_are_backfilled(checkpoint_db):
+    legacy = _graph(SqliteSaver(checkpoint_db.conn))
+    _say(legacy, "old", "ancienne conversation")
+    assert cp.list_threads()[0]["title"] == "ancienne conversation"
+    assert cp.list_threads()[0]["message_count"] == 2
+
+
+def test_compaction_summary_is_not_used_as_preview():
+    from src.orchestrator.compactor import summary_message
+    msgs = [summary_message("résumé"), AIMessage("ok")]
+    assert cp._last_human_preview(msgs) == ""
+    assert cp._first_human_title([summary_message("résumé"), HumanMessage("vraie question")]) == "vraie question"
+
+
+# ── Writer asynchrone ─────────────────────────────────────────────────────────
+
+@pytest.fixture
+def async_saver(tmp_path):
+    conn = cp.configure(sqlite3.connect(str(tmp_path / "memory.db"), check_same_thread=False))
+    saver = cp._TracedSaver(conn, async_writes=True)
+    yield saver
+    saver.flush()
+    conn.close()
+
+
+def test_connection_uses_wal(async_saver):
+    assert async_saver.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert async_saver.conn.execute("PRAGMA synchronous").fetchone()[0] == 1   # NORMAL
+
+
+def test_async_writes_are_readable_and_durable_after_flush(async_saver, tmp_path):
+    app = _graph(async_saver)
+    _say(app, "t1", "bonjour")
+    _say(app, "t1", "encore")
+    # Lecture sans flush explicite : get_tuple attend la file
+    assert len(app.get_state({"configurable": {"thread_id": "t1"}}).values["messages"]) == 4
+
+    async_saver.flush()
+    other = sqlite3.connect(str(tmp_path / "memory.db"))
+    assert other.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = 't1'").fetchone()[0] > 0
+    assert other.execute("SELECT message_count FROM thread_meta WHERE thread_id = 't1'").fetchone()[0] == 4
+    other.close()
+    assert async_saver.stats()["pending"] == 0
+
+
+def test_puts_queued_while_writer_busy_are_batched(async_saver):
+    app = _graph(async_saver)
+    _say(app, "warmup", "x")
+    with async_saver.lock:   # le writer bloque sur son premier lot, la file s'accumule
+        worker = threading.Thread(target=lambda: [_say(app, f"t{i}", "x") for i in range(3)])
+        worker.start()
+        worker.join(timeout=0.5)
+    worker.join()
+    async_saver.flush()
+    stats = async_saver.stats()
+    assert stats["max_batch"] > 1
+    assert stats["batches"] < stats["written"]
+
+
+def test_writer_error_surfaces_on_flush(async_saver, monkeypatch):
+    def _boom(*a, **k):
+        raise sqlite3.OperationalError("disk full")
+    monkeypatch.setattr(async_saver, "_put_now", _boom)
+    _graph(async_saver).invoke({"messages": [HumanMessage("x")]}, {"configurable": {"thread_id": "t"}})
+    with pytest.raises(sqlite3.OperationalError):
+        async_saver.flush()
+    assert async_saver.stats()["errors"] > 0
+    async_saver.flush()   # erreur relevée une seule fois
+
+
+def test_writer_error_does_not_break_reads(async_saver, monkeypatch):
+    app = _graph(async_saver)
+    _say(app, "ok", "bonjour")
+    real = async_saver._put_now
+    monkeypatch.setattr(async_saver, "_put_now", lambda *a, **k: (_ for _ in ()).throw(sqlite3.OperationalError("disk full")))
+    _say(app, "t", "x")
+    monkeypatch.setattr(async_saver, "_put_now", real)
+    assert len(app.get_state({"configurable": {"thread_id": "ok"}}).values["messages"]) == 2
+    assert async_saver.stats()["errors"] > 0
+    with pytest.raises(sqlite3.OperationalError):
+        async_saver.flush()   # relevée en fin de tour, pas dans get_state
+
+
+def test_batch_is_atomic_against_other_cursors(async_saver, monkeypatch):
+    committed_during_put = []
+    others = []
+
+    def _commit_other(done):
+        with async_saver.cursor() as cur:
+            cur.execute("SELECT 1")
+        done.set()
+
+    def _put_with_concurrent_commit(*args):
+        # Un autre thread veut commiter pendant le lot : il attend la fin du lot
+        done = threading.Event()
+        t = threading.Thread(target=_commit_other, args=(done,))
+        t.start()
+        others.append(t)
+        result = orig(*args)
+        committed_during_put.append(done.wait(0.1))
+        return result
+
+    orig = async_saver._put_now
+    monkeypatch.setattr(async_saver, "_put_now", _put_with_concurrent_commit)
+    _say(_graph(async_saver), "t", "x")
+    async_saver.flush()
+    for t in others:
+        t.join(2)
+    assert committed_during_put and not any(committed_during_put)
+    assert not any(t.is_alive() for t in others)
+
+
+# ── Recherche plein texte ─────────────────────────────────────────────────────
+
+def test_search_ranks_threads_with_snippets(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "jira", "le ticket PROJ-4821 plante au démarrage")
+    _say(app, "jira", "PROJ-4821 : la stack trace pointe vers le parser")
+    _say(app, "autre", "recette des crêpes")
+    _say(app, "vague", "on reparlera de PROJ-4821 plus tard")
+
+    results = cp.search_threads("PROJ-4821")
+
+    assert [r["thread_id"] for r in results][:1] == ["jira"]
+    assert {r["thread_id"] for r in results} == {"jira", "vague"}
+    assert results[0]["hits"] == 2
+    assert "[PROJ-4821]" in results[0]["snippet"]
+    assert results[0]["title"] == "le ticket PROJ-4821 plante au démarrage"
+
+
+def test_search_ignores_accents_and_matches_prefix(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "t", "problème de déploiement kubernetes")
+    assert cp.search_threads("deploiement")[0]["thread_id"] == "t"
+    assert cp.search_threads("kuber")[0]["thread_id"] == "t"
+    assert cp.search_threads('"; DROP TABLE --') == []
+
+
+def test_index_is_incremental_and_covers_ai_and_tool_text(checkpoint_db):
+    from langchain_core.messages import ToolMessage
+    app = _graph(checkpoint_db)
+    _say(app, "t", "bonjour")
+    _say(app, "t", "encore")
+    with checkpoint_db.cursor(transaction=False) as cur:
+        assert cur.execute("SELECT COUNT(*) FROM message_fts").fetchone()[0] == 4
+    app.update_state(
+        {"configurable": {"thread_id": "t"}},
+        {"messages": [ToolMessage("sortie de pytest : 3 failed", tool_call_id="c", name="shell_run")]},
+    )
+    assert cp.search_threads("failed")[0]["role"] == "tool"
+    assert cp.search_threads("réponse")[0]["role"] == "ai"
+
+
+def test_deleted_thread_leaves_index(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "t", "message unique zanzibar")
+    checkpoint_db.delete_thread("t")
+    assert cp.search_threads("zanzibar") == []
+
+
+def test_threads_written_before_fts_are_backfilled(checkpoint_db):
+    legacy = _graph(SqliteSaver(checkpoint_db.conn))
+    _say(legacy, "old", "ancienne conversation sur tartempion")
+    assert cp.search_threads("tartempion")[0]["thread_id"] == "old"
+
+
+def test_search_is_fast_on_tens_of_thousands_of_messages(checkpoint_db, monkeypatch):
+    import time
+    words = ["docker", "parser", "ticket", "migration", "cache", "retry", "timeout", "index"]
+    with checkpoint_db.cursor() as cur:
+        cur.executemany(
+            "INSERT INTO message_fts (thread_id, role, text) VALUES (?, ?, ?)",
+            [(f"t{i % 500}", "human", f"{words[i % 8]} {words[(i * 3) % 8]} message {i}") for i in range(30_000)],
+        )
+        cur.execute("INSERT INTO message_fts (thread_id, role, text) VALUES ('cible', 'human', 'ticket OPS-77 timeout')")
+    monkeypatch.setattr(cp, "_fts_backfilled", True)
+    t0 = time.perf_counter()
+    results = cp.search_threads("OPS-77")
+    assert (time.perf_counter() - t0) < 0.1
+    assert results[0]["thread_id"] == "cible"
+
+
+# ── Reprise paresseuse ────────────────────────────────────────────────────────
+
+def test_recent_messages_read_from_tail_without_decoding(checkpoint_db, monkeypatch):
+    app = _graph(checkpoint_db)
+    for i in range(6):
+        _say(app, "t", f"question {i}")
+    monkeypatch.setattr(checkpoint_db, "get_tuple", lambda *a, **k: pytest.fail("checkpoint read"))
+    recent = cp.get_recent_messages("t", n=4)
+    assert [m["content"] for m in recent] == ["question 4", "réponse 9", "question 5", "réponse 11"]
+    assert recent[0]["role"] == "human" and recent[1]["role"] == "ai"
+
+
+def test_legacy_row_without_tail_falls_back_and_heals(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "t", "bonjour")
+    with checkpoint_db.cursor() as cur:
+        cur.execute("UPDATE thread_meta SET tail = '' WHERE thread_id = 't'")
+    assert [m["content"] for m in cp.get_recent_messages("t")] == ["bonjour", "réponse 1"]
+    with checkpoint_db.cursor(transaction=False) as cur:
+        assert cur.execute("SELECT tail FROM thread_meta WHERE thread_id = 't'").fetchone()[0] != ""
+
+
+def test_warmed_checkpoint_is_used_by_first_invocation(checkpoint_db, monkeypatch):
+    app = _graph(checkpoint_db)
+    _say(app, "t", "bonjour")
+    checkpoint_db.warm("t")
+    decoded = []
+    original = cp.SqliteSaver.get_tuple
+    monkeypatch.setattr(cp.SqliteSaver, "get_tuple", lambda self, c: decoded.append(c) or original(self, c))
+    checkpoint_db._warm["t"].result()
+    decoded.clear()
+
+    _say(app, "t", "encore")
+
+    assert checkpoint_db.stats()["warm_hits"] == 1
+    assert not [c for c in decoded if not c["configurable"].get("checkpoint_id")]
+    assert len(app.get_state({"configurable": {"thread_id": "t"}}).values["messages"]) == 4
+
+
+def test_warm_entry_dropped_when_thread_written(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "t", "bonjour")
+    checkpoint_db.warm("t")
+    checkpoint_db._warm["t"].result()
+    checkpoint_db.put_writes(
+        {"configurable": {"thread_id": "t", "checkpoint_ns": "", "checkpoint_id": "x"}}, [], "task",
+    )
+    assert "t" not in checkpoint_db._warm
+
+
+def _messages(app, thread_id):
+    return [m.content for m in app.get_state({"configurable": {"thread_id": thread_id}}).values["messages"]]
+
+
+def _rows(saver, thread_id):
+    with saver.cursor(transaction=False) as cur:
+        return cur.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+def test_branch_shares_parent_history_without_copying(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "main", "premier sujet")
+    _say(app, "main", "deuxième")
+
+    assert cp.branch_thread("main", "b1")
+
+    assert _rows(checkpoint_db, "b1") == 0
+    assert _messages(app, "b1") == _messages(app, "main")
+    branch = next(t for t in cp.list_threads() if t["thread_id"] == "b1")
+    assert branch["parent"] == "main" and branch["title"] == "premier sujet"
+
+
+def test_branch_and_parent_diverge_after_fork(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "main", "tronc commun")
+    cp.branch_thread("main", "b1")
+
+    _say(app, "b1", "piste B")
+    _say(app, "main", "piste A")
+
+    assert _messages(app, "b1") == ["tronc commun", "réponse 1", "piste B", "réponse 3"]
+    assert _messages(app, "main") == ["tronc commun", "réponse 1", "piste A", "réponse 3"]
+    # L'historique de la branche remonte dans celui du parent jusqu'au fork
+    history = list(app.get_state_history({"configurable": {"thread_id": "b1"}}))
+    assert history[-1].config["configurable"]["thread_id"] == "b1"
+    assert len(history) > _rows(checkpoint_db, "b1")
+
+
+def test_branch_of_branch_and_search_index_shared(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "main", "architecture hexagonale")
+    cp.branch_thread("main", "b1")
+    _say(app, "b1", "variante")
+    cp.branch_thread("b1", "b2")
+
+    assert _messages(app, "b2") == _messages(app, "b1")
+    _say(app, "b2", "encore")
+    with checkpoint_db.cursor(transaction=False) as cur:
+        indexed = cur.execute("SELECT COUNT(*) FROM message_fts WHERE thread_id = 'b2'").fetchone()[0]
+    assert indexed == 2   # seuls les messages propres à b2
+
+
+def test_deleting_parent_detaches_branches(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "main", "tronc commun")
+    cp.branch_thread("main", "b1")
+    cp.branch_thread("main", "b2")
+    _say(app, "b2", "suite de b2")
+    expected_b1, expected_b2 = _messages(app, "b1"), _messages(app, "b2")
+
+    checkpoint_db.delete_thread("main")
+
+    assert _messages(app, "b1") == expected_b1
+    assert _messages(app, "b2") == expected_b2
+    assert all(t["parent"] is None for t in cp.list_threads())
+    assert {t["thread_id"] for t in cp.search_threads("tronc")} == {"b1", "b2"}
+
+
+def test_prune_keeps_fork_checkpoint(checkpoint_db):
+    from src.infra import retention
+    app = _graph(checkpoint_db)
+    _say(app, "main", "tronc commun")
+    cp.branch_thread("main", "b1")
+    for i in range(5):
+        _say(app, "main", f"suite {i}")
+
+    retention.prune_checkpoints(1)
+
+    assert _messages(app, "b1") == ["tronc commun", "réponse 1"]
+
+
+def test_branch_of_empty_thread(checkpoint_db):
+    assert not cp.branch_thread("nothing-yet", "b1")
+
+
+def test_branch_command_forks_current_thread(checkpoint_db):
+    from src.ui.commands import handle_slash
+    from src.ui.config import SessionConfig
+    app = _graph(checkpoint_db)
+    cfg = SessionConfig()
+    cfg.thread_id = "main"
+    _say(app, "main", "bonjour")
+
+    handle_slash("/branch", {"messages": []}, cfg, graph=app)
+
+    assert cfg.thread_id != "main"
+    assert _rows(checkpoint_db, cfg.thread_id) == 0
+    assert _messages(app, cfg.thread_id) == ["bonjour", "réponse 1"]
+
+
+def test_history_tree_puts_branches_under_parent():
+    from src.ui.commands import _branch_tree
+    threads = [
+        {"thread_id": "b2", "parent": "b1"},
+        {"thread_id": "other", "parent": None},
+        {"thread_id": "b1", "parent": "main"},
+        {"thread_id": "main", "parent": None},
+        {"thread_id": "orphan", "parent": "gone"},
+    ]
+    tree = [(t["thread_id"], depth) for t, depth in _branch_tree(threads)]
+    assert tree == [("other", 0), ("main", 0), ("b1", 1), ("b2", 2), ("orphan", 0)]
@@ -0,0 +1,19 @@
+"""Tests for src/infra/checkpoint_bench.py — small offline runs of both configurations."""
+import pytest
+
+from src.infra.checkpoint_bench import run_benchmark
+
+
+@pytest.mark.parametrize("mode", ["avant", "après"])
+def test_benchmark_reports_percentiles(mode, tmp_path):
+    report = run_benchmark(mode, turns=2, steps=3, msg_bytes=100, directory=tmp_path)
+    assert report["mode"] == mode
+    assert report["put_p95_ms"] >= report["put_p50_ms"] > 0
+    assert report["turn_p50_ms"] > 0
+    assert (report["batches"] > 0) == (mode == "après")
+    assert not list(tmp_path.iterdir())
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        run_benchmark("plus-vite")
@@ -0,0 +1,126 @@
+"""Tests for src/orchestrator/compactor.py — background rolling compaction."""
+import threading
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph.message import add_messages
+
+from src.orchestrator import compactor as cp
+
+
+def _round(i, tool=True):
+    msgs = [HumanMessage(f"question {i}", id=f"h{i}")]
+    if tool:
+        msgs.append(AIMessage("", id=f"c{i}", tool_calls=[{"name": "git_status", "args": {}, "id": f"t{i}"}]))
+        msgs.append(ToolMessage(f"résultat {i}", tool_call_id=f"t{i}", name="git_status", id=f"r{i}"))
+    msgs.append(AIMessage(f"réponse {i}", id=f"a{i}"))
+    return msgs
+
+
+def _history(n):
+    out = []
+    for i in range(n):
+        out += _round(i)
+    return out
+
+
+class _LLM:
+    def __init__(self, gate=None):
+        self.prompts = []
+        self.gate = gate
+
+    def invoke(self, messages):
+        if self.gate:
+            self.gate.wait(2)
+        self.prompts.append(messages[0].content)
+        return AIMessage(f"résumé #{len(self.prompts)}")
+
+
+def _start(comp, msgs, llm, rolling=None, used=100, budget=100):
+    return comp.maybe_start(
+        "t", msgs, used_tokens=used, budget=budget,
+        count_tokens=lambda ms: 10_000, llm_factory=lambda: llm, rolling=rolling,
+    )
+
+
+def test_closed_segments_exclude_current_round():
+    segs = cp.closed_segments([SystemMessage("sys")] + _history(3) + [HumanMessage("en cours", id="h9")])
+    assert [s[0].id for s in segs] == ["h0", "h1", "h2"]
+    assert [m.id for m in segs[0]] == ["h0", "c0", "r0", "a0"]
+
+
+def test_below_soft_threshold_does_nothing():
+    comp = cp.RollingCompactor()
+    assert not _start(comp, _history(4), _LLM(), used=50)
+
+
+def test_summarizes_oldest_closed_rounds_in_background():
+    comp = cp.RollingCompactor()
+    llm = _LLM()
+    msgs = _history(4)   # h3 is the current round, h2 stays raw
+    assert _start(comp, msgs, llm)
+    summary, upto = comp.wait("t", 2)
+    assert summary == "résumé #1"
+    assert upto == "a1"
+    assert "question 0" in llm.prompts[0] and "question 2" not in llm.prompts[0]
+
+
+def test_one_job_at_a_time_per_thread():
+    gate = threading.Event()
+    comp = cp.RollingCompactor()
+    assert _start(comp, _history(4), _LLM(gate))
+    assert not _start(comp, _history(4), _LLM())
+    gate.set()
+    assert comp.wait("t", 2) is not None
+    assert comp.stats()["started"] == 1
+
+
+def test_rolling_summary_extended_with_new_rounds_only():
+    comp = cp.RollingCompactor()
+    llm = _LLM()
+    assert _start(comp, _history(6), llm, rolling=("ancien résumé", "a1"))
+    comp.wait("t", 2)
+    prompt = llm.prompts[0]
+    assert "ancien résumé" in prompt
+    assert "question 2" in prompt and "question 3" in prompt
+    assert "question 1" not in prompt
+
+
+def test_nothing_new_to_summarize():
+    comp = cp.RollingCompactor()
+    assert not _start(comp, _history(4), _LLM(), rolling=("résumé", "a1"))
+
+
+def test_failed_job_is_counted():
+    class _Boom:
+        def invoke(self, messages):
+            raise RuntimeError("down")
+
+    comp = cp.RollingCompactor()
+    _start(comp, _history(4), _Boom())
+    assert comp.wait("t", 2) is None
+    assert comp.stats()["failed"] == 1
+
+
+def test_apply_summary_replaces_covered_messages_in_place():
+    history = _history(4)
+    working, updates = cp.apply_summary([SystemMessage("sys")] + history, "résumé", "a1")
+    assert isinstance(working[0], SystemMessage)
+    assert cp.is_summary(working[1])
+    assert working[2].id == "h2"
+
+    persisted = add_messages(history, updates)
+    assert cp.is_summary(persisted[0])
+    assert [m.id for m in persisted[1:]] == [m.id for m in history if m.id[1:] in ("2", "3")]
+
+
+def test_apply_summary_with_unknown_upto_returns_none():
+    assert cp.apply_summary(_history(2), "résumé", "gone") is None
+
+
+def test_previous_summary_message_feeds_next_job():
+    comp = cp.RollingCompactor()
+    llm = _LLM()
+    msgs = [cp.summary_message("vieux résumé", "s0")] + _history(4)
+    _start(comp, msgs, llm)
+    comp.wait("t", 2)
+    assert "vieux résumé" in llm.prompts[0]
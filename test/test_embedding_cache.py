@@ -0,0 +1,171 @@
+"""Tests for src/infra/embedding_cache.py — EmbeddingIndex, QueryCache, CachedEmbeddings."""
+import numpy as np
+import pytest
+
+from langchain_core.embeddings import Embeddings
+
+from src.infra.embedding_cache import CachedEmbeddings, EmbeddingIndex, content_key
+
+
+class _CountingEmbeddings(Embeddings):
+    """Deterministic fake embedder that records every text it embeds."""
+
+    def __init__(self, dim: int = 4):
+        self.dim = dim
+        self.seen: list[str] = []
+
+    def _vec(self, text: str) -> list[float]:
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0, float(self.dim)]
+
+    def embed_documents(self, texts):
+        self.seen.extend(texts)
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vec(text)
+
+
+# ── content_key ───────────────────────────────────────────────────────────────
+
+def test_content_key_depends_on_model_and_text():
+    assert content_key("m1", "abc") == content_key("m1", "abc")
+    assert content_key("m1", "abc") != content_key("m2", "abc")
+    assert content_key("m1", "abc") != content_key("m1", "abd")
+
+
+# ── EmbeddingIndex.sync ───────────────────────────────────────────────────────
+
+def test_sync_embeds_everything_on_first_run(tmp_path):
+    emb = _CountingEmbeddings()
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    matrix = index.sync(["a", "bb", "ccc"], emb)
+    assert matrix.shape == (3, 4)
+    assert matrix.dtype == np.float32
+    assert emb.seen == ["a", "bb", "ccc"]
+    assert index.embedded == 3
+
+
+def test_sync_persists_and_reloads_without_embedding(tmp_path):
+    EmbeddingIndex("nomic", directory=tmp_path).sync(["a", "bb"], _CountingEmbeddings())
+
+    emb = _CountingEmbeddings()
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    assert index.loaded == 2
+    matrix = index.sync(["a", "bb"], emb)
+    assert emb.seen == []
+    assert matrix.shape == (2, 4)
+
+
+def test_sync_only_embeds_new_or_changed_texts(tmp_path):
+    EmbeddingIndex("nomic", directory=tmp_path).sync(["a", "bb"], _CountingEmbeddings())
+
+    emb = _CountingEmbeddings()
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    index.sync(["a", "bb changed", "new"], emb)
+    assert emb.seen == ["bb changed", "new"]
+
+
+def test_sync_prunes_removed_texts(tmp_path):
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    index.sync(["a", "bb", "ccc"], _CountingEmbeddings())
+    index.sync(["a"], _CountingEmbeddings())
+    assert len(index) == 1
+    assert EmbeddingIndex("nomic", directory=tmp_path).loaded == 1
+
+
+def test_sync_deduplicates_identical_texts(tmp_path):
+    emb = _CountingEmbeddings()
+    matrix = EmbeddingIndex("nomic", directory=tmp_path).sync(["x", "x", "y"], emb)
+    assert emb.seen == ["x", "y"]
+    assert matrix.shape == (3, 4)
+    assert np.array_equal(matrix[0], matrix[1])
+
+
+def test_model_change_reembeds(tmp_path):
+    EmbeddingIndex("nomic", directory=tmp_path).sync(["a"], _CountingEmbeddings())
+    emb = _CountingEmbeddings()
+    EmbeddingIndex("other-model", directory=tmp_path).sync(["a"], emb)
+    assert emb.seen == ["a"]
+
+
+def test_corrupted_file_is_ignored(tmp_path):
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    index.path.write_bytes(b"not a npz file")
+    emb = _CountingEmbeddings()
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    assert len(index) == 0
+    index.sync(["a"], emb)
+    assert emb.seen == ["a"]
+
+
+
+# ── QueryCache ────────────────────────────────────────────────────────────────
+
+def test_query_cache_hit_and_miss_counters():
+    from src.infra.embedding_cache import QueryCache
+    cache = QueryCache()
+    assert cache.get("q") is None
+    cache.put("q", [1.0, 2.0])
+    assert cache.get("q").tolist() == [1.0, 2.0]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_query_cache_evicts_least_recently_used():
+    from src.infra.embedding_cache import QueryCache
+    cache = QueryCache(maxsize=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")            # a becomes most recent
+    cache.put("c", [3.0])     # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert len(cache) == 2
+
+
+# ── CachedEmbeddings ──────────────────────────────────────────────────────────
+
+def test_cached_embeddings_documents_hit_index(tmp_path):
+    inner = _CountingEmbeddings()
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    index.sync(["a", "bb"], inner)
+    inner.seen.clear()
+
+    vectors = CachedEmbeddings(inner, index).embed_documents(["a", "bb"])
+    assert inner.seen == []
+    assert len(vectors) == 2
+
+
+def test_cached_embeddings_does_not_prune_index(tmp_path):
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    index.sync(["a", "bb"], _CountingEmbeddings())
+    CachedEmbeddings(_CountingEmbeddings(), index).embed_documents(["a"])
+    assert len(index) == 2
+
+
+def test_cached_embeddings_queries_use_lru_not_disk(tmp_path):
+    inner = _CountingEmbeddings()
+    index = EmbeddingIndex("nomic", directory=tmp_path)
+    cached = CachedEmbeddings(inner, index)
+    assert cached.embed_query("question") == pytest.approx(inner.embed_query("question"))
+    cached.embed_query("question")
+    assert inner.seen == ["question"]
+    assert len(index) == 0
+
+
+def test_cached_embeddings_batches_missing_queries(tmp_path):
+    from src.infra.embedding_cache import QueryCache
+    inner = _CountingEmbeddings()
+    queries = QueryCache()
+    cached = CachedEmbeddings(inner, EmbeddingIndex("nomic", directory=tmp_path), queries)
+    cached.embed_missing(["a"])
+    inner.seen.clear()
+
+    found, missing = cached.lookup(["a", "b", "b", "c"])
+    assert list(found) == ["a"] and missing == ["b", "c"]
+    assert set(cached.embed_missing(missing)) == {"b", "c"}
+    assert inner.seen == ["b", "c"]
+    assert len(queries) == 3
@@ -0,0 +1,202 @@
+"""Tests for src/infra/file_index.py — persistent file/dir name index and its use by the filesystem tools."""
+import os
+import time
+
+import pytest
+
+from src.infra import file_index as fi
+
+
+def _tree(root):
+    (root / "projets" / "axon").mkdir(parents=True)
+    (root / "projets" / "axon" / "rapport_2024.pdf").write_text("x")
+    (root / "Documents" / "CV").mkdir(parents=True)
+    (root / "Documents" / "CV" / "cv_final.pdf").write_text("x")
+    (root / "projets" / "axon" / "node_modules" / "lib").mkdir(parents=True)
+    (root / "projets" / "axon" / "node_modules" / "lib" / "rapport.js").write_text("x")
+    (root / "projets" / "axon" / "__pycache__").mkdir()
+    (root / "projets" / "axon" / "__pycache__" / "rapport.pyc").write_text("x")
+    return root
+
+
+def _bump(directory):
+    """Move a directory's mtime forward, as the filesystem does when an entry changes."""
+    st = os.stat(directory)
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def index(tmp_path):
+    root = _tree(tmp_path / "home")
+    idx = fi.FileIndex(tmp_path / "file_index.db", roots=[root])
+    idx.refresh()
+    return idx
+
+
+def _names(paths):
+    return sorted(os.path.basename(p) for p in paths)
+
+
+def test_finds_files_and_honors_excludes(index):
+    assert _names(index.find_files("rapport")) == ["rapport_2024.pdf"]
+    assert "__pycache__" in _names(index.find_dirs("pycache"))
+    assert index.find_dirs("node_modules") == []
+
+
+def test_skips_hidden_ignored_and_build_entries_like_fd(tmp_path):
+    home = tmp_path / "home"
+    proj = home / "proj"
+    (home / ".cache" / "x").mkdir(parents=True)
+    (home / ".cache" / "x" / "report_cache.bin").write_text("x")
+    (proj / "target" / "debug").mkdir(parents=True)
+    (proj / "target" / "debug" / "report.o").write_text("x")
+    (proj / "out").mkdir()
+    (proj / "out" / "report.html").write_text("x")
+    (proj / "report.md").write_text("x")
+    (proj / "report.log").write_text("x")
+    (proj / ".report.swp").write_text("x")
+    (proj / ".gitignore").write_text("# build\n*.log\n/out/\n")
+    idx = fi.FileIndex(tmp_path / "file_index.db", roots=[home])
+    idx.refresh()
+
+    assert _names(idx.find_files("report")) == ["report.md"]
+    assert _names(idx.find_dirs("target")) == ["target"]   # listé, pas parcouru
+    assert idx.find_dirs("cache") == []
+
+
+def test_new_ignore_file_refilters_subtree(index, tmp_path):
+    home = tmp_path / "home"
+    (home / "projets" / ".ignore").write_text("axon/\n")
+    _bump(home / "projets")
+    index.refresh()
+    assert index.find_files("rapport") == []
+    assert index.find_dirs("axon") == []
+
+
+def test_depth_limits_match_fd(tmp_path):
+    root = tmp_path / "r"
+    deep = root.joinpath(*[f"n{i}" for i in range(1, 11)])   # n1 … n10 : profondeurs 1 à 10
+    deep.mkdir(parents=True)
+    (root / "n1" / "n2" / "n3" / "n4" / "n5" / "n6" / "n7" / "n8" / "n9" / "f10.txt").write_text("x")
+    (deep / "f11.txt").write_text("x")
+    idx = fi.FileIndex(tmp_path / "file_index.db", roots=[root])
+    idx.refresh()
+    assert _names(idx.find_files("f1")) == ["f10.txt"]
+    assert {os.path.basename(p) for p in idx.find_dirs("n")} == {f"n{i}" for i in range(1, 9)}
+
+
+def test_exact_then_substring_then_subsequence(index, tmp_path):
+    (tmp_path / "home" / "cvtheque").mkdir()
+    index.refresh()
+    assert _names(index.find_dirs("cv")) == ["CV", "cvtheque"]
+    assert index.find_dirs("cv")[0].endswith("/CV")
+    assert _names(index.find_files("rprt")) == ["rapport_2024.pdf"]
+
+
+def test_base_restricts_results(index, tmp_path):
+    home = tmp_path / "home"
+    assert index.find_files("pdf", str(home / "Documents")) == [str((home / "Documents" / "CV" / "cv_final.pdf").resolve())]
+    assert index.find_files("pdf", str(tmp_path / "elsewhere")) is None
+
+
+def test_not_ready_returns_none(tmp_path):
+    idx = fi.FileIndex(tmp_path / "file_index.db", roots=[tmp_path])
+    assert idx.find_files("x") is None
+    assert idx.stats()["fallbacks"] == 1
+
+
+def test_refresh_only_rereads_changed_dirs(index, tmp_path):
+    home = tmp_path / "home"
+    before = index.stats()["rescanned"]
+    assert index.refresh()["changed"] == 0
+
+    (home / "Documents" / "lettre.odt").write_text("x")
+    (home / "Documents" / "Factures").mkdir()
+    (home / "Documents" / "Factures" / "facture_mars.pdf").write_text("x")
+    _bump(home / "Documents")
+    report = index.refresh()
+
+    assert index.stats()["rescanned"] == before + 1
+    assert report["changed"] == 2   # Documents relu + Factures parcouru
+    assert _names(index.find_files("facture")) == ["facture_mars.pdf"]
+    assert _names(index.find_files("lettre")) == ["lettre.odt"]
+
+
+def test_removed_directory_drops_its_subtree(index, tmp_path):
+    home = tmp_path / "home"
+    (home / "Documents" / "CV" / "cv_final.pdf").unlink()
+    (home / "Documents" / "CV").rmdir()
+    _bump(home / "Documents")
+    index.refresh()
+    assert index.find_files("cv_final") == []
+    assert index.find_dirs("CV") == []
+
+
+def test_index_persists_and_reloads_without_walking(index, tmp_path):
+    reloaded = fi.FileIndex(index.path, roots=[tmp_path / "home"])
+    assert reloaded.load()
+    assert reloaded.ready and reloaded.stats()["walked"] == 0
+    assert _names(reloaded.find_files("rapport")) == ["rapport_2024.pdf"]
+    assert reloaded.refresh()["changed"] == 0
+
+
+def test_query_is_fast_on_many_names(tmp_path):
+    idx = fi.FileIndex(tmp_path / "file_index.db", roots=[tmp_path])
+    idx._tree = {str(tmp_path / f"d{i}"): (0, 1, {f"fichier_{i}_{j}.txt": False for j in range(100)})
+                 for i in range(500)}
+    idx._snapshot()
+    (tmp_path / "d42").mkdir()
+    (tmp_path / "d42" / "fichier_42_7.txt").write_text("x")   # le meilleur candidat est vérifié sur disque
+    t0 = time.perf_counter()
+    found = idx.find_files("fichier_42_7")
+    elapsed = time.perf_counter() - t0
+    assert os.path.basename(found[0]) == "fichier_42_7.txt"
+    assert elapsed < 0.1
+
+
+def test_tools_use_index_when_ready(index, tmp_path, monkeypatch):
+    from src.agents.filesystem import tools
+    monkeypatch.setattr(fi, "file_index", index)
+    monkeypatch.setattr(tools, "_search_files", lambda *a: pytest.fail("fd / find called"))
+    monkeypatch.setattr(tools, "_search_dirs", lambda *a: pytest.fail("fd / find called"))
+    home = tmp_path / "home"
+
+    found = tools.local_find_file.invoke({"name": "rapport", "root": str(home)})
+    listed = tools.local_list_directory.invoke({"name": "cv"})
+
+    assert found["status"] == "ok"
+    assert found["matches"] == [{"path": str((home / "projets" / "axon" / "rapport_2024.pdf").resolve()),
+                                 "name": "rapport_2024.pdf", "ext": ".pdf", "size": "1B"}]
+    assert listed["status"] == "ok"
+    assert listed["path"].endswith("/CV")
+    assert [e["name"] for e in listed["entries"]] == ["cv_final.pdf"]
+
+
+def test_tools_fall_back_to_search_when_index_not_ready(tmp_path, monkeypatch):
+    from src.agents.filesystem import tools
+    f = tmp_path / "budget.xlsx"
+    f.write_text("x")
+    monkeypatch.setattr(tools, "_search_files", lambda needle, base: [str(f)])
+    assert tools.local_find_file.invoke({"name": "budget", "root": str(tmp_path)})["matches"][0]["path"] == str(f)
+
+
+def test_stale_top_candidate_falls_back(index, tmp_path):
+    (tmp_path / "home" / "projets" / "axon" / "rapport_2024.pdf").unlink()   # pas de refresh
+    assert index.find_files("rapport") is None
+    assert index.stats()["stale"] == 1
+
+
+def test_tools_fall_back_to_live_search_on_index_miss(index, tmp_path, monkeypatch):
+    from src.agents.filesystem import tools
+    monkeypatch.setattr(fi, "file_index", index)
+    fresh = tmp_path / "home" / "projets" / "notes_reunion.md"
+    fresh.write_text("x")                                  # créé après le dernier scan
+    (tmp_path / "home" / "Nouveau").mkdir()
+    monkeypatch.setattr(tools, "_search_files", lambda needle, base: [str(fresh)])
+    monkeypatch.setattr(tools, "_search_dirs", lambda needle: [str(tmp_path / "home" / "Nouveau")])
+
+    found = tools.local_find_file.invoke({"name": "notes_reunion", "root": str(tmp_path / "home")})
+    listed = tools.local_list_directory.invoke({"name": "Nouveau"})
+
+    assert found["matches"][0]["path"] == str(fresh)
+    assert listed["path"] == str(tmp_path / "home" / "Nouveau")
@@ -0,0 +1,102 @@
+"""Tests for src/llm/pool.py — fake factories, no network."""
+import threading
+
+import pytest
+
+from src.infra.settings import settings
+from src.llm import models
+from src.llm import pool
+
+
+class _FakeLLM:
+    def __init__(self):
+        self.bind_calls = 0
+
+    def bind_tools(self, tools):
+        self.bind_calls += 1
+        return ("bound", self, tuple(t.name for t in tools))
+
+
+class _FakeTool:
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.fixture(autouse=True)
+def fake_factories(monkeypatch):
+    built = []
+
+    def _factory():
+        llm = _FakeLLM()
+        built.append(llm)
+        return llm
+
+    for name in ("make_llm", "make_llm_groq", "make_llm_ollama_cloud", "make_llm_gemini"):
+        monkeypatch.setattr(models, name, _factory)
+    monkeypatch.setattr(pool, "bind_tools", lambda llm, tools: llm.bind_tools(tools))
+    monkeypatch.setattr(settings, "llm_backend", "groq")
+    monkeypatch.setattr(settings, "temperature", 0.0)
+    pool.invalidate()
+    yield built
+    pool.invalidate()
+
+
+def test_client_is_reused(fake_factories):
+    assert pool.get_client("groq") is pool.get_client("groq")
+    assert len(fake_factories) == 1
+
+
+def test_client_key_includes_model_and_temperature(fake_factories, monkeypatch):
+    first = pool.get_client("groq")
+    monkeypatch.setattr(settings, "temperature", 0.7)
+    assert pool.get_client("groq") is not first
+    monkeypatch.setattr(settings, "groq_model", "other-model")
+    pool.get_client("groq")
+    assert len(fake_factories) == 3
+
+
+def test_unknown_backend_falls_back_to_ollama_cloud():
+    assert pool.client_key("nope")[0] == "ollama_cloud"
+
+
+def test_bound_cached_by_tool_name_set(fake_factories):
+    a, b = _FakeTool("a"), _FakeTool("b")
+    first = pool.get_bound("groq", [a, b])
+    assert pool.get_bound("groq", [b, a]) is first
+    assert fake_factories[0].bind_calls == 1
+    assert pool.get_bound("groq", [a]) is not first
+    assert fake_factories[0].bind_calls == 2
+    assert pool.stats()["bound_hits"] == 1
+
+
+def test_bound_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(pool, "_MAX_BOUND", 3)
+    for i in range(5):
+        pool.get_bound("groq", [_FakeTool(f"t{i}")])
+    assert pool.stats()["bound"] == 3
+
+
+def test_invalidate_rebuilds(fake_factories):
+    llm = pool.get_client("groq")
+    pool.get_bound("groq", [_FakeTool("a")])
+    pool.invalidate()
+    assert pool.stats()["clients"] == 0 and pool.stats()["bound"] == 0
+    assert pool.get_client("groq") is not llm
+
+
+def test_concurrent_get_client_returns_single_instance():
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get_client("groq"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(r) for r in results}) == 1
+
+
+def test_model_command_invalidates_pool(monkeypatch):
+    from src.ui.commands import _set_model
+    monkeypatch.setattr(settings, "groq_model", settings.groq_model)
+    pool.get_client("groq")
+    _set_model(settings, "llama-3.1-8b-instant")
+    assert pool.stats()["clients"] == 0
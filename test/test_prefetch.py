@@ -0,0 +1,72 @@
+"""Tests for src/infra/prefetch.py — repository warm-up on shell_cd."""
+import subprocess
+import threading
+
+import pytest
+
+from src.infra import prefetch as pf
+from src.infra.tools_cache import session_cache
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    from src.agents.shell import tools as shell_tools
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / "README.md").write_text("# Projet\n")
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'p'\n")
+    git = ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(git + ["add", "."], check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], check=True)
+    monkeypatch.setattr(shell_tools, "_cwd", tmp_path)
+    return tmp_path
+
+
+def test_non_repo_is_ignored(tmp_path):
+    assert not pf.RepoPrefetcher().on_cwd_changed(tmp_path)
+
+
+def test_warms_git_listing_readme_and_manifest(repo):
+    p = pf.RepoPrefetcher()
+    assert p.on_cwd_changed(repo)
+    p.wait(10)
+    assert session_cache.has("git_status", {})          # repo_path defaults to the shell cwd
+    assert session_cache.has("git_log", {})
+    assert session_cache.has("local_list_directory", {"path": str(repo)})
+    assert session_cache.has("local_read_file", {"path": str(repo / "README.md")})
+    hit = session_cache.get("local_read_file", {"path": str(repo / "pyproject.toml")})
+    assert isinstance(hit, str) and "name = 'p'" in hit
+    assert p.stats()["completed"] == 1
+
+
+def test_byte_cap_skips_large_results(repo):
+    (repo / "README.md").write_text("x" * 5000)
+    p = pf.RepoPrefetcher(max_bytes=2000)
+    p.on_cwd_changed(repo)
+    p.wait(10)
+    assert not session_cache.has("local_read_file", {"path": str(repo / "README.md")})
+    assert p.stats()["bytes"] <= 2000
+    assert p.stats()["skipped"] >= 1
+
+
+def test_new_cwd_cancels_running_job(repo, tmp_path_factory, monkeypatch):
+    gate, started = threading.Event(), threading.Event()
+    real = pf._tools
+
+    class _Slow:
+        name = "git_status"
+
+        def invoke(self, args):
+            started.set()
+            gate.wait(5)
+            return {"status": "ok", "output": "## main"}
+
+    monkeypatch.setattr(pf, "_tools", lambda: {**real(), "git_status": _Slow()})
+    p = pf.RepoPrefetcher()
+    p.on_cwd_changed(repo)
+    started.wait(5)
+    p.on_cwd_changed(tmp_path_factory.mktemp("ailleurs"))   # not a repo: just cancels
+    gate.set()
+    p.wait(10)
+    assert p.stats()["cancelled"] == 1
+    assert not session_cache.has("git_status", {})
+    assert not session_cache.has("git_log", {})
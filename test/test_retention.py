@@ -0,0 +1,157 @@
+"""Tests for src/infra/retention.py — checkpoint pruning, idle threads, pinning, /db stats."""
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import START, MessagesState, StateGraph
+
+from src.infra import checkpoint as cp
+from src.infra import retention
+
+
+@pytest.fixture(autouse=True)
+def last_run_file(tmp_path, monkeypatch):
+    path = tmp_path / "retention_last_run"
+    monkeypatch.setattr(retention, "_LAST_RUN", path)
+    monkeypatch.setattr(retention, "_last_report", {})
+    return path
+
+
+def _graph(saver):
+    g = StateGraph(MessagesState)
+    g.add_node("bot", lambda s: {"messages": [AIMessage("x" * 2000)]})
+    g.add_edge(START, "bot")
+    return g.compile(checkpointer=saver)
+
+
+def _say(app, thread_id, n=1):
+    for i in range(n):
+        app.invoke({"messages": [HumanMessage(f"message {i}")]}, {"configurable": {"thread_id": thread_id}})
+
+
+def _count(saver, table, thread_id):
+    with saver.cursor(transaction=False) as cur:
+        return cur.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+def _make_idle(saver, thread_id):
+    with saver.cursor() as cur:
+        cur.execute("UPDATE thread_meta SET updated_at = '2000-01-01T00:00:00+00:00' WHERE thread_id = ?", (thread_id,))
+
+
+def test_prune_keeps_last_checkpoints_and_latest_state(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "t1", 6)
+    before = app.get_state({"configurable": {"thread_id": "t1"}}).values["messages"]
+    assert _count(checkpoint_db, "checkpoints", "t1") > 3
+
+    deleted = retention.prune_checkpoints(3)
+
+    assert deleted > 0
+    assert _count(checkpoint_db, "checkpoints", "t1") == 3
+    with checkpoint_db.cursor(transaction=False) as cur:
+        orphans = cur.execute(
+            "SELECT COUNT(*) FROM writes WHERE checkpoint_id NOT IN (SELECT checkpoint_id FROM checkpoints)"
+        ).fetchone()[0]
+    assert orphans == 0
+    after = app.get_state({"configurable": {"thread_id": "t1"}}).values["messages"]
+    assert [m.content for m in after] == [m.content for m in before]
+    _say(app, "t1")   # le thread reste utilisable
+
+
+def test_idle_threads_dropped_except_pinned_and_active(checkpoint_db):
+    app = _graph(checkpoint_db)
+    for tid in ("old", "pinned", "active", "fresh"):
+        _say(app, tid)
+    for tid in ("old", "pinned", "active"):
+        _make_idle(checkpoint_db, tid)
+    assert retention.set_pinned("pinned", True)
+
+    dropped = retention.drop_idle_threads(90, active_thread="active")
+
+    assert dropped == ["old"]
+    assert _count(checkpoint_db, "checkpoints", "old") == 0
+    assert {t["thread_id"] for t in cp.list_threads()} == {"pinned", "active", "fresh"}
+    assert next(t for t in cp.list_threads() if t["thread_id"] == "pinned")["pinned"]
+
+
+def test_set_pinned_unknown_thread(checkpoint_db):
+    assert not retention.set_pinned("nope", True)
+
+
+def test_run_frees_pages_and_records_report(checkpoint_db, last_run_file, monkeypatch):
+    monkeypatch.setattr(retention, "policy", lambda: {"keep_checkpoints": 1, "idle_days": 90, "interval_hours": 24})
+    app = _graph(checkpoint_db)
+    _say(app, "t1", 30)
+
+    report = retention.run("t1")
+
+    assert report["checkpoints_deleted"] > 0
+    assert report["pages_freed"] > 0
+    stats = retention.db_stats()
+    assert stats["auto_vacuum"] == "incremental"
+    assert stats["free_pages"] == 0
+    assert retention.last_report()["checkpoints_deleted"] == report["checkpoints_deleted"]
+    assert last_run_file.exists()
+
+
+def test_db_stats_bytes_per_thread(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "big", 5)
+    _say(app, "small", 1)
+
+    stats = retention.db_stats()
+
+    assert [t["thread_id"] for t in stats["threads"]] == ["big", "small"]
+    assert stats["threads"][0]["bytes"] > stats["threads"][1]["bytes"] > 0
+    assert stats["threads"][0]["title"] == "message 0"
+    assert stats["file_bytes"] > 0
+
+
+def test_background_run_respects_interval(checkpoint_db, last_run_file, monkeypatch):
+    ran = threading.Event()
+    monkeypatch.setattr(retention, "run", lambda active=None: ran.set())
+
+    assert retention.maybe_run_in_background("t1")
+    assert ran.wait(2)
+
+    last_run_file.write_text(str(time.time()))
+    assert not retention.maybe_run_in_background("t1")
+
+
+def test_prune_concurrent_with_writes(checkpoint_db):
+    app = _graph(checkpoint_db)
+    _say(app, "t1", 5)
+    errors = []
+
+    def _writer():
+        try:
+            _say(app, "t2", 10)
+        except Exception as e:
+            errors.append(e)
+
+    t = threading.Thread(target=_writer)
+    t.start()
+    for _ in range(5):
+        retention.prune_checkpoints(2)
+    t.join()
+
+    assert not errors
+    assert len(app.get_state({"configurable": {"thread_id": "t2"}}).values["messages"]) == 20
+
+
+def test_enable_incremental_vacuum_on_legacy_db(tmp_path, monkeypatch):
+    import sqlite3
+    conn = sqlite3.connect(str(tmp_path / "legacy.db"), check_same_thread=False)
+    saver = cp._TracedSaver(conn)
+    monkeypatch.setattr(cp, "_DB_PATH", tmp_path / "legacy.db")
+    monkeypatch.setattr(cp, "_checkpointer", saver)
+    monkeypatch.setattr(cp, "_backfilled", False)
+    _say(_graph(saver), "t1", 2)
+    assert retention.db_stats()["auto_vacuum"] == "none"
+
+    retention.enable_incremental_vacuum()
+
+    assert retention.db_stats()["auto_vacuum"] == "incremental"
+    conn.close()
@@ -0,0 +1,106 @@
+"""Tests for src/orchestrator/retrieval_bench.py and the labelled retrieval corpus — offline."""
+import pytest
+
+from src.orchestrator.retrieval_bench import HashingEmbeddings, run_benchmark
+from src.orchestrator.retrieval_corpus import LABELLED_QUERIES
+from src.orchestrator.tool_retriever import TOOL_GROUPS
+
+
+class _FakeTool:
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+
+
+_TOOLS = [
+    _FakeTool("gmail_search", "chercher des emails dans la boîte gmail"),
+    _FakeTool("gmail_send_email", "envoyer un email"),
+    _FakeTool("get_weather_by_city", "météo d'une ville, temps qu'il fait"),
+    _FakeTool("get_current_time", "heure et date actuelles"),
+]
+
+_CORPUS = [
+    ("résume mes emails gmail", ("gmail",)),
+    ("quel temps fait-il à Lyon, météo", ("weather",)),
+    ("envoie un email et donne la météo", ("gmail", "weather")),
+    ("explique la relativité", ()),
+]
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+def test_corpus_has_a_few_hundred_queries():
+    assert len(LABELLED_QUERIES) >= 200
+
+
+def test_corpus_queries_are_unique():
+    queries = [q for q, _ in LABELLED_QUERIES]
+    assert len(queries) == len(set(queries))
+
+
+def test_corpus_groups_exist():
+    for query, groups in LABELLED_QUERIES:
+        for g in groups:
+            assert g in TOOL_GROUPS, f"{query!r} → groupe inconnu {g!r}"
+
+
+def test_corpus_covers_every_group():
+    covered = {g for _, groups in LABELLED_QUERIES for g in groups}
+    assert covered == set(TOOL_GROUPS)
+
+
+# ── HashingEmbeddings ─────────────────────────────────────────────────────────
+
+def test_hashing_embeddings_deterministic():
+    a = HashingEmbeddings().embed_query("envoie un mail")
+    b = HashingEmbeddings().embed_query("envoie un mail")
+    assert a == b
+    assert len(a) == 512
+
+
+def test_hashing_embeddings_shared_words_are_closer():
+    import numpy as np
+    emb = HashingEmbeddings()
+    q, near, far = (np.array(emb.embed_query(t)) for t in ("météo Paris", "météo Lyon", "ticket jira"))
+    assert q @ near > q @ far
+
+
+# ── run_benchmark ─────────────────────────────────────────────────────────────
+
+def test_run_benchmark_reports_metrics(tmp_path):
+    report = run_benchmark(_TOOLS, k=3, corpus=_CORPUS, index_dir=tmp_path)
+    assert report["queries"] == 4
+    assert report["recall"] == pytest.approx(1.0)
+    assert report["exact"] == pytest.approx(1.0)
+    assert report["tools_mean"] > 0
+    assert report["noise_tools_mean"] >= 1  # get_current_time toujours inclus
+    assert report["latency_p95_ms"] >= report["latency_p50_ms"] >= 0
+    assert set(report["per_group"]) == {"gmail", "weather"}
+    assert report["misses"] == []
+
+
+def test_run_benchmark_records_misses(tmp_path):
+    corpus = [("quelle heure est-il", ("jira",))]
+    report = run_benchmark(_TOOLS, k=2, corpus=corpus, index_dir=tmp_path)
+    assert report["recall"] == 0.0
+    assert report["misses"][0]["expected"] == ["jira"]
+
+
+def test_run_benchmark_lexical_mode(tmp_path):
+    report = run_benchmark(_TOOLS, k=3, corpus=_CORPUS, lexical_only=True, index_dir=tmp_path)
+    assert report["mode"] == "lexical"
+    assert report["recall"] > 0
+
+
+def test_run_benchmark_keeps_temp_index_dir_for_all_queries(monkeypatch):
+    from src.orchestrator.tool_retriever import ToolRetriever
+    seen = []
+    real_get = ToolRetriever.get
+
+    def get(self, query):
+        seen.append(self._index.path.parent.is_dir())
+        return real_get(self, query)
+
+    monkeypatch.setattr(ToolRetriever, "get", get)
+    run_benchmark(_TOOLS, k=3, corpus=_CORPUS)
+    assert seen and all(seen)
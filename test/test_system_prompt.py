@@ -0,0 +1,81 @@
+"""Tests for src/llm/prompts.py — memoized, prefix-stable system prompt."""
+import os
+
+import pytest
+
+from src.llm import prompts
+
+
+@pytest.fixture(autouse=True)
+def project(tmp_path, monkeypatch):
+    (tmp_path / ".git").mkdir()
+    monkeypatch.setattr(prompts, "_shell_cwd", lambda: tmp_path)
+    prompts.clear_prompt_cache()
+    yield tmp_path
+    prompts.clear_prompt_cache()
+
+
+def _build(tools=("web_search_news",), today="2026-01-01", **kw):
+    return prompts.build_system_prompt(list(tools), today, "Alice", **kw)
+
+
+def test_date_and_plan_mode_come_last():
+    p = _build(plan_mode=True)
+    assert p.endswith("Date : 2026-01-01.")
+    assert p.index("MODE PLAN") > p.index("━━ RECHERCHE ━━")
+
+
+def test_sections_ordered_core_project_tools_tail(project):
+    (project / "AXON.md").write_text("contexte du repo")
+    (project / ".axon").mkdir()
+    (project / ".axon" / "memory.md").write_text("- fait important")
+    p = _build(plan_mode=True)
+    order = [p.index("CONTEXTE PROJET (AXON.md)"), p.index("MÉMOIRE PROJET"), p.index("━━ RECHERCHE ━━"),
+             p.index("MODE PLAN"), p.index("Date :")]
+    assert order == sorted(order)
+
+def test_prefix_identical_across_days():
+    a = _build(today="2026-01-01")
+    b = _build(today="2026-01-02")
+    stable = a[:a.index("Date :")]
+    assert b.startswith(stable)
+    assert prompts.prompt_stats()["prefix_identical"] == 1
+
+
+def test_same_inputs_hit_memo(monkeypatch):
+    _build()
+    monkeypatch.setattr(prompts, "_assemble", lambda *a: pytest.fail("should be memoized"))
+    _build()
+    assert prompts.prompt_stats()["memo_hits"] == 1
+
+
+def test_equivalent_tool_sets_share_memo_entry():
+    a = _build(tools=("gmail_search", "get_current_time"))
+    b = _build(tools=("gmail_send_email",))
+    assert a == b
+    assert prompts.prompt_stats()["memo_hits"] == 1
+
+
+def test_axon_md_edit_invalidates(project):
+    f = project / "AXON.md"
+    f.write_text("version un")
+    assert "version un" in _build()
+    f.write_text("version deux, plus longue")
+    os.utime(f, ns=(1, 1))
+    assert "version deux" in _build()
+
+
+def test_memory_file_included(project):
+    (project / ".axon").mkdir()
+    (project / ".axon" / "memory.md").write_text("- fait important")
+    assert "fait important" in _build()
+
+
+def test_preview_does_not_touch_stats():
+    _build(record=False)
+    assert prompts.prompt_stats()["calls"] == 0
+    assert prompts.last_system_prompt() == ""
+
+
+def test_language_instruction():
+    assert "Always respond in English." in _build(lang="en")
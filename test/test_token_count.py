@@ -0,0 +1,81 @@
+"""Tests for src/infra/token_count.py — cached per-message token accounting."""
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.infra import token_count as tc
+
+
+@pytest.fixture
+def counter(monkeypatch):
+    monkeypatch.setattr(tc, "_load_encoding", lambda name: None)   # no network, heuristic only
+    c = tc.TokenCounter("groq")
+    return c
+
+
+def test_approx_is_close_to_chars_over_four_on_prose():
+    text = "The quick brown fox jumps over the lazy dog " * 20
+    assert 0.7 * len(text) / 4 <= tc.approx_tokens(text) <= 1.3 * len(text) / 4
+
+
+def test_approx_counts_code_symbols():
+    assert tc.approx_tokens("f(x) = {a: [1, 2]};") > len("f(x) = {a: [1, 2]};") // 4
+
+
+def test_each_message_counted_once(counter):
+    msgs = [HumanMessage("bonjour", id="h1"), AIMessage("salut !", id="a1")]
+    first = counter.count(msgs)
+    counter.count(msgs)
+    counter.count(msgs + [HumanMessage("encore", id="h2")])
+    assert counter.counted == 3
+    assert counter.hits == 4
+    assert first == counter.count(msgs)
+
+
+def test_cached_message_with_id_skips_text_building(counter, monkeypatch):
+    msg = AIMessage("analyse", id="a1", tool_calls=[{"name": "local_grep", "args": {"pattern": "x"}, "id": "c1"}])
+    n = counter.count_message(msg)
+    monkeypatch.setattr(tc, "_message_text", lambda m: pytest.fail("text rebuilt for a cached message"))
+    assert counter.count_message(msg) == n
+    assert counter.hits == 1
+
+def test_messages_without_id_cached_by_content(counter):
+    msgs = [ToolMessage("résultat " * 50, tool_call_id="t1")]
+    counter.count(msgs)
+    counter.count(msgs)
+    assert counter.counted == 1
+
+
+def test_replaced_content_with_same_id_recounts(counter):
+    short = counter.count_message(HumanMessage("court", id="x"))
+    long = counter.count_message(HumanMessage("beaucoup plus long " * 30, id="x"))
+    assert long > short
+
+
+def test_tool_calls_are_counted(counter):
+    bare = AIMessage("", id="a")
+    with_call = AIMessage("", id="b", tool_calls=[{"name": "local_grep", "args": {"pattern": "foo bar"}, "id": "c1"}])
+    assert counter.count_message(with_call) > counter.count_message(bare)
+
+
+def test_dict_messages_supported(counter):
+    assert counter.count([{"role": "user", "content": "hello world"}]) > 0
+
+
+def test_exact_encoding_used_when_available(monkeypatch):
+    class _Enc:
+        def encode(self, text, disallowed_special=()):
+            return text.split()
+
+    monkeypatch.setattr(tc, "_load_encoding", lambda name: _Enc())
+    c = tc.TokenCounter("ollama")
+    c._load()
+    assert c.exact
+    assert c.count_text("a b c") == 3
+    assert c.stats()["tokenizer"] == "cl100k_base"
+
+
+def test_should_compress_uses_counter(monkeypatch):
+    from src.orchestrator import graph
+    monkeypatch.setattr(graph, "_usable_budget", lambda backend: 50)
+    assert not graph._should_compress([HumanMessage("court", id="s1")], "groq")
+    assert graph._should_compress([HumanMessage("mot " * 400, id="s2")], "groq")
@@ -0,0 +1,249 @@
+"""Tests for ToolRetriever, vector_search.py and lexical_search.py — fake embedder, no Ollama."""
+import hashlib
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.orchestrator.vector_search import VectorSearch
+
+
+# ── VectorSearch ──────────────────────────────────────────────────────────────
+
+def _engine():
+    vectors = np.array([
+        [1.0, 0.0, 0.0],
+        [0.0, 2.0, 0.0],   # not normalized on purpose
+        [0.0, 0.0, 1.0],
+        [0.7, 0.7, 0.0],
+    ])
+    return VectorSearch(vectors, ["a", "b", "c", "ab"])
+
+
+def test_search_returns_best_match_first():
+    hits = _engine().search([1.0, 0.1, 0.0], k=2)
+    assert [label for label, _ in hits] == ["a", "ab"]
+
+
+def test_search_scores_are_cosine():
+    hits = _engine().search([0.0, 5.0, 0.0], k=1)
+    assert hits[0][0] == "b"
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_search_k_larger_than_corpus():
+    hits = _engine().search([1.0, 1.0, 1.0], k=50)
+    assert len(hits) == 4
+    scores = [s for _, s in hits]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_many_matches_single_search():
+    engine = _engine()
+    queries = [[1.0, 0.1, 0.0], [0.0, 0.0, 3.0], [0.5, 0.5, 0.1]]
+    batched = engine.search_many(queries, k=2)
+    assert batched == [engine.search(q, k=2) for q in queries]
+
+
+def test_search_many_empty():
+    assert _engine().search_many([], k=3) == []
+
+
+def test_zero_query_vector_does_not_crash():
+    hits = _engine().search([0.0, 0.0, 0.0], k=2)
+    assert len(hits) == 2
+
+
+def test_empty_corpus():
+    engine = VectorSearch(np.zeros((0, 3)), [])
+    assert engine.search([1.0, 0.0, 0.0], k=3) == []
+    assert engine.search_many([[1.0, 0.0, 0.0]], k=3) == [[]]
+
+
+def test_label_count_mismatch_raises():
+    with pytest.raises(ValueError):
+        VectorSearch(np.zeros((2, 3)), ["only-one"])
+
+
+# ── ToolRetriever ─────────────────────────────────────────────────────────────
+
+class _HashEmbeddings(Embeddings):
+    """Bag-of-words hashing embedder: queries sharing words with a doc score high."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+
+    def _vec(self, text):
+        v = np.zeros(64, dtype=np.float32)
+        for word in text.lower().replace(":", " ").split():
+            v[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+        return v.tolist()
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [self._vec(t) for t in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return self._vec(text)
+
+
+class _FakeTool:
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+
+
+@pytest.fixture
+def retriever(tmp_path, monkeypatch):
+    import src.infra.embedding_cache as ec
+    import src.orchestrator.tool_retriever as tr
+    monkeypatch.setattr(ec, "_INDEX_DIR", tmp_path)
+    monkeypatch.setattr(tr, "OllamaEmbeddings", _HashEmbeddings)
+    tools = [
+        _FakeTool("gmail_search", "chercher des emails dans la boîte gmail"),
+        _FakeTool("gmail_send_email", "envoyer un email"),
+        _FakeTool("get_weather_by_city", "météo d'une ville"),
+        _FakeTool("get_current_time", "heure et date actuelles"),
+        _FakeTool("git_status", "statut du dépôt git"),
+        _FakeTool("run_coding_agent", "déléguer une tâche de code"),
+    ]
+    return tr.ToolRetriever(tools, k=2)
+
+
+def test_get_expands_to_full_group(retriever):
+    names = [t.name for t in retriever.get("chercher des emails gmail")]
+    assert "gmail_search" in names
+    assert "gmail_send_email" in names
+
+
+def test_get_always_includes_time(retriever):
+    names = [t.name for t in retriever.get("météo ville")]
+    assert "get_current_time" in names
+    assert "get_weather_by_city" in names
+
+
+def test_get_preserves_original_tool_order(retriever):
+    names = [t.name for t in retriever.get("envoyer un email gmail")]
+    assert names == sorted(names, key=["gmail_search", "gmail_send_email", "get_weather_by_city",
+                                       "get_current_time", "git_status", "run_coding_agent"].index)
+
+
+def test_coding_group_drops_git(retriever):
+    names = [t.name for t in retriever.get("déléguer une tâche de code git")]
+    assert "run_coding_agent" in names
+    assert "git_status" not in names
+
+
+def test_get_many_matches_get(retriever):
+    queries = ["chercher des emails gmail", "météo ville", "statut git"]
+    batched = retriever.get_many(queries)
+    assert [[t.name for t in r] for r in batched] == [[t.name for t in retriever.get(q)] for q in queries]
+
+
+def test_get_many_embeds_queries_in_one_call(retriever):
+    before = retriever._embeddings.calls
+    retriever.get_many(["a", "b", "c"])
+    assert retriever._embeddings.calls == before + 1
+
+
+def test_repeated_query_hits_lru(retriever):
+    retriever.get("chercher des emails gmail")
+    before = retriever._embeddings.calls
+    retriever.get("chercher des emails gmail")
+    assert retriever._embeddings.calls == before
+    assert retriever.stats()["query_cache"]["hits"] >= 1
+
+
+def test_embedder_down_falls_back_to_lexical(retriever, monkeypatch):
+    import time
+
+    def _boom(texts):
+        raise ConnectionError("ollama down")
+
+    monkeypatch.setattr(retriever._embeddings, "embed_documents", _boom)
+    names = [t.name for t in retriever.get("envoyer un email")]
+    assert "gmail_send_email" in names
+    assert retriever.stats()["errors"] == 1
+
+    # Embedder en pause : les tours suivants ne le sollicitent plus et restent rapides
+    t0 = time.perf_counter()
+    names = [t.name for t in retriever.get("météo de la ville")]
+    assert (time.perf_counter() - t0) < 0.005
+    assert "get_weather_by_city" in names
+    assert retriever.stats()["errors"] == 1
+    assert retriever.stats()["lexical_only"] == 2
+
+
+def test_slow_embedder_times_out_then_fills_cache(retriever, monkeypatch):
+    import threading
+    import time
+    import src.orchestrator.tool_retriever as tr
+
+    release = threading.Event()
+    real = retriever._embeddings.embed_documents
+
+    def _slow(texts):
+        release.wait(2)
+        return real(texts)
+
+    calls = []
+    monkeypatch.setattr(tr, "_EMBED_WAIT", 0.005)
+    monkeypatch.setattr(retriever._embeddings, "embed_documents", lambda texts: calls.append(texts) or _slow(texts))
+    t0 = time.perf_counter()
+    names = [t.name for t in retriever.get("envoyer un email")]
+    assert (time.perf_counter() - t0) < 0.1   # the lexical ranking does not wait for the embedder
+    assert "gmail_send_email" in names
+    assert retriever.stats()["timeouts"] == 1
+
+    # While the call is still in flight, later rounds stay lexical without queueing more work
+    retriever.get("météo de la ville")
+    assert len(calls) == 1
+
+    release.set()
+    retriever._executor.submit(lambda: None).result(timeout=2)  # drain the worker
+    assert retriever._queries.get("envoyer un email") is not None
+    assert retriever._dense_available()
+
+
+def test_lexical_only_without_match_returns_always_included(retriever, monkeypatch):
+    monkeypatch.setattr(retriever, "_down_until", float("inf"))
+    names = [t.name for t in retriever.get("zzzz qqqq")]
+    assert names == ["get_current_time"]
+
+
+def test_retriever_starts_without_ollama(tmp_path, monkeypatch):
+    import src.infra.embedding_cache as ec
+    import src.orchestrator.tool_retriever as tr
+
+    class _Down(_HashEmbeddings):
+        def embed_documents(self, texts):
+            raise ConnectionError("ollama down")
+
+    monkeypatch.setattr(ec, "_INDEX_DIR", tmp_path)
+    monkeypatch.setattr(tr, "OllamaEmbeddings", _Down)
+    r = tr.ToolRetriever([_FakeTool("gmail_search", "chercher des emails"),
+                          _FakeTool("get_current_time", "heure")])
+    assert r.stats()["dense_ready"] is False
+    assert "gmail_search" in [t.name for t in r.get("chercher mes emails")]
+
+
+# ── BM25Index ─────────────────────────────────────────────────────────────────
+
+def test_tokenize_folds_accents_plurals_and_stopwords():
+    from src.orchestrator.lexical_search import tokenize
+    assert tokenize("Créer les Tickets dans Jira") == ["creer", "ticket", "jira"]
+    assert tokenize("gmail_search") == ["gmail", "search"]
+
+
+def test_bm25_ranks_matching_document_first():
+    from src.orchestrator.lexical_search import BM25Index
+    index = BM25Index(["météo d'une ville", "chercher des emails gmail", "statut du dépôt git"])
+    scores = index.scores("mes emails gmail")
+    assert int(np.argmax(scores)) == 1
+    assert scores[0] == 0 and scores[2] == 0
+
+
+def test_bm25_no_overlap_is_all_zero():
+    from src.orchestrator.lexical_search import BM25Index
+    assert not BM25Index(["alpha", "beta"]).scores("gamma").any()
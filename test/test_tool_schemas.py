@@ -0,0 +1,82 @@
+"""Tests for src/infra/tool_schemas.py — precompiled function-calling schemas."""
+import json
+
+import pytest
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.infra import tool_schemas as ts
+
+
+@tool
+def sample_tool(path: str, limit: int = 10) -> str:
+    """
+    Lit un fichier et retourne ses premières lignes.
+
+    Args:
+        path:  chemin du fichier
+        limit: nombre de lignes
+    """
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ts.ToolSchemaCache(tmp_path / "tool_schemas.json")
+
+
+def test_schema_matches_langchain_conversion(cache):
+    assert cache.schema(sample_tool) == convert_to_openai_tool(sample_tool)
+
+
+def test_second_lookup_is_a_hit(cache):
+    cache.schema(sample_tool)
+    cache.schema(sample_tool)
+    assert cache.stats() == {"schemas": 1, "hits": 1, "compiled": 1}
+
+
+def test_schemas_persist_across_instances(cache, monkeypatch):
+    cache.schemas([sample_tool])
+    assert cache.path.is_file()
+
+    def _boom(t):
+        raise AssertionError("should not reconvert")
+
+    monkeypatch.setattr(ts, "convert_to_openai_tool", _boom)
+    fresh = ts.ToolSchemaCache(cache.path)
+    assert fresh.schema(sample_tool)["function"]["name"] == "sample_tool"
+    assert fresh.stats()["compiled"] == 0
+
+
+def test_changed_docstring_recompiles(cache):
+    cache.schemas([sample_tool])
+    changed = sample_tool.model_copy(update={"description": "Nouvelle description."})
+    fresh = ts.ToolSchemaCache(cache.path)
+    assert fresh.schema(changed)["function"]["description"] == "Nouvelle description."
+    assert fresh.stats()["compiled"] == 1
+
+
+def test_corrupted_file_is_ignored(cache):
+    cache.path.write_text("{not json")
+    assert cache.schema(sample_tool)["function"]["name"] == "sample_tool"
+
+
+def test_tool_without_function_is_not_persisted(cache):
+    class _Opaque:
+        name = "opaque"
+        description = "outil sans fonction Python"
+
+    assert ts.fingerprint(_Opaque()) is None
+    cache.schemas([sample_tool])
+    assert list(json.loads(cache.path.read_text())) == ["sample_tool"]
+
+
+def test_bind_tools_passes_precompiled_schemas(monkeypatch, cache):
+    monkeypatch.setattr(ts, "tool_schemas", cache)
+
+    class _LLM:
+        def bind_tools(self, tools, **kwargs):
+            return tools
+
+    bound = ts.bind_tools(_LLM(), [sample_tool])
+    assert bound == [convert_to_openai_tool(sample_tool)]
@@ -184,3 +184,268 @@ def test_invalidates_has_propose_file_change():
 
 def test_browser_screenshot_not_in_invalidates():
     assert "browser_screenshot" not in _INVALIDATES
+
+
+# ── Tiered storage: byte budget, disk tier, metrics ──────────────────────────
+
+def test_memory_lru_evicts_least_recently_used_over_budget():
+    cache = SessionCache(max_bytes=100)
+    cache.set("git_log", {"n": 1}, "a" * 40, ttl=60)
+    cache.set("git_log", {"n": 2}, "b" * 40, ttl=60)
+    cache.get("git_log", {"n": 1})                     # n=1 becomes most recent
+    cache.set("git_log", {"n": 3}, "c" * 40, ttl=60)
+    assert cache.get("git_log", {"n": 2}) is None
+    assert cache.get("git_log", {"n": 1}) == "a" * 40
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 100
+
+
+def test_persistent_tool_survives_restart(tmp_path):
+    first = SessionCache(tmp_path / "c.db")
+    first.set("web_research_report", {"query": "rust async"}, "rapport", ttl=300)
+    first.set("local_read_file", {"path": "/x"}, "local", ttl=60)
+    first.close()
+
+    second = SessionCache(tmp_path / "c.db")
+    assert second.get("web_research_report", {"query": "rust async"}) == "rapport"
+    assert second.get("local_read_file", {"path": "/x"}) is None   # filesystem stays in memory
+    stats = second.stats()
+    assert stats["disk_hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    second.get("web_research_report", {"query": "rust async"})
+    assert second.stats()["hits"] == 1                               # promoted to memory
+
+
+def test_disk_entries_respect_ttl(tmp_path, monkeypatch):
+    first = SessionCache(tmp_path / "c.db")
+    first.set("web_search_news", {"query": "q"}, "news", ttl=120)
+    first.close()
+    original = time.time
+    monkeypatch.setattr(time, "time", lambda: original() + 500)
+    assert SessionCache(tmp_path / "c.db").get("web_search_news", {"query": "q"}) is None
+
+
+def test_disk_budget_evicts_oldest_access(tmp_path):
+    cache = SessionCache(tmp_path / "c.db", disk_max_bytes=250)
+    for i in range(3):
+        cache.set("web_research_report", {"query": str(i)}, "x" * 100, ttl=300)
+    assert cache.stats()["disk_bytes"] <= 250
+    assert cache.stats()["disk_evictions"] == 1
+    cache.close()
+    reopened = SessionCache(tmp_path / "c.db")
+    assert reopened.get("web_research_report", {"query": "0"}) is None
+    assert reopened.get("web_research_report", {"query": "2"}) == "x" * 100
+
+
+def test_invalidate_and_clear_reach_disk(tmp_path):
+    cache = SessionCache(tmp_path / "c.db")
+    cache.set("web_search_news", {"query": "q"}, "news", ttl=120)
+    cache.invalidate("web_search_news")
+    cache.close()
+    assert SessionCache(tmp_path / "c.db").get("web_search_news", {"query": "q"}) is None
+
+
+# ── Validators and generations ────────────────────────────────────────────────
+
+def test_read_file_hits_after_read_only_shell_command(tmp_path):
+    from src.infra.tools_cache import is_read_only_command
+    f = tmp_path / "a.py"
+    f.write_text("x = 1")
+    cache = SessionCache()
+    cache.set("local_read_file", {"path": str(f)}, "x = 1", ttl=60)
+    assert is_read_only_command("ls -la | grep py && git status")
+    cache.on_tool_executed("shell_run", {"command": "ls -la", "cwd": str(tmp_path)})
+    assert cache.get("local_read_file", {"path": str(f)}) == "x = 1"
+
+
+def test_read_file_revalidated_by_mtime_and_size(tmp_path):
+    import os
+    f = tmp_path / "a.py"
+    f.write_text("x = 1")
+    cache = SessionCache()
+    cache.set("local_read_file", {"path": str(f)}, "x = 1", ttl=60)
+    f.write_text("x = 22")
+    os.utime(f, ns=(0, 1))
+    assert cache.get("local_read_file", {"path": str(f)}) is None
+    assert cache.stats()["stale"] == 1
+
+
+def test_mutating_shell_command_is_scoped_to_its_cwd(tmp_path):
+    from src.infra.tools_cache import is_read_only_command
+    proj, other = tmp_path / "proj", tmp_path / "other"
+    proj.mkdir()
+    other.mkdir()
+    cache = SessionCache()
+    cache.set("local_glob", {"pattern": "**/*.py", "path": str(proj)}, "proj", ttl=60)
+    cache.set("local_glob", {"pattern": "**/*.py", "path": str(other)}, "other", ttl=60)
+    assert not is_read_only_command("make build")
+    cache.on_tool_executed("shell_run", {"command": "make build", "cwd": str(proj)})
+    assert cache.get("local_glob", {"pattern": "**/*.py", "path": str(proj)}) is None
+    assert cache.get("local_glob", {"pattern": "**/*.py", "path": str(other)}) == "other"
+
+
+def test_mutating_shell_command_invalidates_subdirectories_of_cwd(tmp_path):
+    pkg = tmp_path / "src" / "pkg"
+    pkg.mkdir(parents=True)
+    cache = SessionCache()
+    cache.set("local_glob", {"pattern": "**/*.py", "path": str(tmp_path / "src")}, "glob", ttl=60)
+    cache.set("local_list_directory", {"path": str(pkg)}, "listing", ttl=60)
+    cache.on_tool_executed("shell_run", {"command": "echo more >> src/pkg/m.py", "cwd": str(tmp_path)})
+    assert cache.get("local_glob", {"pattern": "**/*.py", "path": str(tmp_path / "src")}) is None
+    assert cache.get("local_list_directory", {"path": str(pkg)}) is None
+
+
+@pytest.mark.parametrize("command", [
+    "env rm -rf build", "date -s 2020-01-01", "find . -fprint out.txt", "find . -fls out",
+    "find . -fprintf out '%p'", "sort -o f f", "sort -uo f f", "sort --output=f f",
+    "git diff --output=x", "ls\nrm -rf build", "ls & rm -rf build",
+])
+def test_commands_that_can_write_are_not_read_only(command):
+    from src.infra.tools_cache import is_read_only_command
+    assert not is_read_only_command(command)
+
+
+def test_grep_only_matching_stays_read_only():
+    from src.infra.tools_cache import is_read_only_command
+    assert is_read_only_command("grep -o foo a.txt | sort -u")
+
+
+def test_invalidate_paths_bumps_parent_listing_and_ancestor_trees(tmp_path):
+    sub = tmp_path / "src"
+    sub.mkdir()
+    cache = SessionCache()
+    cache.set("local_list_directory", {"path": str(sub)}, "sub", ttl=60)
+    cache.set("local_list_directory", {"path": str(tmp_path)}, "root", ttl=60)
+    cache.set("local_glob", {"pattern": "*", "path": str(tmp_path)}, "glob", ttl=60)
+    cache.invalidate_paths(sub / "app.py")
+    assert cache.get("local_list_directory", {"path": str(sub)}) is None
+    assert cache.get("local_list_directory", {"path": str(tmp_path)}) == "root"
+    assert cache.get("local_glob", {"pattern": "*", "path": str(tmp_path)}) is None
+
+
+def test_git_entries_keyed_by_head_and_index(tmp_path):
+    import os
+    git = tmp_path / ".git"
+    (git / "refs" / "heads").mkdir(parents=True)
+    (git / "HEAD").write_text("ref: refs/heads/main\n")
+    (git / "refs" / "heads" / "main").write_text("aaa\n")
+    (git / "index").write_bytes(b"i")
+    args = {"repo_path": str(tmp_path)}
+    cache = SessionCache()
+    cache.set("git_log", args, "log", ttl=60)
+    cache.set("git_status", args, "status", ttl=60)
+    os.utime(git / "index", ns=(0, 5))
+    assert cache.get("git_log", args) == "log"          # HEAD unchanged
+    assert cache.get("git_status", args) is None        # index touched
+    (git / "refs" / "heads" / "main").write_text("bbb\n")
+    assert cache.get("git_log", args) is None           # new commit
+
+
+def test_invalidate_does_not_scan_keys():
+    cache = SessionCache()
+    for i in range(1000):
+        cache.set("local_find_file", {"name": str(i)}, "hit", ttl=60)
+    cache.invalidate("local_find_file")
+    assert len(cache) == 1000                            # dropped lazily
+    assert cache.get("local_find_file", {"name": "7"}) is None
+
+
+# ── Argument normalization ────────────────────────────────────────────────────
+
+def test_normalization_fills_schema_defaults_and_counts_hits(tmp_path):
+    from src.agents.filesystem.tools import local_read_file
+    f = tmp_path / "x.py"
+    f.write_text("x")
+    cache = SessionCache()
+    cache.register_tools([local_read_file])
+    cache.set("local_read_file", {"path": str(f)}, "x", ttl=60)
+    assert cache.get("local_read_file", {"path": str(f), "offset": 0, "limit": 0}) == "x"
+    assert cache.get("local_read_file", {"path": str(f)}) == "x"
+    assert cache.stats()["normalized_hits"] == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_paths_are_resolved_against_shell_cwd(tmp_path, monkeypatch):
+    from src.agents.shell import tools as shell_tools
+    (tmp_path / "pkg").mkdir()
+    f = tmp_path / "pkg" / "m.py"
+    f.write_text("m")
+    monkeypatch.setattr(shell_tools, "_cwd", tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    cache = SessionCache()
+    cache.set("local_read_file", {"path": str(f)}, "m", ttl=60)
+    assert cache.get("local_read_file", {"path": "pkg/m.py"}) == "m"
+    assert cache.get("local_read_file", {"path": "pkg/../pkg/m.py"}) == "m"
+    assert cache.get("local_read_file", {"path": "~/pkg/m.py"}) == "m"
+    assert cache.normalize("local_read_file", {"path": "pkg/m.py"})["path"] == str(f.resolve())
+
+
+def test_query_whitespace_is_normalized():
+    cache = SessionCache()
+    cache.set("web_research_report", {"query": "rust  async\n runtimes "}, "r", ttl=300)
+    assert cache.get("web_research_report", {"query": "rust async runtimes"}) == "r"
+
+
+def test_non_cacheable_args_are_untouched():
+    cache = SessionCache()
+    args = {"command": "ls  -la", "cwd": "rel"}
+    assert cache.normalize("shell_run", args) is args
+
+
+# ── Stale-while-revalidate ────────────────────────────────────────────────────
+
+def _news_tool(results):
+    from langchain_core.tools import tool
+
+    @tool("web_search_news")
+    def fake_news(query: str) -> str:
+        """news"""
+        return results.pop(0)
+    return fake_news
+
+
+def _later(monkeypatch, seconds):
+    original = time.time
+    monkeypatch.setattr(time, "time", lambda: original() + seconds)
+
+
+def test_stale_value_served_then_refreshed_in_background(monkeypatch):
+    cache = SessionCache()
+    cache.register_tools([_news_tool(["frais"])])
+    cache.set("web_search_news", {"query": "q"}, "ancien", ttl=120)
+    _later(monkeypatch, 300)                                   # expired, within 900 s grace
+    stale = cache.get("web_search_news", {"query": "q"})
+    assert stale.endswith("\nancien") and "actualisation" in stale
+    cache.wait_refreshes(2)
+    assert cache.get("web_search_news", {"query": "q"}) == "frais"
+    stats = cache.stats()
+    assert stats["stale_served"] == 1 and stats["refreshes"] == 1
+
+
+def test_one_refresh_per_key_and_failure_keeps_stale(monkeypatch):
+    cache = SessionCache()
+    cache.register_tools([_news_tool([])])                     # pop() raises → refresh fails
+    cache.set("web_search_news", {"query": "q"}, "ancien", ttl=120)
+    _later(monkeypatch, 300)
+    cache.get("web_search_news", {"query": "q"})
+    cache.wait_refreshes(2)
+    assert "ancien" in cache.get("web_search_news", {"query": "q"})
+    cache.wait_refreshes(2)
+    assert cache.stats()["refresh_failures"] == 2
+
+
+def test_beyond_grace_is_a_miss(monkeypatch):
+    cache = SessionCache()
+    cache.register_tools([_news_tool(["frais"])])
+    cache.set("web_search_news", {"query": "q"}, "ancien", ttl=120)
+    _later(monkeypatch, 120 + 900 + 1)
+    assert cache.get("web_search_news", {"query": "q"}) is None
+
+
+def test_policies_come_from_settings(monkeypatch):
+    from src.infra.settings import settings
+    from src.infra.tools_cache import policy
+    monkeypatch.setattr(settings, "tool_cache", {"web_search_news": {"ttl": 30, "stale_grace": 0}})
+    assert policy("web_search_news") == {"ttl": 30, "stale_grace": 0}
+    assert policy("web_research_report")["stale_grace"] == 3600
+    assert policy("git_status") == {"ttl": 15, "stale_grace": 0}
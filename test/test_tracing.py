@@ -0,0 +1,136 @@
+"""Tests for src/infra/tracing.py — spans, turn ring buffer, exports."""
+import json
+import threading
+import time
+
+import pytest
+
+from src.infra.tracing import Tracer
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(max_turns=3)
+
+
+def test_spans_outside_a_turn_are_ignored(tracer):
+    with tracer.span("llm"):
+        pass
+    assert tracer.turns() == []
+
+
+def test_span_and_decorator_record_in_current_turn(tracer):
+    @tracer.traced("tool", "tool:x")
+    def work():
+        time.sleep(0.01)
+        return 42
+
+    tracer.begin_turn("question")
+    with tracer.span("retrieval"):
+        pass
+    assert work() == 42
+    turn = tracer.end_turn()
+    assert [s["name"] for s in turn.spans] == ["retrieval", "tool:x"]
+    assert turn.by_category()["tool"] >= 10
+
+
+def test_span_recorded_even_on_exception(tracer):
+    tracer.begin_turn()
+    with pytest.raises(RuntimeError):
+        with tracer.span("llm"):
+            raise RuntimeError("boom")
+    assert tracer.end_turn().spans[0]["cat"] == "llm"
+
+
+def test_start_finish_first_call_wins(tracer):
+    tracer.begin_turn()
+    tracer.start("llm.ttft", "ttft")
+    time.sleep(0.005)
+    tracer.finish("llm.ttft")
+    tracer.finish("llm.ttft")
+    spans = tracer.end_turn().spans
+    assert len(spans) == 1 and spans[0]["dur_ns"] >= 5_000_000
+
+
+def test_ring_buffer_keeps_last_turns(tracer):
+    for i in range(5):
+        tracer.begin_turn(f"t{i}")
+        tracer.end_turn()
+    assert [t.label for t in tracer.turns()] == ["t2", "t3", "t4"]
+
+
+def test_begin_turn_closes_unfinished_turn(tracer):
+    tracer.begin_turn("a")
+    tracer.begin_turn("b")
+    tracer.end_turn()
+    assert [t.label for t in tracer.turns()] == ["a", "b"]
+
+
+def test_spans_from_worker_threads_are_kept(tracer):
+    tracer.begin_turn()
+    with tracer.span("tool:main", "tool"):
+        pass
+
+    def _bg():
+        with tracer.span("tool:bg", "tool"):
+            pass
+    t = threading.Thread(target=_bg)
+    t.start()
+    t.join()
+    turn = tracer.end_turn()
+    assert len({s["tid"] for s in turn.spans}) == 2
+
+
+def test_summary_percentiles(tracer):
+    for ms in (1, 2, 30):
+        tracer.begin_turn()
+        tracer._record("llm", "llm", 0, ms * 1_000_000, {})
+        tracer.end_turn()
+    s = tracer.summary()
+    assert s["turns"] == 3
+    assert s["phases"]["llm"]["count"] == 3
+    assert s["phases"]["llm"]["p50_ms"] == 2.0
+    assert s["phases"]["llm"]["last_ms"] == 30.0
+
+
+def test_export_chrome_and_jsonl(tracer, tmp_path):
+    tracer.begin_turn("q")
+    with tracer.span("prompt", n=3):
+        pass
+    tracer.end_turn()
+    chrome, jsonl = tracer.export(tmp_path)
+    events = json.loads(chrome.read_text())["traceEvents"]
+    assert {e["cat"] for e in events} == {"turn", "prompt"}
+    assert all(e["ph"] == "X" for e in events)
+    lines = [json.loads(l) for l in jsonl.read_text().splitlines()]
+    assert lines[0]["name"] == "prompt" and lines[0]["args"] == {"n": "3"}
+
+
+def test_perf_command_renders(monkeypatch):
+    from src.infra import tracing
+    from src.ui.commands import handle_slash
+    t = Tracer()
+    monkeypatch.setattr(tracing, "tracer", t)
+    t.begin_turn()
+    with t.span("llm"):
+        pass
+    t.end_turn()
+    assert handle_slash("/perf", {}, None) is not None
+
+
+def test_ttft_marked_for_every_llm_call_of_a_turn(tracer, monkeypatch):
+    from src.orchestrator import graph
+    monkeypatch.setattr(graph, "tracer", tracer)
+    monkeypatch.setattr(graph, "_first_token_at", 0.0)
+    tracer.begin_turn()
+    marks = []
+    for _ in range(2):   # two tool-loop rounds
+        graph._first_token_at = 0.0          # reset by the LLM node before each invoke
+        tracer.start("llm.ttft", "ttft")
+        graph.mark_first_token()
+        marks.append(graph._first_token_at)
+        graph.mark_first_token()             # later chunks of the same call
+        assert graph._first_token_at == marks[-1]
+    spans = [s for s in tracer.end_turn().spans if s["cat"] == "ttft"]
+    assert all(marks) and marks[1] > marks[0]
+    assert len(spans) == 2
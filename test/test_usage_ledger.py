@@ -0,0 +1,94 @@
+"""Tests for src/infra/usage_ledger.py — per-call token/latency ledger."""
+import time
+
+import pytest
+
+from src.infra.usage_ledger import UsageLedger, model_name
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    led = UsageLedger(tmp_path / "usage.db")
+    yield led
+    led.close()
+
+
+def _usage(inp, out):
+    return {"input_tokens": inp, "output_tokens": out, "total_tokens": inp + out}
+
+
+def test_record_computes_generation_throughput(ledger):
+    ledger.record("groq", "llama", _usage(100, 50), latency_ms=1500, ttft_ms=500, thread_id="t1")
+    row = ledger.by_thread()[0]
+    assert row["calls"] == 1
+    assert row["input_tokens"] == 100 and row["output_tokens"] == 50
+    assert row["tokens_per_s"] == pytest.approx(50.0)   # 50 tokens over 1 s after TTFT
+    assert row["ttft_ms"] == 500
+
+
+def test_missing_usage_metadata_is_recorded_as_zero(ledger):
+    ledger.record("ollama", "qwen", None, latency_ms=200)
+    totals = ledger.totals()
+    assert totals["calls"] == 1 and totals["input_tokens"] == 0
+    assert totals["tokens_per_s"] is None
+
+
+def test_aggregations_by_model_day_and_thread(ledger):
+    now = time.time()
+    ledger.record("groq", "llama", _usage(1000, 10), 100, thread_id="a", ts=now)
+    ledger.record("groq", "llama", _usage(1000, 10), 300, thread_id="b", ts=now)
+    ledger.record("ollama", "qwen", _usage(10, 10), 50, thread_id="a", ts=now)
+    ledger.record("ollama", "qwen", _usage(10, 10), 50, thread_id="a", ts=now - 30 * 86_400)
+
+    models = ledger.by_model()
+    assert [(m["backend"], m["calls"]) for m in models] == [("groq", 2), ("ollama", 2)]
+    assert models[0]["latency_ms"] == pytest.approx(200)
+    assert sum(d["calls"] for d in ledger.by_day(7)) == 3
+    assert [m["calls"] for m in ledger.by_model(days=7)] == [2, 1]
+    assert ledger.totals("a")["calls"] == 3
+    assert [t["thread_id"] for t in ledger.by_thread()] == ["a", "b"]   # heaviest first
+
+
+def test_ledger_persists_across_instances(tmp_path):
+    first = UsageLedger(tmp_path / "usage.db")
+    first.record("gemini", "gemini-2.5-flash", _usage(5, 5), 10, thread_id="x")
+    first.close()
+    assert UsageLedger(tmp_path / "usage.db").totals("x")["calls"] == 1
+
+
+
+def test_unwritable_directory_never_raises(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("x")
+    led = UsageLedger(blocker / "usage.db")   # mkdir fails with an OSError
+    led.record("groq", "llama", _usage(1, 1), latency_ms=10)
+    assert led.by_day() == []
+
+
+def test_ledger_uses_wal(ledger):
+    ledger.record("groq", "llama", _usage(1, 1), latency_ms=10)
+    assert ledger._db().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_model_name_reads_client_attributes():
+    class _Ollama:
+        model = "qwen2.5:7b"
+
+    class _Gemini:
+        model = None
+        model_name = "models/gemini-2.5-flash"
+
+    assert model_name(_Ollama()) == "qwen2.5:7b"
+    assert model_name(_Gemini()) == "gemini-2.5-flash"
+    assert model_name(object()) == ""
+
+
+def test_usage_command_renders_tables(ledger, monkeypatch):
+    from src.infra import usage_ledger
+    from src.ui.commands import handle_slash
+    from src.ui.config import SessionConfig
+    monkeypatch.setattr(usage_ledger, "ledger", ledger)
+    cfg = SessionConfig()
+    assert "aucun appel" in str(handle_slash("/usage", {}, cfg).renderable)
+    ledger.record("groq", "llama", _usage(10, 10), 100, thread_id=cfg.thread_id)
+    panel = handle_slash("/usage 3", {}, cfg)
+    assert panel.title == "usage · 3 j"